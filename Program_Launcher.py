@@ -2,6 +2,8 @@ import os
 import sys
 import time
 
+_STARTUP_BEGIN = time.perf_counter()  # 启动计时起点（用于统计导入耗时）
+
 def disable_pyinstaller_timestamp():
     """禁用PyInstaller的时间戳设置"""
     try:
@@ -23,22 +25,20 @@ disable_timestamp_check()
 
 import shutil
 import glob
+import argparse
 import datetime
-import pinyin
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QTabWidget, QMessageBox,
-                             QFileDialog, QGroupBox, QScrollArea, QSizePolicy, QSpacerItem,
-                             QMenu, QTableWidget, QTableWidgetItem, QDialog, QLayout,
-                             QCheckBox, QAction, QComboBox, QInputDialog, QToolButton)
-from PyQt5.QtCore import Qt, QSize, QSettings, QTimer, QRect, QPoint, pyqtSignal
-from PyQt5.QtGui import QIcon, QColor, QTextCursor, QTextCharFormat, QFont, QPixmap, QKeySequence
-from PIL import Image, ImageDraw, ImageFont
+import hashlib
+import itertools
+import json
+import math
+import mmap
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import sqlite3
-import win32api
-import win32con
-import win32process
-import win32gui
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict
 
 class ProjectInfo:
     """项目信息元数据（集中管理所有项目相关信息）"""
@@ -59,6 +59,14 @@ class ProjectInfo:
 4. 管理员权限: 可以设置以管理员权限运行程序
 5. 图标支持: 自动提取exe图标或自定义图标
 6. 收藏功能: 可以将常用程序置顶
+7. 单实例运行: 再次启动时把请求交给已运行的窗口，例如 --show、--add <路径>
+8. 命令行模式: --list、--search <关键词>、--launch <名称或ID> 不打开界面直接执行
+9. 快速启动面板: Ctrl+P 或 --palette 呼出，输入名称或拼音首字母后回车启动
+10. 启动方案: 一次启动一组程序（可设置顺序依赖、延迟和同时启动数），也可用 --profile <名称> 执行
+11. 自动启动: 勾选"随启动器自动启动"的按钮在启动器打开后按优先级错开启动，并等待系统空闲
+12. 进程资源: 可为按钮设置进程优先级、可用 CPU、内存上限和 CPU 时间上限
+13. 启动耗时: 按钮提示显示启动耗时的 p50/p95，"耗时报告"可查看各阶段并导出 CSV（或 --latency-report）
+14. 预读: 空闲时把常用及当前时段常启动的程序预读到系统缓存，加快冷启动
 """
 
     @classmethod
@@ -76,429 +84,293 @@ class ProjectInfo:
         """生成标准化的项目头信息"""
         return f"{cls.NAME} {cls.VERSION} | {cls.LICENSE} License | {cls.URL}"
 
-# 马卡龙色系定义
-class MacaronColors:
-    # 粉色系
-    SAKURA_PINK = QColor(255, 183, 206)  # 樱花粉
-    ROSE_PINK = QColor(255, 154, 162)    # 玫瑰粉
-    
-    # 蓝色系
-    SKY_BLUE = QColor(162, 225, 246)    # 天空蓝
-    LILAC_MIST = QColor(230, 230, 250)   # 淡丁香
-    
-    # 绿色系
-    MINT_GREEN = QColor(181, 234, 215)   # 薄荷绿
-    APPLE_GREEN = QColor(212, 241, 199)  # 苹果绿
-    
-    # 黄色/橙色系
-    LEMON_YELLOW = QColor(255, 234, 165) # 柠檬黄
-    BUTTER_CREAM = QColor(255, 248, 184) # 奶油黄
-    PEACH_ORANGE = QColor(255, 218, 193) # 蜜桃橙
-    
-    # 紫色系
-    LAVENDER = QColor(199, 206, 234)     # 薰衣草紫
-    TARO_PURPLE = QColor(216, 191, 216)  # 香芋紫
-    
-    # 中性色
-    CARAMEL_CREAM = QColor(240, 230, 221) # 焦糖奶霜
+class ButtonRecord:
+    """按钮数据记录（使用 __slots__，大量按钮时比字典/闭包占用更少内存）"""
+    __slots__ = ('id', 'group_id', 'name', 'path', 'arguments', 'working_dir',
+                 'run_as_admin', 'icon_path', 'position', 'is_favorite', 'if_running',
+                 'autostart', 'autostart_priority', 'process_priority', 'cpu_affinity',
+                 'memory_limit_mb', 'cpu_time_limit')
+    LAUNCH_OPTIONS = ('if_running', 'autostart', 'autostart_priority', 'process_priority',
+                      'cpu_affinity', 'memory_limit_mb', 'cpu_time_limit')  # 启动选项字段（追加在基本字段之后，与数据库列同名）
 
-class FlowLayout(QLayout):
-    """自定义流式布局，实现从左到右、自动换行的布局效果"""
-    def __init__(self, parent=None, margin=10, spacing=10):
-        super().__init__(parent)
-        self._items = []
-        self._margin = margin
-        self._spacing = spacing
+    def __init__(self, id: int, group_id: int, name: str, path: str, arguments: str = '',
+                 working_dir: str = '', run_as_admin: bool = False, icon_path: str = '',
+                 position: int = 0, is_favorite: bool = False, if_running: str = 'launch',
+                 autostart: bool = False, autostart_priority: int = 5, process_priority: str = 'normal',
+                 cpu_affinity: str = '', memory_limit_mb: int = 0, cpu_time_limit: int = 0):
+        self.id = id
+        self.group_id = group_id
+        self.name = name
+        self.path = path
+        self.arguments = arguments or ''
+        self.working_dir = working_dir or ''
+        self.run_as_admin = bool(run_as_admin)
+        self.icon_path = icon_path or ''
+        self.position = position
+        self.is_favorite = bool(is_favorite)
+        self.if_running = if_running or 'launch'  # 已在运行时的处理方式（见 ProcessRegistry）
+        self.autostart = bool(autostart)  # 随启动器自动启动
+        self.autostart_priority = int(autostart_priority if autostart_priority is not None else 5)  # 越大越先启动
+        self.process_priority = process_priority or 'normal'  # 进程优先级（见 ResourceLimits.PRIORITIES）
+        self.cpu_affinity = cpu_affinity or ''  # 允许使用的 CPU，如 "0-3,6"，空表示不限制
+        self.memory_limit_mb = int(memory_limit_mb or 0)  # 内存上限，0 表示不限制
+        self.cpu_time_limit = int(cpu_time_limit or 0)  # CPU 时间上限（秒），0 表示不限制
 
-    def addItem(self, item):
-        self._items.append(item)
+    @classmethod
+    def from_row(cls, row: tuple) -> 'ButtonRecord':
+        """从 get_all_buttons 格式的行创建记录（可带启动选项列）"""
+        return cls(*row)
 
-    def count(self):
-        return len(self._items)
+    def launch_options(self) -> Dict[str, object]:
+        """启动选项字典（用于编辑对话框和 DatabaseManager.update_launch_options）"""
+        return {name: getattr(self, name) for name in self.LAUNCH_OPTIONS}
 
-    def itemAt(self, index):
-        if 0 <= index < len(self._items):
-            return self._items[index]
-        return None
+    def as_tuple(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.__slots__)
 
-    def takeAt(self, index):
-        if 0 <= index < len(self._items):
-            return self._items.pop(index)
-        return None
+    def __eq__(self, other):
+        return isinstance(other, ButtonRecord) and self.as_tuple() == other.as_tuple()
 
-    def expandingDirections(self):
-        return Qt.Orientations(Qt.Orientation(0))
+    __hash__ = None
 
-    def hasHeightForWidth(self):
-        return True
+    def __repr__(self):
+        return f"ButtonRecord(id={self.id}, group_id={self.group_id}, name={self.name!r})"
 
-    def heightForWidth(self, width):
-        return self._doLayout(QRect(0, 0, width, 0), True)
 
-    def setGeometry(self, rect):
-        super().setGeometry(rect)
-        self._doLayout(rect, False)
+def find_button(records, target: str) -> Optional[ButtonRecord]:
+    """按ID或名称（不区分大小写）查找按钮记录"""
+    target = str(target).strip()
+    records = list(records)
+    if target.isdigit():
+        for record in records:
+            if record.id == int(target):
+                return record
+    lowered = target.lower()
+    for record in records:
+        if record.name.lower() == lowered:
+            return record
+    return None
 
-    def sizeHint(self):
-        return self.minimumSize()
 
-    def minimumSize(self):
-        size = QSize()
-        for item in self._items:
-            size = size.expandedTo(item.minimumSize())
-        margin = self._margin
-        return QSize(size.width() + 2 * margin, size.height() + 2 * margin)
+class ProfileItem:
+    """启动方案中的一项（按钮、就绪后的延迟、依赖的按钮）"""
+    __slots__ = ('button_id', 'delay_ms', 'depends_on')
 
-    def _doLayout(self, rect, test_only):
-        margin = self._margin
-        spacing = self._spacing
-        x = rect.x() + margin
-        y = rect.y() + margin
-        line_height = 0
-        
-        for item in self._items:
-            wid = item.widget()
-            space_x = spacing
-            space_y = spacing
-            next_x = x + item.sizeHint().width() + space_x
-            if next_x - space_x > rect.right() and line_height > 0:
-                x = rect.x() + margin
-                y = y + line_height + space_y
-                next_x = x + item.sizeHint().width() + space_x
-                line_height = 0
+    def __init__(self, button_id: int, delay_ms: int = 0, depends_on: Optional[int] = None):
+        self.button_id = button_id
+        self.delay_ms = max(0, int(delay_ms or 0))
+        self.depends_on = depends_on  # 需先启动完成的按钮ID（同一方案内），None 表示无依赖
+
+    def __repr__(self):
+        return f"ProfileItem({self.button_id}, delay_ms={self.delay_ms}, depends_on={self.depends_on})"
+
+
+class DatabaseManager:
+    _initialized_paths = set()  # 本进程内已完成建表/迁移的数据库（避免每次实例化重复检查）
+    LAUNCH_OPTION_COLUMNS = {  # 按钮启动选项列（与 ButtonRecord.LAUNCH_OPTIONS 顺序一致）
+        'if_running': "TEXT DEFAULT 'launch'",
+        'autostart': "INTEGER DEFAULT 0",
+        'autostart_priority': "INTEGER DEFAULT 5",
+        'process_priority': "TEXT DEFAULT 'normal'",
+        'cpu_affinity': "TEXT DEFAULT ''",
+        'memory_limit_mb': "INTEGER DEFAULT 0",
+        'cpu_time_limit': "INTEGER DEFAULT 0",
+    }
+
+    def __init__(self):
+        self.db_path = "launcher.db"
+        db_key = os.path.abspath(self.db_path)
+        if db_key not in DatabaseManager._initialized_paths:
+            self._init_db() # 初始化数据库
+            self._init_backup_dir() # 初始化备份目录
+            self._init_icon_dir() # 初始化图标目录
+            DatabaseManager._initialized_paths.add(db_key)
+        self.conn = None  # 添加连接对象引用
+        self.last_check_time = 0  # 添加最后检查时间
+
+    def check_connection(self):
+        """检查并确保数据库连接正常"""
+        current_time = time.time()
+        if current_time - self.last_check_time < 60:  # 每分钟最多检查一次
             
-            if not test_only:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
+            return True
             
-            x = next_x
-            line_height = max(line_height, item.sizeHint().height())
-        
-        return y + line_height - rect.y()
-
-class DynamicIconGenerator:
-    @staticmethod
-    def generate_icon(text: str = "APP", size: Tuple[int, int] = (64, 64)) -> str:
-        """动态生成ICO图标文件"""
-        # 创建图像
-        img = Image.new('RGB', size, (70, 130, 180))  # 蓝色背景
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            # 尝试使用系统字体
-            font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            # 回退到默认字体
-            font = ImageFont.load_default()
-        
-        # 计算文本位置 (兼容新旧Pillow版本)
         try:
-            # 新版本Pillow使用textbbox
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-        except AttributeError:
-            # 旧版本Pillow使用textsize
-            text_width, text_height = draw.textsize(text, font)
-        
-        position = ((size[0] - text_width) // 2, (size[1] - text_height) // 2)
-        
-        # 绘制文本
-        draw.text(position, text, fill=(255, 255, 255), font=font)
-        
-        # 保存为ICO文件
-        ico_path = "icon.ico"
-        img.save(ico_path, sizes=[size])
-        return ico_path
+            # 尝试执行一个简单的查询来测试连接
+            temp_conn = sqlite3.connect(self.db_path)
+            cursor = temp_conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            temp_conn.close()
+            self.last_check_time = current_time
+            return True
+        except sqlite3.Error as e:
+            print(f"数据库连接检查失败: {str(e)}")
+            return False
 
-    @staticmethod
-    def extract_exe_icon(exe_path: str, output_path: str = None) -> Optional[str]:
-        """从exe文件中提取图标（改进版）"""
+    def _init_backup_dir(self):
+        """初始化备份目录"""
+        if not os.path.exists("backups"):
+            os.makedirs("backups")
+    
+    def backup_database(self):
+        """备份数据库到backups目录（带频率限制检查）"""
         try:
-            import win32ui
-
-            print(f"[DEBUG] 开始提取图标: {exe_path}")
+            # 检查上次备份时间，避免过于频繁备份（调整为4.5分钟）
+            current_time = time.time()
+            if hasattr(self, 'last_backup_time') and current_time - self.last_backup_time < 270:
+                # 如果距离上次备份不到4.5分钟（270秒），跳过本次备份
+                return False
+                
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = os.path.join("backups", f"launcher_backup_{timestamp}.db")
+            shutil.copy2(self.db_path, backup_path)
             
-            if not os.path.exists(exe_path):
-                print(f"[DEBUG] 错误: 文件不存在: {exe_path}")
-                return None
+            # 更新最后备份时间
+            self.last_backup_time = current_time
+            
+            # 保留最多24个备份文件（因为现在是每5分钟备份，24个=2小时）
+            backups = sorted(glob.glob(os.path.join("backups", "launcher_backup_*.db")))
+            if len(backups) > 24:
+                for old_backup in backups[:-24]:
+                    try:
+                        os.remove(old_backup)
+                    except Exception as e:
+                        print(f"删除旧备份失败: {str(e)}")
+            return True
+        except Exception as e:
+            print(f"备份失败: {str(e)}")
+            return False
+
 
-            if not output_path:
-                # 使用绝对路径
-                output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "temp_icons"))
-                if not os.path.exists(output_dir):
-                    print(f"[DEBUG] 创建临时图标目录: {output_dir}")
-                    os.makedirs(output_dir)
-                output_path = os.path.abspath(os.path.join(output_dir, f"{os.path.basename(exe_path)}_{hash(exe_path)}.ico"))
-                print(f"[DEBUG] 设置输出路径: {output_path}")
             
-            # 方法1: 使用win32gui.ExtractIconEx
-            try:
-                print("[DEBUG] 尝试方法1: win32gui.ExtractIconEx")
-                large, small = win32gui.ExtractIconEx(exe_path, 0)
-                print(f"[DEBUG] 方法1结果 - 大图标数: {len(large) if large else 0}, 小图标数: {len(small) if small else 0}")
-                
-                if large:
-                    print("[DEBUG] 方法1找到大图标，正在保存...")
-                    icon = large[0]
-                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-                    hbmp = win32ui.CreateBitmap()
-                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-                    hdc = hdc.CreateCompatibleDC()
-                    hdc.SelectObject(hbmp)
-                    hdc.DrawIcon((0, 0), icon)
-                    hbmp.SaveBitmapFile(hdc, output_path)
-                    win32gui.DestroyIcon(icon)
-                    print(f"[DEBUG] 方法1成功保存图标到: {output_path}")
-                    return output_path
-            except Exception as e:
-                print(f"[DEBUG] 方法1提取图标失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
+    def _init_db(self):
+        """初始化数据库"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            # 创建分组表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS groups (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    position INTEGER DEFAULT 0,
+                    is_favorite INTEGER DEFAULT 0
+                )
+            """)
+            # 创建按钮表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS buttons (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    group_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    arguments TEXT DEFAULT '',
+                    working_dir TEXT DEFAULT '',
+                    run_as_admin INTEGER DEFAULT 0,
+                    icon_path TEXT DEFAULT '',
+                    position INTEGER DEFAULT 0,
+                    is_favorite INTEGER DEFAULT 0,
+                    FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
+                )
+            """)
             
-            # 方法2: 使用Pillow提取
-            try:
-                print("[DEBUG] 尝试方法2: Pillow+win32gui.ExtractIcon")
-                from PIL import Image
-                ico_x = win32gui.ExtractIcon(exe_path, 0)
-                print(f"[DEBUG] 方法2结果 - 图标句柄: {bool(ico_x)}")
-                
-                if ico_x:
-                    print("[DEBUG] 方法2找到图标，正在保存...")
-                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-                    hbmp = win32ui.CreateBitmap()
-                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-                    hdc = hdc.CreateCompatibleDC()
-                    hdc.SelectObject(hbmp)
-                    hdc.DrawIcon((0, 0), ico_x)
-                    bmpinfo = hbmp.GetInfo()
-                    bmpstr = hbmp.GetBitmapBits(True)
-                    img = Image.frombuffer(
-                        'RGB',
-                        (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                        bmpstr, 'raw', 'BGRX', 0, 1
-                    )
-                    img.save(output_path)
-                    win32gui.DestroyIcon(ico_x)
-                    print(f"[DEBUG] 方法2成功保存图标到: {output_path}")
-                    return output_path
-            except Exception as e:
-                print(f"[DEBUG] 方法2提取图标失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            
-            # 方法3: 使用Shell API
-            try:
-                print("[DEBUG] 尝试方法3: Shell API (ctypes)")
-                import ctypes
-                from ctypes import wintypes
-                SHGFI_ICON = 0x000000100
-                SHGFI_LARGEICON = 0x000000000
-                SHGFI_SMALLICON = 0x000000001
-                
-                class SHFILEINFO(ctypes.Structure):
-                    _fields_ = [
-                        ('hIcon', ctypes.c_void_p),
-                        ('iIcon', ctypes.c_int),
-                        ('dwAttributes', ctypes.c_uint),
-                        ('szDisplayName', ctypes.c_wchar * 260),
-                        ('szTypeName', ctypes.c_wchar * 80)
-                    ]
-                
-                shell32 = ctypes.windll.shell32
-                info = SHFILEINFO()
-                print(f"[DEBUG] 调用SHGetFileInfoW...")
-                res = shell32.SHGetFileInfoW(
-                    exe_path, 0, ctypes.byref(info), 
-                    ctypes.sizeof(info), 
-                    SHGFI_ICON | SHGFI_LARGEICON
-                )
-                print(f"[DEBUG] SHGetFileInfoW返回: {res}, 图标句柄: {info.hIcon}")
-                
-                if info.hIcon:
-                    print("[DEBUG] 方法3找到图标，正在保存...")
-                    import win32ui
-                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-                    hbmp = win32ui.CreateBitmap()
-                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-                    hdc = hdc.CreateCompatibleDC()
-                    hdc.SelectObject(hbmp)
-                    hdc.DrawIcon((0, 0), info.hIcon)
-                    hbmp.SaveBitmapFile(hdc, output_path)
-                    win32gui.DestroyIcon(info.hIcon)
-                    print(f"[DEBUG] 方法3成功保存图标到: {output_path}")
-                    return output_path
-            except Exception as e:
-                print(f"[DEBUG] 方法3提取图标失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            
-            # 方法4: 使用系统默认图标
-            try:
-                print("[DEBUG] 尝试方法4: win32com.shell")
-                from win32com.shell import shell, shellcon
-                from win32com.shell.shell import SHGetFileInfo
-                flags = shellcon.SHGFI_ICON | shellcon.SHGFI_LARGEICON
-                print(f"[DEBUG] 调用SHGetFileInfo...")
-                info = SHGetFileInfo(exe_path, 0, flags)
-                print(f"[DEBUG] SHGetFileInfo返回: {info}")
-                
-                if info[0]:
-                    print("[DEBUG] 方法4找到图标，正在保存...")
-                    icon = info[0]
-                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-                    hbmp = win32ui.CreateBitmap()
-                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-                    hdc = hdc.CreateCompatibleDC()
-                    hdc.SelectObject(hbmp)
-                    hdc.DrawIcon((0, 0), icon)
-                    hbmp.SaveBitmapFile(hdc, output_path)
-                    win32gui.DestroyIcon(icon)
-                    print(f"[DEBUG] 方法4成功保存图标到: {output_path}")
-                    return output_path
-            except Exception as e:
-                print(f"[DEBUG] 方法4提取图标失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            
-            print(f"[DEBUG] 所有方法都无法提取 {exe_path} 的图标")
-            return None
-        
-        except Exception as e:
-            print(f"[DEBUG] 提取图标过程中发生异常: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
-
-
-
-    @staticmethod
-    def find_icon_in_directory(directory: str) -> Optional[str]:
-        """在指定目录下查找图标文件"""
-        if not os.path.isdir(directory):
-            return None
-        
-        # 查找常见的图标文件
-        icon_patterns = ["icon.*", "*.ico"]
-        for pattern in icon_patterns:
-            files = glob.glob(os.path.join(directory, pattern))
-            if files:
-                # 优先返回.ico文件
-                ico_files = [f for f in files if f.lower().endswith('.ico')]
-                if ico_files:
-                    return ico_files[0]
-                return files[0]  # 返回找到的第一个匹配文件
-        
-        return None
-
-class DatabaseManager:
-    def __init__(self):
-        self.db_path = "launcher.db"
-        self._init_db() # 初始化数据库
-        self._init_backup_dir() # 初始化备份目录
-        self._init_icon_dir() # 初始化图标目录
-        self.conn = None  # 添加连接对象引用
-        self.last_check_time = 0  # 添加最后检查时间
-
-    def check_connection(self):
-        """检查并确保数据库连接正常"""
-        current_time = time.time()
-        if current_time - self.last_check_time < 60:  # 每分钟最多检查一次
+            # 检查并添加可能缺失的列（兼容性处理）
+            columns_to_add = [
+                ('groups', 'is_favorite', 'INTEGER DEFAULT 0'),
+                ('buttons', 'arguments', 'TEXT DEFAULT \'\''),
+                ('buttons', 'working_dir', 'TEXT DEFAULT \'\''),
+                ('buttons', 'run_as_admin', 'INTEGER DEFAULT 0'),
+                ('buttons', 'icon_path', 'TEXT DEFAULT \'\''),
+                ('buttons', 'is_favorite', 'INTEGER DEFAULT 0')
+            ] + [('buttons', column, col_type)
+                 for column, col_type in self.LAUNCH_OPTION_COLUMNS.items()]
             
-            return True
+            for table, column, col_type in columns_to_add:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+                except sqlite3.OperationalError:
+                    pass  # 列已存在
             
-        try:
-            # 尝试执行一个简单的查询来测试连接
-            temp_conn = sqlite3.connect(self.db_path)
-            cursor = temp_conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            temp_conn.close()
-            self.last_check_time = current_time
-            return True
-        except sqlite3.Error as e:
-            print(f"数据库连接检查失败: {str(e)}")
-            return False
-
-    def _init_backup_dir(self):
-        """初始化备份目录"""
-        if not os.path.exists("backups"):
-            os.makedirs("backups")
-    
-    def backup_database(self):
-        """备份数据库到backups目录（带频率限制检查）"""
-        try:
-            # 检查上次备份时间，避免过于频繁备份（调整为4.5分钟）
-            current_time = time.time()
-            if hasattr(self, 'last_backup_time') and current_time - self.last_backup_time < 270:
-                # 如果距离上次备份不到4.5分钟（270秒），跳过本次备份
-                return False
-                
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = os.path.join("backups", f"launcher_backup_{timestamp}.db")
-            shutil.copy2(self.db_path, backup_path)
+            # 创建启动历史表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS launch_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    button_id INTEGER NOT NULL,
+                    launched_at REAL NOT NULL
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_launch_history_button ON launch_history(button_id)")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_launch_history_time ON launch_history(launched_at)")
+            # 创建按钮启动统计表（频率评分增量维护，避免每次统计历史表）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS button_stats (
+                    button_id INTEGER PRIMARY KEY,
+                    launch_count INTEGER DEFAULT 0,
+                    frecency REAL DEFAULT 0,
+                    last_launched REAL DEFAULT 0
+                )
+            """)
             
-            # 更新最后备份时间
-            self.last_backup_time = current_time
+            # 创建路径健康状态表（后台扫描结果）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS path_health (
+                    button_id INTEGER PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    message TEXT DEFAULT '',
+                    checked_at REAL NOT NULL
+                )
+            """)
             
-            # 保留最多24个备份文件（因为现在是每5分钟备份，24个=2小时）
-            backups = sorted(glob.glob(os.path.join("backups", "launcher_backup_*.db")))
-            if len(backups) > 24:
-                for old_backup in backups[:-24]:
-                    try:
-                        os.remove(old_backup)
-                    except Exception as e:
-                        print(f"删除旧备份失败: {str(e)}")
-            return True
-        except Exception as e:
-            print(f"备份失败: {str(e)}")
-            return False
-
-
+            # 创建启动耗时直方图表（按按钮和阶段，对数分桶）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS launch_latency (
+                    button_id INTEGER NOT NULL,
+                    phase TEXT NOT NULL,
+                    buckets TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    total_ms REAL DEFAULT 0,
+                    max_ms REAL DEFAULT 0,
+                    PRIMARY KEY (button_id, phase)
+                )
+            """)
             
-    def _init_db(self):
-        """初始化数据库"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            # 创建分组表
+            # 创建启动方案表（一次启动一组按钮）
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS groups (
+                CREATE TABLE IF NOT EXISTS launch_profiles (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL UNIQUE,
-                    position INTEGER DEFAULT 0,
-                    is_favorite INTEGER DEFAULT 0
+                    max_concurrent INTEGER DEFAULT 3
                 )
             """)
-            # 创建按钮表
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS buttons (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    group_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    path TEXT NOT NULL,
-                    arguments TEXT DEFAULT '',
-                    working_dir TEXT DEFAULT '',
-                    run_as_admin INTEGER DEFAULT 0,
-                    icon_path TEXT DEFAULT '',
+                CREATE TABLE IF NOT EXISTS launch_profile_items (
+                    profile_id INTEGER NOT NULL,
+                    button_id INTEGER NOT NULL,
                     position INTEGER DEFAULT 0,
-                    is_favorite INTEGER DEFAULT 0,
-                    FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
+                    delay_ms INTEGER DEFAULT 0,
+                    depends_on INTEGER,
+                    PRIMARY KEY (profile_id, button_id)
                 )
             """)
             
-            # 检查并添加可能缺失的列（兼容性处理）
-            columns_to_add = [
-                ('groups', 'is_favorite', 'INTEGER DEFAULT 0'),
-                ('buttons', 'arguments', 'TEXT DEFAULT \'\''),
-                ('buttons', 'working_dir', 'TEXT DEFAULT \'\''),
-                ('buttons', 'run_as_admin', 'INTEGER DEFAULT 0'),
-                ('buttons', 'icon_path', 'TEXT DEFAULT \'\''),
-                ('buttons', 'is_favorite', 'INTEGER DEFAULT 0')
-            ]
-            
-            for table, column, col_type in columns_to_add:
-                try:
-                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
-                except sqlite3.OperationalError:
-                    pass  # 列已存在
+            # 目录数据版本：分组/按钮任何改动都由触发器递增，用于校验启动快照
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_version', 0)")
+            for table in ('groups', 'buttons'):
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS bump_catalog_{table}_{event.lower()}
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE meta SET value = value + 1 WHERE key = 'catalog_version';
+                        END
+                    """)
                 
             conn.commit()
 
@@ -562,12 +434,20 @@ class DatabaseManager:
             )
             conn.commit()
     
-    def delete_group(self, group_id: int):
-        """删除分组及其所有按钮"""
+    def delete_group(self, group_id: int) -> List[int]:
+        """删除分组及其所有按钮（同一事务中清理按钮的关联数据），返回被删除的按钮ID
+        
+        未启用 PRAGMA foreign_keys，ON DELETE CASCADE 不会生效，按钮需要显式删除。
+        """
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            cursor.execute("SELECT id FROM buttons WHERE group_id = ?", (group_id,))
+            button_ids = [row[0] for row in cursor.fetchall()]
+            for button_id in button_ids:
+                self._delete_button_rows(cursor, button_id)
             cursor.execute("DELETE FROM groups WHERE id = ?", (group_id,))
             conn.commit()
+        return button_ids
     
     def add_button(self, group_id: int, name: str, path: str, 
                   arguments: str = '', working_dir: str = '', 
@@ -617,6 +497,36 @@ class DatabaseManager:
             )
             return cursor.fetchall()
     
+    def get_button_records(self) -> List[ButtonRecord]:
+        """获取所有按钮（紧凑记录格式，顺序与 get_all_buttons 一致，附带启动选项）
+        
+        只返回所属分组存在的按钮（旧版本删除分组时遗留的按钮不再出现）。
+        """
+        options = ", ".join(f"b.{name}" for name in ButtonRecord.LAUNCH_OPTIONS)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT b.id, b.group_id, b.name, b.path, b.arguments, 
+                b.working_dir, b.run_as_admin, b.icon_path, b.position, b.is_favorite, {options} 
+                FROM buttons b JOIN groups g ON g.id = b.group_id 
+                ORDER BY b.is_favorite DESC, b.position"""
+            )
+            return [ButtonRecord.from_row(row) for row in cursor.fetchall()]
+    
+    def update_launch_options(self, button_id: int, options: Dict[str, object]):
+        """更新按钮的启动选项（只接受 LAUNCH_OPTION_COLUMNS 中的列）"""
+        columns = [name for name in options if name in self.LAUNCH_OPTION_COLUMNS]
+        if not columns:
+            return
+        values = [int(options[name]) if isinstance(options[name], bool) else options[name]
+                  for name in columns]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"UPDATE buttons SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?",
+                values + [button_id]
+            )
+            conn.commit()
+    
     def update_button(self, button_id: int, name: str, path: str, 
                     arguments: str = '', working_dir: str = '', 
                     run_as_admin: bool = False, icon_path: str = ''):
@@ -646,10 +556,21 @@ class DatabaseManager:
     def delete_button(self, button_id: int):
         """删除按钮"""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM buttons WHERE id = ?", (button_id,))
+            self._delete_button_rows(conn.cursor(), button_id)
             conn.commit()
     
+    @staticmethod
+    def _delete_button_rows(cursor: sqlite3.Cursor, button_id: int):
+        """删除按钮及其启动统计、历史、健康状态、耗时统计和启动方案项（不提交事务）"""
+        cursor.execute("DELETE FROM buttons WHERE id = ?", (button_id,))
+        cursor.execute("DELETE FROM button_stats WHERE button_id = ?", (button_id,))
+        cursor.execute("DELETE FROM launch_history WHERE button_id = ?", (button_id,))
+        cursor.execute("DELETE FROM path_health WHERE button_id = ?", (button_id,))
+        cursor.execute("DELETE FROM launch_latency WHERE button_id = ?", (button_id,))
+        cursor.execute("DELETE FROM launch_profile_items WHERE button_id = ?", (button_id,))
+        cursor.execute("UPDATE launch_profile_items SET depends_on = NULL WHERE depends_on = ?",
+                       (button_id,))
+    
     def move_buttons_to_group(self, button_ids: List[int], target_group_id: int):
         """将按钮移动到另一个分组"""
         with sqlite3.connect(self.db_path) as conn:
@@ -689,16 +610,164 @@ class DatabaseManager:
             conn.commit()
 
 
-    def _init_icon_dir(self):
-        """初始化图标目录"""
-        self.icon_dir = os.path.join(os.path.dirname(self.db_path), "icons")
-        if not os.path.exists(self.icon_dir):
-            os.makedirs(self.icon_dir)
+    def get_catalog_version(self) -> int:
+        """获取目录数据版本（分组/按钮每次改动递增）"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM meta WHERE key = 'catalog_version'")
+            row = cursor.fetchone()
+            return row[0] if row else 0
 
-    def get_icon_path(self, original_path: str) -> str:
-        """获取图标保存路径"""
-        if not original_path:
-            return ""
+    def get_path_health(self) -> List[Tuple[int, str, str, float]]:
+        """获取所有按钮的路径健康状态 (button_id, status, message, checked_at)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT button_id, status, message, checked_at FROM path_health")
+            return cursor.fetchall()
+
+    def save_path_health(self, rows: List[Tuple[int, str, str, float]]):
+        """批量写入路径健康状态（单个事务）"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """INSERT OR REPLACE INTO path_health 
+                (button_id, status, message, checked_at) 
+                VALUES (?, ?, ?, ?)""",
+                rows
+            )
+            conn.commit()
+
+    def get_hourly_launch_days(self, hour: int, days: int = 30, window: int = 1) -> Dict[int, int]:
+        """最近 days 天内，每个按钮在 hour±window 点（本地时间）有启动记录的天数"""
+        hours = [(hour + offset) % 24 for offset in range(-window, window + 1)]
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT button_id, COUNT(DISTINCT date(launched_at, 'unixepoch', 'localtime')) 
+                FROM launch_history 
+                WHERE launched_at >= ? 
+                AND CAST(strftime('%H', launched_at, 'unixepoch', 'localtime') AS INTEGER) 
+                    IN ({', '.join('?' * len(hours))}) 
+                GROUP BY button_id""",
+                [time.time() - days * 86400] + hours
+            )
+            return dict(cursor.fetchall())
+
+    def get_launch_latency(self) -> List[Tuple[int, str, str, int, float, float]]:
+        """获取所有启动耗时直方图 (button_id, phase, buckets_json, count, total_ms, max_ms)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT button_id, phase, buckets, count, total_ms, max_ms FROM launch_latency")
+            return cursor.fetchall()
+
+    def save_launch_latency(self, rows: List[Tuple[int, str, str, int, float, float]]):
+        """批量写入启动耗时直方图（单个事务）"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """INSERT OR REPLACE INTO launch_latency 
+                (button_id, phase, buckets, count, total_ms, max_ms) 
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            conn.commit()
+
+    def get_launch_profiles(self) -> List[Tuple[int, str, int]]:
+        """获取所有启动方案 (id, name, max_concurrent)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name, max_concurrent FROM launch_profiles ORDER BY name")
+            return cursor.fetchall()
+
+    def get_launch_profile_items(self, profile_id: int) -> List[ProfileItem]:
+        """获取启动方案的各项（按顺序）"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT button_id, delay_ms, depends_on FROM launch_profile_items 
+                WHERE profile_id = ? ORDER BY position""",
+                (profile_id,)
+            )
+            return [ProfileItem(*row) for row in cursor.fetchall()]
+
+    def save_launch_profile(self, profile_id: Optional[int], name: str, max_concurrent: int,
+                            items: List[ProfileItem]) -> int:
+        """新建或更新启动方案并整体替换其各项（单个事务），返回方案ID"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            if profile_id is None:
+                cursor.execute("INSERT INTO launch_profiles (name, max_concurrent) VALUES (?, ?)",
+                               (name, max_concurrent))
+                profile_id = cursor.lastrowid
+            else:
+                cursor.execute("UPDATE launch_profiles SET name = ?, max_concurrent = ? WHERE id = ?",
+                               (name, max_concurrent, profile_id))
+                cursor.execute("DELETE FROM launch_profile_items WHERE profile_id = ?", (profile_id,))
+            cursor.executemany(
+                """INSERT INTO launch_profile_items 
+                (profile_id, button_id, position, delay_ms, depends_on) 
+                VALUES (?, ?, ?, ?, ?)""",
+                [(profile_id, item.button_id, position, item.delay_ms, item.depends_on)
+                 for position, item in enumerate(items)]
+            )
+            conn.commit()
+            return profile_id
+
+    def delete_launch_profile(self, profile_id: int):
+        """删除启动方案"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM launch_profile_items WHERE profile_id = ?", (profile_id,))
+            cursor.execute("DELETE FROM launch_profiles WHERE id = ?", (profile_id,))
+            conn.commit()
+
+    def get_button_stats(self) -> List[Tuple[int, int, float, float]]:
+        """获取所有按钮的启动统计 (button_id, launch_count, frecency, last_launched)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT button_id, launch_count, frecency, last_launched FROM button_stats")
+            return cursor.fetchall()
+    
+    def save_launch_batch(self, records: List[Tuple[int, float]], merge) -> Dict[int, tuple]:
+        """批量写入启动历史，并在同一事务中把每次启动 merge(旧统计或None, 启动时间) 到数据库中的最新统计上
+        
+        统计按增量合并而不是整行覆盖，其他进程期间写入的启动次数不会丢失；返回合并后的统计 {button_id: (次数, 评分, 最后启动)}。
+        """
+        stats = {}
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")  # 读取和写回之间不允许其他进程写入
+            cursor.executemany(
+                "INSERT INTO launch_history (button_id, launched_at) VALUES (?, ?)",
+                records
+            )
+            for button_id, launched_at in sorted(records, key=lambda r: r[1]):
+                if button_id not in stats:
+                    cursor.execute(
+                        "SELECT launch_count, frecency, last_launched FROM button_stats WHERE button_id = ?",
+                        (button_id,))
+                    stats[button_id] = cursor.fetchone()
+                stats[button_id] = merge(stats[button_id], launched_at)
+            cursor.executemany(
+                """INSERT OR REPLACE INTO button_stats 
+                (button_id, launch_count, frecency, last_launched) 
+                VALUES (?, ?, ?, ?)""",
+                [(bid, *stat) for bid, stat in stats.items()]
+            )
+            conn.commit()
+        return stats
+
+    def _init_icon_dir(self):
+        """初始化图标目录"""
+        self.icon_dir = os.path.join(os.path.dirname(self.db_path), "icons")
+        if not os.path.exists(self.icon_dir):
+            os.makedirs(self.icon_dir)
+
+    def get_icon_path(self, original_path: str) -> str:
+        """获取图标保存路径"""
+        if not original_path:
+            return ""
         
         self._init_icon_dir()
         filename = os.path.basename(original_path)
@@ -720,412 +789,3646 @@ class DatabaseManager:
             return icon_path  # 返回原始路径作为回退
 
 
-class HighlightTextEdit(QLineEdit):
-    """支持高亮显示搜索关键字的文本框"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.highlight_format = QTextCharFormat()
-        self.highlight_format.setBackground(QColor(255, 255, 0))  # 黄色背景高亮
+class LaunchHistory:
+    """启动历史（内存写缓冲 + 批量落盘 + 增量维护的衰减频率评分）
     
-    def highlight_text(self, text: str):
-        """高亮显示匹配的文本"""
-        if not text:
+    评分按半衰期指数衰减：每次启动时先把旧分数衰减到当前时刻再加1，
+    比较时同样衰减到同一时刻，因此无需重新统计历史表。
+    """
+    HALF_LIFE = 7 * 24 * 3600  # 半衰期: 7天
+    FLUSH_THRESHOLD = 20  # 缓冲记录达到该数量时请求尽快落盘
+    FREQUENT_LIMIT = 12  # "常用"分组显示的按钮数量
+
+    def __init__(self):
+        self._pending = []  # 待写入的 (button_id, launched_at)
+        self._stats = {}  # button_id -> [launch_count, frecency, last_launched]
+        self._loaded = False
+
+    def load(self):
+        """从数据库加载启动统计"""
+        if self._loaded:
             return
-        
-        # 获取当前文本
-        current_text = self.text()
-        if not current_text:
+        try:
+            for button_id, count, frecency, last in DatabaseManager().get_button_stats():
+                self._stats[button_id] = [count, frecency, last]
+        except sqlite3.Error as e:
+            print(f"[ERROR] 加载启动统计失败: {str(e)}")
+        self._loaded = True
+
+    def seed(self, stats: List[Tuple[int, int, float, float]]):
+        """用快照中的统计初始化（不访问数据库，之后应通过 replace 换成数据库中的最新统计）"""
+        if self._loaded:
             return
-        
-        # 创建高亮格式
-        palette = self.palette()
-        palette.setColor(QPalette.Highlight, QColor(255, 255, 0))
-        palette.setColor(QPalette.HighlightedText, Qt.black)
-        self.setPalette(palette)
-        
-        # 查找所有匹配位置
-        start_pos = 0
-        while True:
-            pos = current_text.lower().find(text.lower(), start_pos)
-            if pos == -1:
-                break
-            self.setSelection(pos, len(text))
-            start_pos = pos + len(text)
+        for button_id, count, frecency, last in stats:
+            self._stats[button_id] = [count, frecency, last]
+        self._loaded = True
 
-class ButtonEditor(QDialog):
-    def __init__(self, button_id: Optional[int] = None, group_id: Optional[int] = None, 
-                 name: str = "", path: str = "", arguments: str = "", 
-                 working_dir: str = "", run_as_admin: bool = False, 
-                 icon_path: str = "", is_favorite: bool = False, parent=None):
-        super().__init__(parent)
-        self.button_id = button_id
-        self.group_id = group_id
-        self.parent = parent
-        self.icon_path = icon_path
+    def replace(self, stats: List[Tuple[int, int, float, float]]):
+        """用数据库中的最新统计替换内存统计（尚未落盘的启动重新累加上去）"""
+        self._stats = {bid: [count, frecency, last] for bid, count, frecency, last in stats}
+        for button_id, when in self._pending:
+            self._stats[button_id] = list(self.merge(self._stats.get(button_id), when))
+        self._loaded = True
+
+    def snapshot(self) -> List[Tuple[int, int, float, float]]:
+        """导出当前内存统计 (button_id, launch_count, frecency, last_launched)"""
+        return [(bid, *stat) for bid, stat in self._stats.items()]
+
+    def _decayed(self, frecency: float, last: float, now: float) -> float:
+        """将评分衰减到指定时刻"""
+        if now <= last:
+            return frecency
+        return frecency * 0.5 ** ((now - last) / self.HALF_LIFE)
+
+    def merge(self, stat: Optional[tuple], when: float) -> Tuple[int, float, float]:
+        """在 (launch_count, frecency, last_launched) 上累加一次启动（stat 为 None 表示尚无统计）"""
+        count, frecency, last = stat or (0, 0.0, when)
+        return count + 1, self._decayed(frecency, last, when) + 1.0, max(last, when)
+
+    def record(self, button_id: int, when: Optional[float] = None) -> bool:
+        """记录一次启动（只写内存），返回是否达到落盘阈值"""
+        when = time.time() if when is None else when
+        self._stats[button_id] = list(self.merge(self._stats.get(button_id), when))
+        self._pending.append((button_id, when))
+        return len(self._pending) >= self.FLUSH_THRESHOLD
+
+    def score(self, button_id: int, now: Optional[float] = None) -> float:
+        """获取按钮当前的频率评分"""
+        stat = self._stats.get(button_id)
+        if not stat:
+            return 0.0
+        now = time.time() if now is None else now
+        return self._decayed(stat[1], stat[2], now)
+
+    def top(self, limit: Optional[int] = None) -> List[int]:
+        """按频率评分降序返回按钮ID"""
+        now = time.time()
+        ranked = sorted(self._stats, key=lambda bid: self.score(bid, now), reverse=True)
+        return ranked[:limit or self.FREQUENT_LIMIT]
+
+    def forget(self, button_id: int):
+        """移除已删除按钮的内存统计"""
+        self._stats.pop(button_id, None)
+        self._pending = [r for r in self._pending if r[0] != button_id]
+
+    def flush(self) -> int:
+        """将缓冲的启动记录批量写入数据库（统计在数据库中增量合并），返回写入的记录数"""
+        if not self._pending:
+            return 0
+        records = self._pending
+        try:
+            stats = DatabaseManager().save_launch_batch(records, self.merge)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 写入启动历史失败: {str(e)}")
+            return 0
+        # 合并结果包含其他进程写入的启动，以它为准
+        for button_id, stat in stats.items():
+            if button_id in self._stats:
+                self._stats[button_id] = list(stat)
+        self._pending = []
+        return len(records)
+
+
+class LatencyHistogram:
+    """对数分桶的耗时直方图（每个2倍区间 BUCKETS_PER_OCTAVE 个桶，只保存非空桶）
+    
+    百分位取所在桶的上界（且不超过最大值），相对误差不超过约19%，存储大小与样本数无关。
+    """
+    BUCKETS_PER_OCTAVE = 4
+    MIN_MS = 0.1  # 第0个桶的上界
+
+    def __init__(self, buckets: Optional[Dict[int, int]] = None, total_ms: float = 0.0,
+                 max_ms: float = 0.0):
+        self.buckets = dict(buckets or {})  # 桶序号 -> 样本数
+        self.count = sum(self.buckets.values())
+        self.total_ms = total_ms
+        self.max_ms = max_ms
+
+    @classmethod
+    def bucket(cls, ms: float) -> int:
+        if ms <= cls.MIN_MS:
+            return 0
+        return int(math.ceil(math.log2(ms / cls.MIN_MS) * cls.BUCKETS_PER_OCTAVE))
+
+    @classmethod
+    def upper_bound(cls, bucket: int) -> float:
+        return cls.MIN_MS * 2 ** (bucket / cls.BUCKETS_PER_OCTAVE)
+
+    def add(self, ms: float):
+        index = self.bucket(ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 分位数（0-1），无样本时返回 None"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return min(self.upper_bound(index), self.max_ms)
+        return self.max_ms
+
+    def dumps(self) -> str:
+        return json.dumps({str(k): v for k, v in sorted(self.buckets.items())}, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text: str, total_ms: float = 0.0, max_ms: float = 0.0) -> 'LatencyHistogram':
+        return cls({int(k): v for k, v in json.loads(text or "{}").items()}, total_ms, max_ms)
+
+
+class LatencyStats:
+    """各按钮分阶段的启动耗时统计（内存维护，与启动历史一起批量落盘）"""
+    PHASES = OrderedDict([
+        ("queue", "排队"),  # 点击到后台线程开始处理
+        ("resolve", "路径解析"),  # 环境变量展开、路径规范化
+        ("validate", "路径检查"),  # 文件/网络共享是否可访问
+        ("spawn", "创建进程"),  # 调用启动接口到返回
+        ("ready", "窗口就绪"),  # 进程创建到首个窗口可交互（仅 Windows）
+        ("total", "总计"),  # 点击到进程创建完成
+    ])
+    REPORT_HEADERS = ["ID", "分组", "名称", "阶段", "次数", "p50(ms)", "p95(ms)", "最大(ms)"]
+
+    def __init__(self):
+        self._histograms = {}  # (button_id, phase) -> LatencyHistogram
+        self._dirty = set()
+        self._loaded = False
+
+    def load(self):
+        """从数据库加载直方图"""
+        if self._loaded:
+            return
+        try:
+            for button_id, phase, buckets, _, total_ms, max_ms in DatabaseManager().get_launch_latency():
+                self._histograms[(button_id, phase)] = LatencyHistogram.loads(buckets, total_ms, max_ms)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[ERROR] 加载启动耗时统计失败: {str(e)}")
+        self._loaded = True
+
+    def button_ids(self) -> set:
+        return {button_id for button_id, _ in self._histograms}
+
+    def record(self, button_id: int, phases: Dict[str, float]):
+        """记录一次启动的各阶段耗时（毫秒），先加载已保存的直方图以免落盘时覆盖"""
+        self.load()
+        for phase, ms in phases.items():
+            key = (button_id, phase)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.add(ms)
+            self._dirty.add(key)
+
+    def percentiles(self, button_id: int, phase: str = "total") -> Optional[Tuple[float, float, int]]:
+        """(p50, p95, 样本数)，没有记录时返回 None"""
+        histogram = self._histograms.get((button_id, phase))
+        if histogram is None or not histogram.count:
+            return None
+        return histogram.percentile(0.5), histogram.percentile(0.95), histogram.count
+
+    def summary(self, button_id: int) -> str:
+        """按钮提示中显示的耗时摘要"""
+        lines = []
+        for phase in ("total", "ready"):
+            stats = self.percentiles(button_id, phase)
+            if stats:
+                p50, p95, count = stats
+                lines.append(f"{self.PHASES[phase]}耗时: p50 {p50:.0f} ms / p95 {p95:.0f} ms（{count} 次）")
+        return "\n".join(lines)
+
+    def forget(self, button_id: int):
+        for key in [key for key in self._histograms if key[0] == button_id]:
+            del self._histograms[key]
+            self._dirty.discard(key)
+
+    def flush(self) -> int:
+        """将有变化的直方图写入数据库，返回写入的行数"""
+        if not self._dirty:
+            return 0
+        rows = []
+        for key in self._dirty:
+            histogram = self._histograms.get(key)
+            if histogram is not None:
+                rows.append((key[0], key[1], histogram.dumps(), histogram.count,
+                             histogram.total_ms, histogram.max_ms))
+        try:
+            DatabaseManager().save_launch_latency(rows)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 写入启动耗时统计失败: {str(e)}")
+            return 0
+        self._dirty = set()
+        return len(rows)
+
+    def report_rows(self, records, group_names: Dict[int, str]) -> List[list]:
+        """报告行（按按钮顺序，每个有记录的阶段一行）"""
+        rows = []
+        for record in records:
+            for phase, label in self.PHASES.items():
+                histogram = self._histograms.get((record.id, phase))
+                if histogram is None or not histogram.count:
+                    continue
+                rows.append([record.id, group_names.get(record.group_id, "未知分组"), record.name, label,
+                             histogram.count, round(histogram.percentile(0.5), 1),
+                             round(histogram.percentile(0.95), 1), round(histogram.max_ms, 1)])
+        return rows
+
+    def write_csv(self, stream, records, group_names: Dict[int, str]) -> int:
+        """以 CSV 格式写出报告，返回数据行数"""
+        import csv
+        rows = self.report_rows(records, group_names)
+        writer = csv.writer(stream)
+        writer.writerow(self.REPORT_HEADERS)
+        writer.writerows(rows)
+        return len(rows)
+
+
+class CatalogSnapshot:
+    """启动快照（退出时写入已渲染的目录，下次启动直接通过 mmap 读取绘制）
+    
+    文件格式: MAGIC + 头部(格式版本, 目录数据版本, 负载长度) + UTF-8 JSON 负载。
+    负载包含按显示顺序排列的分组、按钮、启动统计和预缩放图标引用。
+    """
+    PATH = "catalog.snapshot"
+    MAGIC = b"PLSNAP"
+    FORMAT_VERSION = 5
+    HEADER = struct.Struct("<HqI")  # 格式版本, 目录数据版本, 负载长度
+
+    def __init__(self, catalog_version: int, groups: List[Tuple[int, str, int, int]],
+                 records: List[ButtonRecord], stats: List[Tuple[int, int, float, float]] = (),
+                 icons: Optional[Dict[str, list]] = None):
+        self.catalog_version = catalog_version
+        self.groups = groups
+        self.records = records
+        self.stats = list(stats)
+        self.icons = icons or {}  # icon_path -> [缩放后图标路径, mtime_ns, 文件大小]
+
+    @classmethod
+    def read(cls, path: Optional[str] = None) -> Optional['CatalogSnapshot']:
+        """读取快照，文件缺失或格式不符时返回 None"""
+        path = path or cls.PATH
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = len(cls.MAGIC)
+                if mm[:start] != cls.MAGIC:
+                    return None
+                version, catalog_version, length = cls.HEADER.unpack_from(mm, start)
+                offset = start + cls.HEADER.size
+                if version != cls.FORMAT_VERSION or offset + length > len(mm):
+                    return None
+                payload = json.loads(mm[offset:offset + length].decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[DEBUG] 启动快照不可用: {str(e)}")
+            return None
+        return cls(catalog_version,
+                   [tuple(g) for g in payload["groups"]],
+                   [ButtonRecord.from_row(tuple(r)) for r in payload["records"]],
+                   [tuple(s) for s in payload.get("stats", [])],
+                   payload.get("icons", {}))
+
+    def write(self, path: Optional[str] = None):
+        """写入快照（先写临时文件再替换，避免留下半个文件）"""
+        path = path or self.PATH
+        payload = json.dumps({
+            "groups": [list(g) for g in self.groups],
+            "records": [list(r.as_tuple()) for r in self.records],
+            "stats": [list(s) for s in self.stats],
+            "icons": self.icons,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.HEADER.pack(self.FORMAT_VERSION, self.catalog_version, len(payload)))
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def discard(path: Optional[str] = None):
+        """删除快照（下次启动改为从数据库加载）"""
+        try:
+            os.remove(path or CatalogSnapshot.PATH)
+        except OSError:
+            pass
+
+
+class StartupTimer:
+    """启动阶段计时（按阶段记录耗时，用于跟踪启动到可交互的时间）"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []  # (阶段名, 耗时秒)
+
+    def mark(self, phase: str):
+        """结束当前阶段并记录耗时"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self) -> str:
+        """输出各阶段耗时汇总"""
+        lines = [f"[TIMING] {phase}: {elapsed * 1000:.1f} ms" for phase, elapsed in self.phases]
+        lines.append(f"[TIMING] 启动总耗时: {(self.last - self.start) * 1000:.1f} ms")
+        text = "\n".join(lines)
+        print(text)
+        return text
+
+
+class LaunchError(Exception):
+    """程序无法启动（路径不存在或驱动器不可访问）"""
+
+
+class PathUnreachableError(LaunchError):
+    """路径所在的网络共享或驱动器不可访问"""
+
+
+class PathResolver:
+    """路径解析: 展开环境变量（%AppData% 或 $HOME）和用户目录并规范化
+    
+    解析结果按原始路径缓存 RESOLVE_TTL 秒；网络共享（\\\\server\\share）和驱动器的可达性
+    按根路径记忆，检测为不可达的根在 DOWN_TTL 秒内直接失败，不再等待完整的网络超时。
+    可在后台启动线程中使用（内部加锁）。
+    """
+    RESOLVE_TTL = 300  # 秒
+    DOWN_TTL = 30  # 不可达根路径的记忆时间（秒）
+    UP_TTL = 60  # 可达根路径的记忆时间（秒）
+    _WINDOWS_VAR = re.compile(r"%([^%]+)%")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resolved = {}  # 原始路径 -> (解析结果, 解析时间)
+        self._roots = {}  # 根路径 -> (是否可达, 检测时间)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """规范化保存形式: 去除空白和引号，Windows 下统一为反斜杠（不展开变量）"""
+        path = (path or "").strip().strip('"\'')
+        if sys.platform == "win32":
+            path = path.replace('/', '\\')
+        return path
+
+    @classmethod
+    def expand(cls, path: str) -> str:
+        """展开环境变量和用户目录并规范化路径"""
+        path = cls.normalize(path)
+        if not path:
+            return path
+        path = cls._WINDOWS_VAR.sub(lambda m: os.environ.get(m.group(1), m.group(0)), path)
+        path = os.path.expanduser(os.path.expandvars(path))
+        return os.path.normpath(path)
+
+    @staticmethod
+    def share_root(path: str) -> Optional[str]:
+        """网络共享或驱动器的根路径，其他路径返回 None"""
+        if path.startswith('\\\\'):
+            parts = path[2:].split('\\')
+            if len(parts) >= 2 and parts[0] and parts[1]:
+                return '\\\\' + parts[0] + '\\' + parts[1]
+            return None
+        if len(path) >= 2 and path[1] == ':' and path[0].isalpha():
+            return path[0].upper() + ':\\'
+        return None
+
+    @staticmethod
+    def is_network_root(root: Optional[str]) -> bool:
+        """根路径是否为网络位置（UNC 共享，或 Windows 上映射的网络驱动器）"""
+        if not root:
+            return False
+        if root.startswith('\\\\'):
+            return True
+        if sys.platform == "win32":
+            import ctypes
+            return ctypes.windll.kernel32.GetDriveTypeW(root) == 4  # DRIVE_REMOTE
+        return False
+
+    def resolve(self, path: str) -> str:
+        """解析路径（TTL 缓存）"""
+        now = time.time()
+        with self._lock:
+            cached = self._resolved.get(path)
+            if cached is not None and now - cached[1] < self.RESOLVE_TTL:
+                return cached[0]
+        resolved = self.expand(path)
+        with self._lock:
+            self._resolved[path] = (resolved, now)
+        return resolved
+
+    def is_down(self, root: str) -> bool:
+        """根路径最近是否检测为不可达"""
+        with self._lock:
+            state = self._roots.get(root)
+        return state is not None and not state[0] and time.time() - state[1] < self.DOWN_TTL
+
+    def is_up(self, root: str) -> bool:
+        """根路径最近是否检测为可达"""
+        with self._lock:
+            state = self._roots.get(root)
+        return state is not None and state[0] and time.time() - state[1] < self.UP_TTL
+
+    def mark(self, root: Optional[str], reachable: bool):
+        """记录根路径的可达性"""
+        if root:
+            with self._lock:
+                self._roots[root] = (reachable, time.time())
+
+    def mark_path_down(self, path: str):
+        """将路径所在的网络共享标记为不可达（例如路径检查超时）
         
-        self.setWindowTitle("编辑按钮" if button_id else "添加按钮")
-        self.setWindowModality(Qt.ApplicationModal)
-        self.resize(500, 300)
+        本地驱动器不标记：一次缓慢的检查不应让同一驱动器上的所有启动在 DOWN_TTL 内直接失败。
+        """
+        root = self.share_root(self.resolve(path))
+        if self.is_network_root(root):
+            self.mark(root, False)
+
+    def invalidate(self, path: Optional[str] = None):
+        """清除缓存（不指定路径时全部清除）"""
+        with self._lock:
+            if path is None:
+                self._resolved.clear()
+                self._roots.clear()
+            else:
+                self._resolved.pop(path, None)
+
+    def check(self, path: str):
+        """检查已解析的路径是否可用，不可用时抛出 LaunchError"""
+        root = self.share_root(path)
+        if root and self.is_down(root):
+            raise PathUnreachableError(f"路径 {path} 所在的 {root} 当前不可访问，请检查网络连接或驱动器映射")
+        if os.path.exists(path):
+            self.mark(root, True)
+            return
+        if root is None:
+            raise LaunchError(f"路径 {path} 不存在")
+        if self.is_up(root) or os.path.exists(root):
+            self.mark(root, True)
+            if path.startswith('\\\\'):
+                return  # 网络路径可能只是没有列目录权限，尝试直接访问
+            raise LaunchError(f"路径 {path} 不存在")
+        self.mark(root, False)
+        raise PathUnreachableError(f"路径 {path} 不可访问，请检查网络连接或驱动器映射")
+
+
+class PathHealth:
+    """按钮路径健康检查（不依赖界面，可在后台线程中调用）"""
+    OK = "ok"
+    MISSING = "missing"  # 程序路径不存在
+    UNREACHABLE = "unreachable"  # 网络共享或驱动器不可访问
+    BAD_WORKDIR = "bad_workdir"  # 工作目录不存在
+    
+    OK_RECHECK = 6 * 3600  # 正常路径的复查间隔（秒）
+    BROKEN_RECHECK = 15 * 60  # 失效路径的复查间隔（秒）
+
+    @staticmethod
+    def host_root(record: ButtonRecord, resolver: PathResolver) -> Optional[str]:
+        """按钮程序路径所在的共享/驱动器根，本地路径返回 None"""
+        return PathResolver.share_root(resolver.resolve(record.path))
+
+    @classmethod
+    def check(cls, record: ButtonRecord, resolver: PathResolver) -> Tuple[str, str]:
+        """检查按钮的程序路径和工作目录，返回 (status, message)"""
+        try:
+            resolver.check(resolver.resolve(record.path))
+        except PathUnreachableError as e:
+            return cls.UNREACHABLE, str(e)
+        except LaunchError as e:
+            return cls.MISSING, str(e)
+        if record.working_dir:
+            working_dir = resolver.resolve(record.working_dir)
+            if not os.path.isdir(working_dir):
+                return cls.BAD_WORKDIR, f"工作目录 {working_dir} 不存在"
+        return cls.OK, ""
+
+    @classmethod
+    def is_due(cls, status: Optional[str], checked_at: float, now: float) -> bool:
+        """是否需要重新检查"""
+        if status is None:
+            return True
+        interval = cls.OK_RECHECK if status == cls.OK else cls.BROKEN_RECHECK
+        return now - checked_at >= interval
+
+
+class LaunchTrace:
+    """一次启动的分阶段计时（各阶段名见 LatencyStats.PHASES，单位毫秒）"""
+    __slots__ = ('start', 'last', 'phases')
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase: str):
+        """结束一个阶段（从上一次标记到现在）"""
+        now = time.perf_counter()
+        self.phases[phase] = (now - self.last) * 1000
+        self.last = now
+
+    def mark_total(self):
+        """记录从开始到最近一次标记的总耗时"""
+        self.phases["total"] = (self.last - self.start) * 1000
+
+
+def prepare_launch(path: str, working_dir: str = "",
+                   resolver: Optional[PathResolver] = None,
+                   trace: Optional[LaunchTrace] = None) -> Tuple[str, str]:
+    """解析并检查启动路径和工作目录，路径不可用时抛出 LaunchError"""
+    resolver = resolver or PathResolver()
+    path = resolver.resolve(path)
+    if working_dir:
+        working_dir = resolver.resolve(working_dir)
+    if trace is not None:
+        trace.mark("resolve")
+    resolver.check(path)
+    if trace is not None:
+        trace.mark("validate")
+    return path, working_dir
+
+
+class ResourceLimits:
+    """按钮的进程资源设置：优先级、CPU 亲和性、内存上限和 CPU 时间上限
+    
+    在进程创建后由父进程施加（不使用 preexec_fn，启动在后台线程中进行，fork 后执行
+    Python 代码可能死锁）。Linux 使用 setpriority / sched_setaffinity / prlimit；
+    Windows 使用优先级类、SetProcessAffinityMask 和作业对象。
+    交给系统外壳打开的文件和目录无法获得进程，不受这些设置影响。
+    """
+    PRIORITIES = {  # 名称 -> (显示文本, Linux nice 值, Windows 优先级类)
+        'idle': ("空闲", 19, 0x00000040),
+        'below_normal': ("低于正常", 10, 0x00004000),
+        'normal': ("正常", 0, 0x00000020),
+        'above_normal': ("高于正常", -5, 0x00008000),
+        'high': ("高", -10, 0x00000080),
+    }
+    __slots__ = ('priority', 'affinity', 'memory_mb', 'cpu_seconds')
+
+    def __init__(self, priority: str = 'normal', affinity: Optional[List[int]] = None,
+                 memory_mb: int = 0, cpu_seconds: int = 0):
+        self.priority = priority if priority in self.PRIORITIES else 'normal'
+        self.affinity = sorted(set(affinity or []))
+        self.memory_mb = max(0, int(memory_mb or 0))
+        self.cpu_seconds = max(0, int(cpu_seconds or 0))
+
+    @classmethod
+    def from_record(cls, record: ButtonRecord) -> 'ResourceLimits':
+        """从按钮记录创建（亲和性格式错误时忽略该项）"""
+        try:
+            affinity = cls.parse_affinity(record.cpu_affinity)
+        except ValueError as e:
+            print(f"[ERROR] 按钮 {record.name} 的 CPU 亲和性设置无效: {str(e)}")
+            affinity = []
+        return cls(record.process_priority, affinity, record.memory_limit_mb, record.cpu_time_limit)
+
+    @staticmethod
+    def parse_affinity(text: str) -> List[int]:
+        """解析 "0-3,6" 形式的 CPU 列表，格式错误时抛出 ValueError"""
+        cpus = set()
+        for part in (text or "").replace(" ", "").split(","):
+            if not part:
+                continue
+            first, _, last = part.partition("-")
+            start, end = int(first), int(last or first)
+            if start < 0 or end < start:
+                raise ValueError(f"无效的 CPU 范围: {part}")
+            cpus.update(range(start, end + 1))
+        return sorted(cpus)
+
+    def is_default(self) -> bool:
+        return (self.priority == 'normal' and not self.affinity and
+                not self.memory_mb and not self.cpu_seconds)
+
+    def creation_flags(self) -> int:
+        """Windows 创建进程时使用的优先级类标志"""
+        return 0 if self.priority == 'normal' else self.PRIORITIES[self.priority][2]
+
+    def apply(self, pid: int, handle=None):
+        """对已创建的进程施加设置（尽力而为，单项失败只记录日志）"""
+        if self.is_default():
+            return
+        if sys.platform == "win32":
+            self._apply_windows(pid, handle)
+        else:
+            self._apply_posix(pid)
+
+    def _apply_posix(self, pid: int):
+        nice = self.PRIORITIES[self.priority][1]
+        if nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, pid, nice)
+            except (OSError, AttributeError) as e:  # 提高优先级（负 nice 值）通常需要 root
+                print(f"[ERROR] 设置进程 {pid} 优先级失败: {str(e)}")
+        if self.affinity:
+            try:
+                available = os.sched_getaffinity(0)
+                cpus = [cpu for cpu in self.affinity if cpu in available] or sorted(available)
+                os.sched_setaffinity(pid, cpus)
+            except (OSError, AttributeError) as e:
+                print(f"[ERROR] 设置进程 {pid} CPU 亲和性失败: {str(e)}")
+        try:
+            import resource
+            if self.memory_mb:
+                limit = self.memory_mb * 1024 * 1024
+                resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+            if self.cpu_seconds:
+                resource.prlimit(pid, resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds))
+        except (ImportError, OSError, AttributeError, ValueError) as e:
+            print(f"[ERROR] 设置进程 {pid} 资源上限失败: {str(e)}")
+
+    def _apply_windows(self, pid: int, handle=None):
+        import win32api
+        import win32con
+        import win32job
+        import win32process
+        owned = handle is None
+        try:
+            if owned:
+                handle = win32api.OpenProcess(
+                    win32con.PROCESS_SET_INFORMATION | win32con.PROCESS_SET_QUOTA |
+                    win32con.PROCESS_TERMINATE | win32con.PROCESS_QUERY_INFORMATION, False, pid)
+            if self.priority != 'normal':
+                win32process.SetPriorityClass(handle, self.PRIORITIES[self.priority][2])
+            if self.affinity:
+                process_mask, system_mask = win32process.GetProcessAffinityMask(handle)
+                mask = sum(1 << cpu for cpu in self.affinity) & system_mask
+                win32process.SetProcessAffinityMask(handle, mask or system_mask)
+            if self.memory_mb or self.cpu_seconds:
+                # 作业对象：进程退出后作业随之释放；关闭句柄不会结束进程
+                job = win32job.CreateJobObject(None, "")
+                info = win32job.QueryInformationJobObject(job, win32job.JobObjectExtendedLimitInformation)
+                if self.memory_mb:
+                    info['ProcessMemoryLimit'] = self.memory_mb * 1024 * 1024
+                    info['BasicLimitInformation']['LimitFlags'] |= win32job.JOB_OBJECT_LIMIT_PROCESS_MEMORY
+                if self.cpu_seconds:
+                    info['BasicLimitInformation']['PerProcessUserTimeLimit'] = self.cpu_seconds * 10 ** 7
+                    info['BasicLimitInformation']['LimitFlags'] |= win32job.JOB_OBJECT_LIMIT_PROCESS_TIME
+                win32job.SetInformationJobObject(job, win32job.JobObjectExtendedLimitInformation, info)
+                win32job.AssignProcessToJobObject(job, handle)
+                job.Close()
+        except Exception as e:
+            print(f"[ERROR] 设置进程 {pid} 资源限制失败: {str(e)}")
+        finally:
+            if owned and handle is not None:
+                handle.Close()
+
+
+def start_program(path: str, arguments: str = "", working_dir: str = "", run_as_admin: bool = False,
+                  limits: Optional[ResourceLimits] = None):
+    """启动已通过 prepare_launch 检查的程序或目录（主窗口和命令行模式共用）
+    
+    返回可跟踪的进程（subprocess.Popen 或 PID），交给系统外壳打开时返回 None。
+    limits 只对能获得进程的启动方式生效。
+    """
+    import subprocess
+    limits = limits or ResourceLimits()
+    
+    if sys.platform == "win32":
+        if os.path.isdir(path):  # 如果是目录
+            os.startfile(path)  # 使用系统默认方式打开目录
+            return None
         
-        layout = QVBoxLayout()
+        params = arguments if arguments else ""
+        working_dir = working_dir if working_dir else os.path.dirname(path)
         
-        # 按钮名称
-        name_layout = QHBoxLayout()
-        name_layout.addWidget(QLabel("按钮名称:"))
-        self.name_edit = QLineEdit(name)
-        name_layout.addWidget(self.name_edit)
+        # 确保工作目录存在
+        if working_dir and not os.path.exists(working_dir):
+            working_dir = None
+        
+        if run_as_admin:
+            # 以管理员权限运行
+            from win32com.shell.shell import ShellExecuteEx
+            from win32com.shell import shellcon
+            import win32con
+            
+            info = ShellExecuteEx(
+                nShow=win32con.SW_SHOWNORMAL,
+                fMask=shellcon.SEE_MASK_NOCLOSEPROCESS,
+                lpVerb='runas',
+                lpFile=path,
+                lpParameters=params,
+                lpDirectory=working_dir
+            )
+            handle = info.get('hProcess') if info else None
+            if not handle:
+                return None
+            try:
+                import win32process
+                pid = win32process.GetProcessId(handle)
+                limits.apply(pid, handle)
+                return pid
+            finally:
+                handle.Close()
+        else:
+            # 使用subprocess更可靠地启动程序
+            try:
+                process = subprocess.Popen([path] + params.split(), cwd=working_dir,
+                                           creationflags=limits.creation_flags())
+                limits.apply(process.pid)
+                return process
+            except Exception:
+                # 回退到os.startfile
+                os.startfile(path)
+                return None
+    else:
+        # 非Windows系统: 可执行文件直接运行，目录和其他文件交给桌面环境打开
+        import shlex
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            working_dir = working_dir if working_dir and os.path.isdir(working_dir) else os.path.dirname(path)
+            process = subprocess.Popen([path] + shlex.split(arguments or ""), cwd=working_dir or None,
+                                       start_new_session=True)
+            limits.apply(process.pid)
+            return process
+        subprocess.Popen(["xdg-open", path], start_new_session=True)
+        return None
+
+
+def wait_process_ready(process, timeout_ms: int) -> bool:
+    """等待进程的首个窗口可以接受输入（Windows WaitForInputIdle），其他平台或超时返回 False"""
+    if sys.platform != "win32" or process is None:
+        return False
+    try:
+        import win32api
+        import win32con
+        import win32event
+        if isinstance(process, int):
+            handle = win32api.OpenProcess(win32con.SYNCHRONIZE | win32con.PROCESS_QUERY_INFORMATION,
+                                          False, process)
+            try:
+                return win32event.WaitForInputIdle(handle, timeout_ms) == 0
+            finally:
+                handle.Close()
+        return win32event.WaitForInputIdle(int(process._handle), timeout_ms) == 0
+    except Exception as e:  # 控制台程序等没有消息循环的进程会直接失败
+        print(f"[DEBUG] 无法等待进程就绪: {str(e)}")
+        return False
+
+
+class ProcessRegistry:
+    """已启动进程登记表（PID、启动时间、按钮ID），由主线程定时增量回收已退出的进程
+    
+    存活检查尽量廉价：自己启动的子进程用 Popen.poll；其他 PID 在 Linux 上读取
+    /proc/<pid>/stat 并比对进程启动时间（防止 PID 复用），在 Windows 上用
+    OpenProcess/GetExitCodeProcess。
+    """
+    LAUNCH = "launch"  # 已在运行时照常再启动一个实例
+    FOCUS = "focus"  # 已在运行时切换到已有窗口
+    REFUSE = "refuse"  # 已在运行时不再启动
+    POLICIES = (LAUNCH, FOCUS, REFUSE)
+
+    def __init__(self):
+        self.entries = {}  # pid -> [按钮ID, 启动时间, Popen 或 None, /proc 启动时钟]
+        self.by_button = {}  # 按钮ID -> {pid}
+
+    def add(self, button_id: int, process) -> Optional[int]:
+        """登记一次启动（process 为 start_program 的返回值），返回 PID"""
+        if process is None:
+            return None
+        popen = None if isinstance(process, int) else process
+        pid = process if popen is None else popen.pid
+        proc_start = None if popen is not None else self.proc_start_time(pid)
+        self.entries[pid] = [button_id, time.time(), popen, proc_start]
+        self.by_button.setdefault(button_id, set()).add(pid)
+        return pid
+
+    def pids(self, button_id: int) -> List[int]:
+        """按钮当前登记的进程（最近启动的在前）"""
+        pids = self.by_button.get(button_id, ())
+        return sorted(pids, key=lambda pid: self.entries[pid][1], reverse=True)
+
+    def is_running(self, button_id: int) -> bool:
+        return bool(self.by_button.get(button_id))
+
+    def running_buttons(self) -> set:
+        return set(self.by_button)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def reap(self) -> set:
+        """回收已退出的进程，返回运行状态发生变化的按钮ID"""
+        changed = set()
+        for pid, (button_id, _, popen, proc_start) in list(self.entries.items()):
+            if self.alive(pid, popen, proc_start):
+                continue
+            del self.entries[pid]
+            pids = self.by_button.get(button_id)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self.by_button[button_id]
+                    changed.add(button_id)
+        return changed
+
+    def forget_button(self, button_id: int):
+        """不再跟踪某按钮的进程（按钮被删除时调用）"""
+        for pid in self.by_button.pop(button_id, ()):
+            self.entries.pop(pid, None)
+
+    @staticmethod
+    def proc_start_time(pid: int) -> Optional[int]:
+        """读取 /proc/<pid>/stat 中的进程启动时钟，非 Linux 或进程不存在时返回 None"""
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # comm 字段可能包含空格和括号，从最后一个 ')' 之后解析；starttime 为第 22 个字段
+        fields = stat[stat.rfind(b")") + 2:].split()
+        try:
+            return int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    @classmethod
+    def alive(cls, pid: int, popen=None, proc_start: Optional[int] = None) -> bool:
+        """进程是否仍在运行"""
+        if popen is not None:
+            return popen.poll() is None
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return False
+            try:
+                code = ctypes.c_ulong()
+                if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                    return False
+                return code.value == 259  # STILL_ACTIVE
+            finally:
+                kernel32.CloseHandle(handle)
+        if proc_start is not None:
+            return cls.proc_start_time(pid) == proc_start
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+def focus_process_window(pid: int) -> bool:
+    """把指定进程的窗口切换到前台，找不到窗口时返回 False"""
+    if sys.platform == "win32":
+        import win32con
+        import win32gui
+        import win32process
+        windows = []
+
+        def collect(hwnd, _):
+            if (win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd) and
+                    win32process.GetWindowThreadProcessId(hwnd)[1] == pid):
+                windows.append(hwnd)
+            return True
+
+        try:
+            win32gui.EnumWindows(collect, None)
+            if not windows:
+                return False
+            hwnd = windows[0]
+            if win32gui.IsIconic(hwnd):
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(hwnd)
+            return True
+        except Exception as e:
+            print(f"[DEBUG] 切换窗口失败: {str(e)}")
+            return False
+    # 其他平台: 借助 xdotool（若已安装）按 PID 查找并激活窗口
+    import subprocess
+    xdotool = shutil.which("xdotool")
+    if not xdotool:
+        return False
+    try:
+        result = subprocess.run([xdotool, "search", "--onlyvisible", "--pid", str(pid), "windowactivate"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+class SystemLoad:
+    """系统负载采样：两次采样之间 CPU 繁忙比例和 I/O 等待比例
+    
+    Linux 读取 /proc/stat，Windows 使用 GetSystemTimes（不提供 I/O 等待，按 0 计）；
+    其他平台无法采样时 is_idle 返回 None。
+    """
+    BUSY_THRESHOLD = 0.5  # CPU 繁忙比例超过此值视为忙碌
+    IOWAIT_THRESHOLD = 0.1  # I/O 等待比例超过此值视为磁盘忙碌
+
+    def __init__(self):
+        self._last = None
+
+    @staticmethod
+    def read_times() -> Optional[Tuple[float, float, float]]:
+        """累计 CPU 时间 (总计, 空闲含I/O等待, I/O等待)"""
+        if sys.platform == "win32":
+            import ctypes
+            idle, kernel, user = ctypes.c_ulonglong(), ctypes.c_ulonglong(), ctypes.c_ulonglong()
+            if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel),
+                                                         ctypes.byref(user)):
+                return None
+            return float(kernel.value + user.value), float(idle.value), 0.0  # 内核时间已包含空闲时间
+        try:
+            with open("/proc/stat") as f:
+                values = [int(v) for v in f.readline().split()[1:9]]
+        except (OSError, ValueError):
+            return None
+        if len(values) < 5:
+            return None
+        return float(sum(values)), float(values[3] + values[4]), float(values[4])
+
+    def sample(self) -> Optional[Tuple[float, float]]:
+        """自上次采样以来的 (CPU 繁忙比例, I/O 等待比例)，首次采样或无法采样时返回 None"""
+        times = self.read_times()
+        last, self._last = self._last, times
+        if times is None or last is None:
+            return None
+        total = times[0] - last[0]
+        if total <= 0:
+            return None
+        busy = 1.0 - (times[1] - last[1]) / total
+        iowait = (times[2] - last[2]) / total
+        return max(0.0, busy), max(0.0, iowait)
+
+    def is_idle(self) -> Optional[bool]:
+        """系统是否空闲（CPU 和磁盘都不忙），无法判断时返回 None"""
+        load = self.sample()
+        if load is None:
+            return None
+        busy, iowait = load
+        return busy < self.BUSY_THRESHOLD and iowait < self.IOWAIT_THRESHOLD
+
+    def measure(self, interval: float, stop: Optional[threading.Event] = None) -> Optional[bool]:
+        """在 interval 秒的时间窗口内采样判断是否空闲（阻塞调用线程；连续两次采样间隔过短时比例没有意义）
+        
+        stop 在等待期间被设置时返回 None。
+        """
+        self.sample()
+        if stop.wait(interval) if stop is not None else time.sleep(interval):
+            return None
+        return self.is_idle()
+
+
+class Prefetcher:
+    """把可能即将启动的程序及其同目录的动态库预读到系统页缓存（run 在后台线程中调用）
+    
+    Linux 使用 posix_fadvise(WILLNEED) 交给内核异步预读；其他平台按块顺序读取并丢弃。
+    每轮最多读取 budget_bytes；每个程序之前在 LOAD_WINDOW 秒内采样系统负载，忙碌时中止本轮；
+    REFRESH_SECONDS 内预读过且未变化的文件跳过。
+    """
+    LIBRARY_SUFFIXES = (".dll", ".so", ".dylib", ".pyd")
+    ADJACENT_LIMIT = 64  # 每个程序最多预读的同目录动态库数
+    CHUNK = 1024 * 1024
+    REFRESH_SECONDS = 1800
+    LOAD_WINDOW = 0.25  # 秒
+
+    def __init__(self, load: Optional[SystemLoad] = None):
+        self.load = load or SystemLoad()
+        self.stop_event = threading.Event()
+        self._done = {}  # 文件路径 -> ((mtime_ns, 大小), 预读时间)
+
+    @staticmethod
+    def rank(records, frecency: Dict[int, float], hourly: Dict[int, int], days: int,
+             limit: int, hour_weight: float = 1.0) -> List[ButtonRecord]:
+        """按频率评分（归一化）加当前时段启动概率排序，取前 limit 个"""
+        top_frecency = max(frecency.values(), default=0.0) or 1.0
+        scored = []
+        for record in records:
+            score = (frecency.get(record.id, 0.0) / top_frecency +
+                     hour_weight * hourly.get(record.id, 0) / max(1, days))
+            if score > 0:
+                scored.append((score, record))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [record for _, record in scored[:limit]]
+
+    @classmethod
+    def files_for(cls, path: str) -> List[str]:
+        """程序文件本身及同目录下的动态库（目录和不存在的路径返回空列表）"""
+        if not os.path.isfile(path):
+            return []
+        files = [path]
+        folder = os.path.dirname(path)
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    if (entry.path != path and
+                            (name.endswith(cls.LIBRARY_SUFFIXES) or ".so." in name) and entry.is_file()):
+                        files.append(entry.path)
+                        if len(files) > cls.ADJACENT_LIMIT:
+                            break
+        except OSError:
+            pass
+        return files
+
+    def prefetch_file(self, path: str, size: int) -> int:
+        """预读一个文件，返回发出的读取字节数"""
+        with open(path, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                return size
+            total = 0
+            while not self.stop_event.is_set():
+                chunk = f.read(self.CHUNK)
+                if not chunk:
+                    break
+                total += len(chunk)
+            return total
+
+    def run(self, paths: List[str], budget_bytes: int) -> Dict[str, object]:
+        """预读各程序（按优先顺序），返回本轮统计"""
+        result = {"programs": 0, "files": 0, "bytes": 0, "skipped": 0, "busy": False}
+        now = time.time()
+        for path in paths:
+            if self.stop_event.is_set():
+                break
+            if self.load.measure(self.LOAD_WINDOW, self.stop_event) is False:
+                result["busy"] = True
+                break
+            for file_path in self.files_for(path):
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                stamp = (st.st_mtime_ns, st.st_size)
+                done = self._done.get(file_path)
+                if done and done[0] == stamp and now - done[1] < self.REFRESH_SECONDS:
+                    result["skipped"] += 1
+                    continue
+                if result["bytes"] + st.st_size > budget_bytes:
+                    result["skipped"] += 1
+                    continue
+                try:
+                    result["bytes"] += self.prefetch_file(file_path, st.st_size)
+                except OSError as e:
+                    print(f"[DEBUG] 预读失败: {file_path}: {str(e)}")
+                    continue
+                self._done[file_path] = (stamp, now)
+                result["files"] += 1
+            result["programs"] += 1
+        return result
+
+
+class LaunchRequest:
+    """一次启动请求（同一按钮/路径的重复请求按 key 合并）"""
+    __slots__ = ('path', 'arguments', 'working_dir', 'run_as_admin', 'button_id', 'process', 'silent',
+                 'limits', 'trace')
+
+    def __init__(self, path: str, arguments: str = "", working_dir: str = "",
+                 run_as_admin: bool = False, button_id: Optional[int] = None, silent: bool = False,
+                 limits: Optional[ResourceLimits] = None):
+        self.path = path
+        self.arguments = arguments or ""
+        self.working_dir = working_dir or ""
+        self.run_as_admin = bool(run_as_admin)
+        self.button_id = button_id
+        self.process = None  # 启动成功后由调度线程填入 start_program 的返回值
+        self.silent = silent  # 失败时不弹出对话框（由启动方案等调用方汇总报告）
+        self.limits = limits  # 进程资源设置（None 表示不限制）
+        self.trace = LaunchTrace()  # 从点击开始的分阶段计时
+
+    @property
+    def key(self) -> tuple:
+        return ("button", self.button_id) if self.button_id is not None else ("path", self.path)
+
+
+class ProfilePlan:
+    """启动方案的调度状态（与界面无关）
+    
+    每项在依赖项启动完成、再等待自身延迟后进入就绪；就绪项按方案顺序启动，
+    同时处于"启动中/稳定中"的项不超过 max_concurrent。已在运行的项视为启动成功；
+    依赖项失败或被跳过时，依赖它的项直接跳过；循环依赖的项标记为失败。
+    """
+    PENDING = "pending"  # 等待依赖、延迟或空闲名额
+    STARTING = "starting"  # 已提交启动
+    SETTLING = "settling"  # 已启动，等待程序完成初始化后再释放名额
+    OK = "ok"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    ACTIVE = (STARTING, SETTLING)
+    TERMINAL = (OK, FAILED, SKIPPED)
+
+    def __init__(self, items: List[ProfileItem], max_concurrent: int = 3):
+        self.items = OrderedDict((item.button_id, item) for item in items)
+        self.max_concurrent = max(1, int(max_concurrent or 1))
+        self.state = {button_id: self.PENDING for button_id in self.items}
+        self.messages = {}  # button_id -> 失败/跳过原因
+        self.ready_at = {}  # button_id -> 依赖满足后计算出的就绪时间
+        self.changed = set()  # 自上次 take_changed 以来状态变化的按钮
+        for button_id in self.find_cycles():
+            self.finish(button_id, self.FAILED, "循环依赖")
+
+    def dependency(self, button_id: int) -> Optional[int]:
+        """有效的依赖项（不在方案内的依赖视为无依赖）"""
+        depends_on = self.items[button_id].depends_on
+        return depends_on if depends_on in self.items and depends_on != button_id else None
+
+    def find_cycles(self) -> set:
+        """找出处于依赖环上的项"""
+        cyclic = set()
+        for start in self.items:
+            seen = []
+            current = start
+            while current is not None and current not in seen:
+                seen.append(current)
+                current = self.dependency(current)
+            if current is not None:
+                cyclic.update(seen[seen.index(current):])
+        return cyclic
+
+    def finish(self, button_id: int, status: str, message: str = ""):
+        self.state[button_id] = status
+        if message:
+            self.messages[button_id] = message
+        self.changed.add(button_id)
+
+    def take_changed(self) -> set:
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def active(self) -> int:
+        return sum(1 for status in self.state.values() if status in self.ACTIVE)
+
+    def done(self) -> bool:
+        return all(status in self.TERMINAL for status in self.state.values())
+
+    def next_batch(self, now: float) -> Tuple[List[int], Optional[float]]:
+        """取出现在可以启动的项（标记为启动中），并返回下一次需要检查的时间"""
+        # 先传播失败：依赖项失败/跳过的项跳过（可能连锁，直到不再变化）
+        propagated = True
+        while propagated:
+            propagated = False
+            for button_id, status in self.state.items():
+                dependency = self.dependency(button_id)
+                if (status == self.PENDING and dependency is not None and
+                        self.state[dependency] in (self.FAILED, self.SKIPPED)):
+                    self.finish(button_id, self.SKIPPED, "依赖项未能启动")
+                    propagated = True
+        
+        batch = []
+        wake = None
+        slots = self.max_concurrent - self.active()
+        for button_id, item in self.items.items():
+            if self.state[button_id] != self.PENDING:
+                continue
+            dependency = self.dependency(button_id)
+            if dependency is not None and self.state[dependency] != self.OK:
+                continue
+            ready = self.ready_at.setdefault(button_id, now + item.delay_ms / 1000.0)
+            if ready > now:
+                wake = ready if wake is None else min(wake, ready)
+                continue
+            if len(batch) >= slots:
+                break  # 名额已满，保持方案顺序等待
+            batch.append(button_id)
+        for button_id in batch:
+            self.state[button_id] = self.STARTING
+            self.changed.add(button_id)
+        return batch, wake
+
+    def summary(self) -> Tuple[int, int]:
+        """(成功数, 失败或跳过数)"""
+        ok = sum(1 for status in self.state.values() if status == self.OK)
+        return ok, sum(1 for status in self.state.values() if status in (self.FAILED, self.SKIPPED))
+
+
+def button_matches(record: ButtonRecord, query: str) -> bool:
+    """按钮名称、路径或名称拼音首字母是否包含关键词"""
+    import pinyin  # 延迟导入，首次搜索时才加载
+    query = query.lower()
+    return (query in record.name.lower() or
+            query in record.path.lower() or
+            query in pinyin.get_initial(record.name).lower())
+
+
+class SearchIndex:
+    """常驻内存的按钮搜索索引（按按钮ID增量更新，拼音首字母只计算一次）"""
+    # 匹配等级：数值越小越靠前
+    RANK_NAME_PREFIX = 0
+    RANK_NAME = 1
+    RANK_INITIALS = 2
+    RANK_PATH = 3
+
+    def __init__(self):
+        self._entries = {}  # button_id -> [record, 名称小写, 路径小写, 拼音首字母或None]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _entry(record: ButtonRecord, old: Optional[list]) -> list:
+        """创建索引项，名称未变时沿用已计算的拼音首字母"""
+        initials = old[3] if old is not None and old[0].name == record.name else None
+        return [record, record.name.lower(), record.path.lower(), initials]
+
+    def rebuild(self, records):
+        """按完整按钮列表重建索引"""
+        old = self._entries
+        self._entries = {record.id: self._entry(record, old.get(record.id)) for record in records}
+
+    def update(self, record: ButtonRecord):
+        """新增或更新单个按钮"""
+        self._entries[record.id] = self._entry(record, self._entries.get(record.id))
+
+    def remove(self, button_id: int):
+        """移除已删除的按钮"""
+        self._entries.pop(button_id, None)
+
+    def warm(self):
+        """预先计算所有拼音首字母（空闲时调用，首次搜索不再等待）"""
+        for entry in self._entries.values():
+            self._initials(entry)
+
+    @staticmethod
+    def _initials(entry: list) -> str:
+        if entry[3] is None:
+            import pinyin  # 延迟导入，首次搜索或预热时才加载
+            entry[3] = pinyin.get_initial(entry[0].name, delimiter="").lower()
+        return entry[3]
+
+    def _rank(self, entry: list, query: str) -> Optional[int]:
+        if entry[1].startswith(query):
+            return self.RANK_NAME_PREFIX
+        if query in entry[1]:
+            return self.RANK_NAME
+        if query in self._initials(entry):
+            return self.RANK_INITIALS
+        if query in entry[2]:
+            return self.RANK_PATH
+        return None
+
+    def search(self, query: str, score=None, limit: int = 20) -> List[ButtonRecord]:
+        """按匹配等级、频率评分（score: button_id -> float）和名称排序返回结果"""
+        query = query.strip().lower()
+        score = score or (lambda button_id: 0.0)
+        if not query:
+            ranked = sorted(self._entries.values(), key=lambda e: (-score(e[0].id), e[1]))
+            return [e[0] for e in ranked[:limit]]
+        matches = []
+        for entry in self._entries.values():
+            rank = self._rank(entry, query)
+            if rank is not None:
+                matches.append((rank, -score(entry[0].id), entry[1], entry[0]))
+        matches.sort(key=lambda m: m[:3])
+        return [m[3] for m in matches[:limit]]
+
+
+HEADLESS_COMMANDS = ("--list", "--search", "--launch", "--latency-report")
+
+
+def is_headless_command(argv: List[str]) -> bool:
+    """命令行是否为无界面命令（不需要导入 PyQt5）"""
+    return any(arg.split("=", 1)[0] in HEADLESS_COMMANDS for arg in argv)
+
+
+def instance_server_name(db_path: str = "launcher.db") -> str:
+    """按数据库位置生成单实例服务名（不同数据目录的实例互不干扰）"""
+    digest = hashlib.sha1(os.path.abspath(db_path).encode("utf-8")).hexdigest()[:12]
+    return f"ProgramLauncher-{digest}"
+
+
+def instance_lock_holder(db_path: str = "launcher.db") -> Optional[int]:
+    """读取实例锁的持有进程ID（QLockFile 文件首行），没有锁或持有进程已退出时返回 None"""
+    try:
+        with open(os.path.abspath(db_path) + ".lock", "r", encoding="utf-8", errors="replace") as f:
+            pid = int(f.readline().strip())
+    except (OSError, ValueError):
+        return None
+    return pid if pid != os.getpid() and ProcessRegistry.alive(pid) else None
+
+
+def send_instance_message(name: str, message: dict, timeout: float = 1.0) -> bool:
+    """不导入 Qt 把请求发送给已运行的实例，成功返回 True
+    
+    地址与 QLocalServer 的命名规则一致: Windows 为命名管道，其他平台为临时目录下的套接字文件。
+    """
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+    try:
+        if sys.platform == "win32":
+            with open("\\\\.\\pipe\\" + name, "wb", buffering=0) as pipe:
+                pipe.write(data)
+            return True
+        import socket
+        tmp_dir = os.environ.get("TMPDIR") or "/tmp"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(os.path.join(tmp_dir, name))
+            sock.sendall(data)
+        return True
+    except OSError:
+        return False
+
+
+def forward_to_instance(message: dict, attempts: int = 20) -> Optional[bool]:
+    """有实例持有实例锁时把请求转交给它（它可能仍在启动，稍等后重试）
+    
+    没有运行中的实例返回 None，转交成功返回 True，无法连接返回 False。
+    """
+    if instance_lock_holder() is None:
+        return None
+    name = instance_server_name()
+    for attempt in range(attempts):
+        if send_instance_message(name, message):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def load_catalog(db: DatabaseManager) -> Tuple[list, List[ButtonRecord]]:
+    """读取分组和按钮：启动快照与数据库版本一致时直接使用快照（只保留所属分组存在的按钮）"""
+    snapshot = CatalogSnapshot.read()
+    if snapshot is not None and snapshot.catalog_version == db.get_catalog_version():
+        groups, records = snapshot.groups, snapshot.records
+    else:
+        groups, records = db.get_groups(), db.get_button_records()
+    group_ids = {g[0] for g in groups}
+    return groups, [r for r in records if r.group_id in group_ids]
+
+
+def run_cli(argv: List[str]) -> int:
+    """命令行模式（不创建界面）: --list / --search <关键词> / --launch <名称或ID> / --latency-report，返回退出码"""
+    parser = argparse.ArgumentParser(prog="Program_Launcher", description=ProjectInfo.DESCRIPTION)
+    commands = parser.add_mutually_exclusive_group(required=True)
+    commands.add_argument("--list", action="store_true", help="列出所有按钮")
+    commands.add_argument("--search", metavar="KEYWORD", help="按名称、路径或拼音首字母搜索按钮")
+    commands.add_argument("--launch", metavar="NAME_OR_ID", help="启动指定的按钮")
+    commands.add_argument("--latency-report", action="store_true", help="以 CSV 格式输出启动耗时报告")
+    args = parser.parse_args(argv)
+    
+    db = DatabaseManager()
+    groups, records = load_catalog(db)
+    group_names = {g[0]: g[1] for g in groups}
+    
+    if args.latency_report:
+        latency = LatencyStats()
+        latency.load()
+        return 0 if latency.write_csv(sys.stdout, records, group_names) else 1
+    
+    if args.launch:
+        record = find_button(records, args.launch)
+        if record is None:
+            print(f"未找到按钮: {args.launch}", file=sys.stderr)
+            return 1
+        # 界面实例在运行时由它启动：遵循运行中策略、跟踪进程，并由它独占写入启动历史
+        forwarded = forward_to_instance({"action": "launch", "target": str(record.id)})
+        if forwarded is not None:
+            if not forwarded:
+                print("已有实例在运行，但无法连接", file=sys.stderr)
+            return 0 if forwarded else 1
+        history = LaunchHistory()
+        history.load()
+        trace = LaunchTrace()
+        try:
+            path, working_dir = prepare_launch(record.path, record.working_dir, trace=trace)
+            start_program(path, record.arguments, working_dir, record.run_as_admin,
+                          ResourceLimits.from_record(record))
+            trace.mark("spawn")
+            trace.mark_total()
+        except LaunchError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        except Exception as e:
+            print(f"无法启动程序: {e}", file=sys.stderr)
+            return 1
+        history.record(record.id)
+        history.flush()
+        latency = LatencyStats()
+        latency.record(record.id, trace.phases)
+        latency.flush()
+        return 0
+    
+    if args.search:
+        # 与快速启动面板相同的匹配和排序（拼音首字母不带分隔符，如 "wx" 匹配 "微信"）
+        history = LaunchHistory()
+        history.load()
+        index = SearchIndex()
+        index.rebuild(records)
+        now = time.time()
+        records = index.search(args.search, lambda button_id: history.score(button_id, now), len(records))
+    for record in records:
+        print(f"{record.id}\t{group_names.get(record.group_id, '未知分组')}\t{record.name}\t{record.path}")
+    return 0 if records else 1
+
+
+# 命令行模式在导入 PyQt5 之前处理，脚本和快捷键工具调用时无需加载界面
+if __name__ == "__main__" and is_headless_command(sys.argv[1:]):
+    sys.exit(run_cli(sys.argv[1:]))
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                             QPushButton, QLabel, QLineEdit, QTabWidget, QMessageBox,
+                             QFileDialog, QGroupBox, QScrollArea, QSizePolicy, QSpacerItem,
+                             QMenu, QTableWidget, QTableWidgetItem, QDialog, QLayout,
+                             QCheckBox, QAction, QComboBox, QInputDialog, QToolButton,
+                             QTableView, QHeaderView, QAbstractItemView, QListView,
+                             QStyledItemDelegate, QStyle, QAbstractScrollArea,
+                             QListWidget, QListWidgetItem, QSpinBox, QDoubleSpinBox)
+from PyQt5.QtCore import (Qt, QSize, QSettings, QTimer, QRect, QPoint, pyqtSignal,
+                          QAbstractTableModel, QAbstractListModel, QModelIndex,
+                          QObject, QLockFile, QEvent, QFileSystemWatcher)
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+from PyQt5.QtGui import (QIcon, QColor, QTextCursor, QTextCharFormat, QFont, QPixmap, QKeySequence,
+                         QPainter, QPen, QFontMetrics)
+
+
+# 马卡龙色系定义
+class MacaronColors:
+    # 粉色系
+    SAKURA_PINK = QColor(255, 183, 206)  # 樱花粉
+    ROSE_PINK = QColor(255, 154, 162)    # 玫瑰粉
+    
+    # 蓝色系
+    SKY_BLUE = QColor(162, 225, 246)    # 天空蓝
+    LILAC_MIST = QColor(230, 230, 250)   # 淡丁香
+    
+    # 绿色系
+    MINT_GREEN = QColor(181, 234, 215)   # 薄荷绿
+    APPLE_GREEN = QColor(212, 241, 199)  # 苹果绿
+    
+    # 黄色/橙色系
+    LEMON_YELLOW = QColor(255, 234, 165) # 柠檬黄
+    BUTTER_CREAM = QColor(255, 248, 184) # 奶油黄
+    PEACH_ORANGE = QColor(255, 218, 193) # 蜜桃橙
+    
+    # 紫色系
+    LAVENDER = QColor(199, 206, 234)     # 薰衣草紫
+    TARO_PURPLE = QColor(216, 191, 216)  # 香芋紫
+    
+    # 中性色
+    CARAMEL_CREAM = QColor(240, 230, 221) # 焦糖奶霜
+
+class LauncherStyle:
+    """应用程序级样式表
+    
+    程序按钮的状态（收藏、管理员、批量选中、路径失效、运行中）通过动态属性表达，
+    由一份全局样式表统一匹配，状态变化时只需修改属性并重新 polish 单个控件。
+    """
+    FAVORITE_TEXT = QColor("#FF6600")  # 收藏按钮文字
+    ADMIN_BORDER = QColor("red")  # 管理员权限运行按钮边框
+    SELECTED = MacaronColors.SKY_BLUE  # 批量选中背景
+    BROKEN = MacaronColors.ROSE_PINK  # 路径失效背景
+    RUNNING = QColor(76, 175, 80)  # 运行中标记
+    HOVER = MacaronColors.LILAC_MIST  # 网格视图悬停背景
+    BATCH_ACTIVE = MacaronColors.SAKURA_PINK  # 批量操作按钮激活背景
+
+    @classmethod
+    def stylesheet(cls) -> str:
+        """生成全局样式表"""
+        return f"""
+            QToolButton[launcherButton="true"][favorite="true"] {{
+                font-weight: bold;
+                color: {cls.FAVORITE_TEXT.name()};
+            }}
+            QToolButton[launcherButton="true"][admin="true"] {{
+                border: 1px solid {cls.ADMIN_BORDER.name()};
+            }}
+            QToolButton[launcherButton="true"][broken="true"] {{
+                background-color: {cls.BROKEN.name()};
+            }}
+            QToolButton[launcherButton="true"][running="true"] {{
+                border-bottom: 3px solid {cls.RUNNING.name()};
+            }}
+            QToolButton[launcherButton="true"][selected="true"] {{
+                background-color: {cls.SELECTED.name()};
+            }}
+            QPushButton[batchActive="true"] {{
+                background-color: {cls.BATCH_ACTIVE.name()};
+            }}
+        """
+
+    @staticmethod
+    def set_state(widget: QWidget, name: str, value: bool) -> bool:
+        """设置控件的状态属性，只有值变化且控件已 polish 时才重新 polish"""
+        if bool(widget.property(name)) == bool(value):
+            return False
+        widget.setProperty(name, bool(value))
+        if widget.testAttribute(Qt.WA_WState_Polished):
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
+            widget.update()
+        return True
+
+class FlowLayout(QLayout):
+    """自定义流式布局，实现从左到右、自动换行的布局效果
+    
+    缓存子项的尺寸提示，并按宽度记忆计算好的换行结果；只有子项变化
+    (addItem/takeAt/invalidate) 时才清空缓存。所有子项尺寸相同(例如
+    固定 120x60 的程序按钮)时使用网格公式直接计算位置。
+    """
+    LAYOUT_CACHE_SIZE = 8  # 记忆的不同宽度数量
+
+    def __init__(self, parent=None, margin=10, spacing=10):
+        super().__init__(parent)
+        self._items = []
+        self._margin = margin
+        self._spacing = spacing
+        self._hints = None  # 缓存的子项 sizeHint 列表
+        self._min_size = None  # 缓存的最小尺寸
+        self._uniform = None  # 所有子项尺寸相同时为该尺寸
+        self._layouts = {}  # 宽度 -> (高度, 各子项相对位置)
+        self._applied = None  # 上次实际应用的 (原点, 位置列表)
+
+    def addItem(self, item):
+        self._items.append(item)
+        self._clear_cache()
+
+    def count(self):
+        return len(self._items)
+
+    def itemAt(self, index):
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+
+    def takeAt(self, index):
+        if 0 <= index < len(self._items):
+            self._clear_cache()
+            return self._items.pop(index)
+        return None
+
+    def invalidate(self):
+        self._clear_cache()
+        super().invalidate()
+
+    def _clear_cache(self):
+        self._hints = None
+        self._min_size = None
+        self._uniform = None
+        self._layouts.clear()
+        self._applied = None
+
+    def _item_hints(self):
+        """获取（并缓存）子项尺寸提示"""
+        if self._hints is None:
+            self._hints = [item.sizeHint() for item in self._items]
+            first = self._hints[0] if self._hints else None
+            if first is not None and all(hint == first for hint in self._hints):
+                self._uniform = first
+            else:
+                self._uniform = None
+        return self._hints
+
+    def expandingDirections(self):
+        return Qt.Orientations(Qt.Orientation(0))
+
+    def hasHeightForWidth(self):
+        return True
+
+    def heightForWidth(self, width):
+        return self._compute_layout(width)[0]
+
+    def setGeometry(self, rect):
+        super().setGeometry(rect)
+        _, positions = self._compute_layout(rect.width())
+        origin = (rect.x(), rect.y())
+        if self._applied == (origin, positions):
+            return  # 位置没有变化（例如宽度变化不足以改变列数），无需重新摆放
+        hints = self._item_hints()
+        for item, hint, (x, y) in zip(self._items, hints, positions):
+            item.setGeometry(QRect(QPoint(origin[0] + x, origin[1] + y), hint))
+        self._applied = (origin, positions)
+
+    def sizeHint(self):
+        return self.minimumSize()
+
+    def minimumSize(self):
+        if self._min_size is None:
+            size = QSize()
+            for item in self._items:
+                size = size.expandedTo(item.minimumSize())
+            margin = self._margin
+            self._min_size = QSize(size.width() + 2 * margin, size.height() + 2 * margin)
+        return self._min_size
+
+    def _compute_layout(self, width):
+        """计算（并按宽度记忆）换行结果，返回 (高度, 相对左上角的位置列表)"""
+        cached = self._layouts.get(width)
+        if cached is not None:
+            return cached
+        hints = self._item_hints()
+        if self._uniform is not None:
+            result = self._uniform_layout(width, self._uniform, len(hints))
+        else:
+            result = self._doLayout(width, hints)
+        if len(self._layouts) >= self.LAYOUT_CACHE_SIZE:
+            self._layouts.pop(next(iter(self._layouts)))
+        self._layouts[width] = result
+        return result
+
+    def _uniform_layout(self, width, size, count):
+        """所有子项尺寸相同时按网格公式计算位置"""
+        margin = self._margin
+        spacing = self._spacing
+        cell_w, cell_h = size.width() + spacing, size.height() + spacing
+        # 与 _doLayout 的换行规则一致: 每行至少一个，右边缘不超过 width - 1
+        available = width - 1 - margin - size.width()
+        columns = max(1, available // cell_w + 1) if available >= 0 else 1
+        positions = [(margin + (i % columns) * cell_w, margin + (i // columns) * cell_h)
+                     for i in range(count)]
+        rows = (count + columns - 1) // columns
+        height = margin + rows * cell_h - spacing if count else margin
+        return height, positions
+
+    def _doLayout(self, width, hints):
+        margin = self._margin
+        spacing = self._spacing
+        right = width - 1
+        x = margin
+        y = margin
+        line_height = 0
+        positions = []
+        
+        for hint in hints:
+            next_x = x + hint.width() + spacing
+            if next_x - spacing > right and line_height > 0:
+                x = margin
+                y = y + line_height + spacing
+                next_x = x + hint.width() + spacing
+                line_height = 0
+            
+            positions.append((x, y))
+            x = next_x
+            line_height = max(line_height, hint.height())
+        
+        return y + line_height, positions
+
+class DynamicIconGenerator:
+    @staticmethod
+    def generate_icon(text: str = "APP", size: Tuple[int, int] = (64, 64)) -> str:
+        """动态生成ICO图标文件"""
+        from PIL import Image, ImageDraw, ImageFont  # 延迟导入，首次生成图标时才加载
+
+        # 创建图像
+        img = Image.new('RGB', size, (70, 130, 180))  # 蓝色背景
+        draw = ImageDraw.Draw(img)
+        
+        try:
+            # 尝试使用系统字体
+            font = ImageFont.truetype("arial.ttf", 20)
+        except:
+            # 回退到默认字体
+            font = ImageFont.load_default()
+        
+        # 计算文本位置 (兼容新旧Pillow版本)
+        try:
+            # 新版本Pillow使用textbbox
+            bbox = draw.textbbox((0, 0), text, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+        except AttributeError:
+            # 旧版本Pillow使用textsize
+            text_width, text_height = draw.textsize(text, font)
+        
+        position = ((size[0] - text_width) // 2, (size[1] - text_height) // 2)
+        
+        # 绘制文本
+        draw.text(position, text, fill=(255, 255, 255), font=font)
+        
+        # 保存为ICO文件
+        ico_path = "icon.ico"
+        img.save(ico_path, sizes=[size])
+        return ico_path
+
+    @staticmethod
+    def extract_exe_icon(exe_path: str, output_path: str = None) -> Optional[str]:
+        """从exe文件中提取图标（改进版）"""
+        try:
+            import win32gui
+            import win32ui
+
+            print(f"[DEBUG] 开始提取图标: {exe_path}")
+            
+            if not os.path.exists(exe_path):
+                print(f"[DEBUG] 错误: 文件不存在: {exe_path}")
+                return None
+
+            if not output_path:
+                # 使用绝对路径
+                output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "temp_icons"))
+                if not os.path.exists(output_dir):
+                    print(f"[DEBUG] 创建临时图标目录: {output_dir}")
+                    os.makedirs(output_dir)
+                output_path = os.path.abspath(os.path.join(output_dir, f"{os.path.basename(exe_path)}_{hash(exe_path)}.ico"))
+                print(f"[DEBUG] 设置输出路径: {output_path}")
+            
+            # 方法1: 使用win32gui.ExtractIconEx
+            try:
+                print("[DEBUG] 尝试方法1: win32gui.ExtractIconEx")
+                large, small = win32gui.ExtractIconEx(exe_path, 0)
+                print(f"[DEBUG] 方法1结果 - 大图标数: {len(large) if large else 0}, 小图标数: {len(small) if small else 0}")
+                
+                if large:
+                    print("[DEBUG] 方法1找到大图标，正在保存...")
+                    icon = large[0]
+                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+                    hbmp = win32ui.CreateBitmap()
+                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
+                    hdc = hdc.CreateCompatibleDC()
+                    hdc.SelectObject(hbmp)
+                    hdc.DrawIcon((0, 0), icon)
+                    hbmp.SaveBitmapFile(hdc, output_path)
+                    win32gui.DestroyIcon(icon)
+                    print(f"[DEBUG] 方法1成功保存图标到: {output_path}")
+                    return output_path
+            except Exception as e:
+                print(f"[DEBUG] 方法1提取图标失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            # 方法2: 使用Pillow提取
+            try:
+                print("[DEBUG] 尝试方法2: Pillow+win32gui.ExtractIcon")
+                from PIL import Image
+                ico_x = win32gui.ExtractIcon(exe_path, 0)
+                print(f"[DEBUG] 方法2结果 - 图标句柄: {bool(ico_x)}")
+                
+                if ico_x:
+                    print("[DEBUG] 方法2找到图标，正在保存...")
+                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+                    hbmp = win32ui.CreateBitmap()
+                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
+                    hdc = hdc.CreateCompatibleDC()
+                    hdc.SelectObject(hbmp)
+                    hdc.DrawIcon((0, 0), ico_x)
+                    bmpinfo = hbmp.GetInfo()
+                    bmpstr = hbmp.GetBitmapBits(True)
+                    img = Image.frombuffer(
+                        'RGB',
+                        (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
+                        bmpstr, 'raw', 'BGRX', 0, 1
+                    )
+                    img.save(output_path)
+                    win32gui.DestroyIcon(ico_x)
+                    print(f"[DEBUG] 方法2成功保存图标到: {output_path}")
+                    return output_path
+            except Exception as e:
+                print(f"[DEBUG] 方法2提取图标失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            # 方法3: 使用Shell API
+            try:
+                print("[DEBUG] 尝试方法3: Shell API (ctypes)")
+                import ctypes
+                from ctypes import wintypes
+                SHGFI_ICON = 0x000000100
+                SHGFI_LARGEICON = 0x000000000
+                SHGFI_SMALLICON = 0x000000001
+                
+                class SHFILEINFO(ctypes.Structure):
+                    _fields_ = [
+                        ('hIcon', ctypes.c_void_p),
+                        ('iIcon', ctypes.c_int),
+                        ('dwAttributes', ctypes.c_uint),
+                        ('szDisplayName', ctypes.c_wchar * 260),
+                        ('szTypeName', ctypes.c_wchar * 80)
+                    ]
+                
+                shell32 = ctypes.windll.shell32
+                info = SHFILEINFO()
+                print(f"[DEBUG] 调用SHGetFileInfoW...")
+                res = shell32.SHGetFileInfoW(
+                    exe_path, 0, ctypes.byref(info), 
+                    ctypes.sizeof(info), 
+                    SHGFI_ICON | SHGFI_LARGEICON
+                )
+                print(f"[DEBUG] SHGetFileInfoW返回: {res}, 图标句柄: {info.hIcon}")
+                
+                if info.hIcon:
+                    print("[DEBUG] 方法3找到图标，正在保存...")
+                    import win32ui
+                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+                    hbmp = win32ui.CreateBitmap()
+                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
+                    hdc = hdc.CreateCompatibleDC()
+                    hdc.SelectObject(hbmp)
+                    hdc.DrawIcon((0, 0), info.hIcon)
+                    hbmp.SaveBitmapFile(hdc, output_path)
+                    win32gui.DestroyIcon(info.hIcon)
+                    print(f"[DEBUG] 方法3成功保存图标到: {output_path}")
+                    return output_path
+            except Exception as e:
+                print(f"[DEBUG] 方法3提取图标失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            # 方法4: 使用系统默认图标
+            try:
+                print("[DEBUG] 尝试方法4: win32com.shell")
+                from win32com.shell import shell, shellcon
+                from win32com.shell.shell import SHGetFileInfo
+                flags = shellcon.SHGFI_ICON | shellcon.SHGFI_LARGEICON
+                print(f"[DEBUG] 调用SHGetFileInfo...")
+                info = SHGetFileInfo(exe_path, 0, flags)
+                print(f"[DEBUG] SHGetFileInfo返回: {info}")
+                
+                if info[0]:
+                    print("[DEBUG] 方法4找到图标，正在保存...")
+                    icon = info[0]
+                    hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+                    hbmp = win32ui.CreateBitmap()
+                    hbmp.CreateCompatibleBitmap(hdc, 32, 32)
+                    hdc = hdc.CreateCompatibleDC()
+                    hdc.SelectObject(hbmp)
+                    hdc.DrawIcon((0, 0), icon)
+                    hbmp.SaveBitmapFile(hdc, output_path)
+                    win32gui.DestroyIcon(icon)
+                    print(f"[DEBUG] 方法4成功保存图标到: {output_path}")
+                    return output_path
+            except Exception as e:
+                print(f"[DEBUG] 方法4提取图标失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            print(f"[DEBUG] 所有方法都无法提取 {exe_path} 的图标")
+            return None
+        
+        except Exception as e:
+            print(f"[DEBUG] 提取图标过程中发生异常: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+
+
+    @staticmethod
+    def find_icon_in_directory(directory: str) -> Optional[str]:
+        """在指定目录下查找图标文件"""
+        if not os.path.isdir(directory):
+            return None
+        
+        # 查找常见的图标文件
+        icon_patterns = ["icon.*", "*.ico"]
+        for pattern in icon_patterns:
+            files = glob.glob(os.path.join(directory, pattern))
+            if files:
+                # 优先返回.ico文件
+                ico_files = [f for f in files if f.lower().endswith('.ico')]
+                if ico_files:
+                    return ico_files[0]
+                return files[0]  # 返回找到的第一个匹配文件
+        
+        return None
+
+class HighlightTextEdit(QLineEdit):
+    """支持高亮显示搜索关键字的文本框"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.highlight_format = QTextCharFormat()
+        self.highlight_format.setBackground(QColor(255, 255, 0))  # 黄色背景高亮
+    
+    def highlight_text(self, text: str):
+        """高亮显示匹配的文本"""
+        if not text:
+            return
+        
+        # 获取当前文本
+        current_text = self.text()
+        if not current_text:
+            return
+        
+        # 创建高亮格式
+        palette = self.palette()
+        palette.setColor(QPalette.Highlight, QColor(255, 255, 0))
+        palette.setColor(QPalette.HighlightedText, Qt.black)
+        self.setPalette(palette)
+        
+        # 查找所有匹配位置
+        start_pos = 0
+        while True:
+            pos = current_text.lower().find(text.lower(), start_pos)
+            if pos == -1:
+                break
+            self.setSelection(pos, len(text))
+            start_pos = pos + len(text)
+
+class ButtonEditor(QDialog):
+    IF_RUNNING_LABELS = {  # 已在运行时的处理方式 -> 显示文本
+        ProcessRegistry.LAUNCH: "再启动一个实例",
+        ProcessRegistry.FOCUS: "切换到已有窗口",
+        ProcessRegistry.REFUSE: "不重复启动",
+    }
+
+    def __init__(self, button_id: Optional[int] = None, group_id: Optional[int] = None, 
+                 name: str = "", path: str = "", arguments: str = "", 
+                 working_dir: str = "", run_as_admin: bool = False, 
+                 icon_path: str = "", is_favorite: bool = False, parent=None,
+                 launch_options: Optional[Dict[str, object]] = None):
+        super().__init__(parent)
+        launch_options = launch_options or {}
+        self.button_id = button_id
+        self.group_id = group_id
+        self.parent = parent
+        self.icon_path = icon_path
+        
+        self.setWindowTitle("编辑按钮" if button_id else "添加按钮")
+        self.setWindowModality(Qt.ApplicationModal)
+        self.resize(500, 380)
+        
+        layout = QVBoxLayout()
+        
+        # 按钮名称
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("按钮名称:"))
+        self.name_edit = QLineEdit(name)
+        name_layout.addWidget(self.name_edit)
+        
+        # 收藏复选框
+        self.favorite_check = QCheckBox("收藏")
+        self.favorite_check.setChecked(is_favorite)
+        name_layout.addWidget(self.favorite_check)
+        
+        layout.addLayout(name_layout)
+        
+        # 程序路径
+        path_layout = QHBoxLayout()
+        path_layout.addWidget(QLabel("程序路径:"))
+        self.path_edit = QLineEdit(path)
+        path_layout.addWidget(self.path_edit)
+        
+        self.browse_btn = QPushButton("浏览...")
+        self.browse_btn.clicked.connect(self.browse_path)
+        path_layout.addWidget(self.browse_btn)
+        layout.addLayout(path_layout)
+        
+        # 启动参数
+        args_layout = QHBoxLayout()
+        args_layout.addWidget(QLabel("启动参数:"))
+        self.args_edit = QLineEdit(arguments)
+        args_layout.addWidget(self.args_edit)
+        layout.addLayout(args_layout)
+        
+        # 工作目录
+        dir_layout = QHBoxLayout()
+        dir_layout.addWidget(QLabel("工作目录:"))
+        self.dir_edit = QLineEdit(working_dir)
+        dir_layout.addWidget(self.dir_edit)
+        
+        self.browse_dir_btn = QPushButton("浏览...")
+        self.browse_dir_btn.clicked.connect(self.browse_working_dir)
+        dir_layout.addWidget(self.browse_dir_btn)
+        layout.addLayout(dir_layout)
+        
+        # 管理员权限和图标设置
+        options_layout = QHBoxLayout()
+        
+        # 管理员权限
+        self.admin_check = QCheckBox("以管理员权限运行")
+        self.admin_check.setChecked(run_as_admin)
+        options_layout.addWidget(self.admin_check)
+        
+        # 图标设置
+        icon_btn_layout = QHBoxLayout()
+        icon_btn_layout.addWidget(QLabel("图标:"))
+        
+        self.icon_btn = QPushButton()
+        self.update_icon_btn()
+        self.icon_btn.clicked.connect(self.change_icon)
+        icon_btn_layout.addWidget(self.icon_btn)
+        
+        self.clear_icon_btn = QPushButton("清除")
+        self.clear_icon_btn.clicked.connect(self.clear_icon)
+        icon_btn_layout.addWidget(self.clear_icon_btn)
+        
+        options_layout.addLayout(icon_btn_layout)
+        layout.addLayout(options_layout)
+        
+        # 已在运行时的处理方式
+        running_layout = QHBoxLayout()
+        running_layout.addWidget(QLabel("已在运行时:"))
+        self.if_running_combo = QComboBox()
+        for policy, label in self.IF_RUNNING_LABELS.items():
+            self.if_running_combo.addItem(label, policy)
+        self.if_running_combo.setCurrentIndex(max(0, self.if_running_combo.findData(
+            launch_options.get('if_running', ProcessRegistry.LAUNCH))))
+        running_layout.addWidget(self.if_running_combo)
+        running_layout.addStretch()
+        layout.addLayout(running_layout)
+        
+        # 随启动器自动启动
+        autostart_layout = QHBoxLayout()
+        self.autostart_check = QCheckBox("随启动器自动启动")
+        self.autostart_check.setChecked(bool(launch_options.get('autostart', False)))
+        autostart_layout.addWidget(self.autostart_check)
+        autostart_layout.addWidget(QLabel("优先级:"))
+        self.autostart_priority_spin = QSpinBox()
+        self.autostart_priority_spin.setRange(0, 9)
+        self.autostart_priority_spin.setValue(int(launch_options.get('autostart_priority', 5)))
+        self.autostart_priority_spin.setToolTip("数值越大越先启动；程序之间会错开，并等待系统空闲")
+        self.autostart_priority_spin.setEnabled(self.autostart_check.isChecked())
+        self.autostart_check.toggled.connect(self.autostart_priority_spin.setEnabled)
+        autostart_layout.addWidget(self.autostart_priority_spin)
+        autostart_layout.addStretch()
+        layout.addLayout(autostart_layout)
+        
+        # 进程资源设置
+        resource_group = QGroupBox("进程资源")
+        resource_layout = QVBoxLayout()
+        priority_layout = QHBoxLayout()
+        priority_layout.addWidget(QLabel("优先级:"))
+        self.process_priority_combo = QComboBox()
+        for priority, (label, _, _) in ResourceLimits.PRIORITIES.items():
+            self.process_priority_combo.addItem(label, priority)
+        self.process_priority_combo.setCurrentIndex(max(0, self.process_priority_combo.findData(
+            launch_options.get('process_priority', 'normal'))))
+        priority_layout.addWidget(self.process_priority_combo)
+        priority_layout.addWidget(QLabel("CPU:"))
+        self.cpu_affinity_edit = QLineEdit(launch_options.get('cpu_affinity', ''))
+        self.cpu_affinity_edit.setPlaceholderText(f"例如 0-3,6（共 {os.cpu_count() or 1} 个，留空不限制）")
+        priority_layout.addWidget(self.cpu_affinity_edit)
+        resource_layout.addLayout(priority_layout)
+        
+        limit_layout = QHBoxLayout()
+        limit_layout.addWidget(QLabel("内存上限:"))
+        self.memory_limit_spin = QSpinBox()
+        self.memory_limit_spin.setRange(0, 1024 * 1024)
+        self.memory_limit_spin.setSuffix(" MB")
+        self.memory_limit_spin.setSpecialValueText("不限制")
+        self.memory_limit_spin.setValue(int(launch_options.get('memory_limit_mb', 0)))
+        limit_layout.addWidget(self.memory_limit_spin)
+        limit_layout.addWidget(QLabel("CPU 时间上限:"))
+        self.cpu_time_spin = QSpinBox()
+        self.cpu_time_spin.setRange(0, 7 * 24 * 3600)
+        self.cpu_time_spin.setSuffix(" 秒")
+        self.cpu_time_spin.setSpecialValueText("不限制")
+        self.cpu_time_spin.setValue(int(launch_options.get('cpu_time_limit', 0)))
+        limit_layout.addWidget(self.cpu_time_spin)
+        resource_layout.addLayout(limit_layout)
+        resource_group.setLayout(resource_layout)
+        layout.addWidget(resource_group)
+        
+        # 按钮区域
+        btn_layout = QHBoxLayout()
+        self.save_btn = QPushButton("保存")
+        self.save_btn.clicked.connect(self.save_button)
+        btn_layout.addWidget(self.save_btn)
+        
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.close)
+        btn_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+    
+    def update_icon_btn(self):
+        """更新图标按钮的显示"""
+        if self.icon_path and os.path.exists(self.icon_path):
+            self.icon_btn.setIcon(QIcon(self.icon_path))
+            self.icon_btn.setText("更改图标")
+        else:
+            self.icon_btn.setIcon(QIcon())
+            self.icon_btn.setText("设置图标")
+    
+    def browse_path(self):
+        """浏览文件系统选择程序或目录"""
+        # 先检查剪贴板是否有文件或目录
+        clipboard = QApplication.clipboard()
+        if clipboard.mimeData().hasUrls():
+            urls = clipboard.mimeData().urls()
+            if urls and urls[0].isLocalFile():
+                path = urls[0].toLocalFile()
+                if os.path.exists(path):  # 检查路径是否存在
+                    reply = QMessageBox.question(
+                        self, "使用剪贴板路径", 
+                        f"检测到剪贴板中有路径:\n{path}\n\n是否使用此路径?",
+                        QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+                    if reply == QMessageBox.Yes:
+                        self.path_edit.setText(path)
+                        # 如果没有选择图标，尝试获取图标
+                        if not self.icon_path:
+                            self.set_icon_from_path(path)
+                        return
+        
+        # 显示文件/目录选择对话框
+        dialog = QFileDialog(self)
+        dialog.setFileMode(QFileDialog.ExistingFile)
+        dialog.setOption(QFileDialog.DontUseNativeDialog, True)
+        
+        # 添加"选择文件夹"按钮
+        dir_btn = QPushButton("选择文件夹")
+        dir_btn.clicked.connect(lambda: dialog.setFileMode(QFileDialog.Directory))
+        dialog.layout().addWidget(dir_btn)
+        
+        # 添加"选择文件"按钮
+        file_btn = QPushButton("选择文件")
+        file_btn.clicked.connect(lambda: dialog.setFileMode(QFileDialog.ExistingFile))
+        dialog.layout().addWidget(file_btn)
+        
+        if dialog.exec_():
+            paths = dialog.selectedFiles()
+            if paths:
+                path = paths[0]
+                self.path_edit.setText(path)
+                # 如果没有选择图标，尝试获取图标
+                if not self.icon_path:
+                    self.set_icon_from_path(path)
+
+
+    def set_icon_from_path(self, path):
+        """根据路径自动设置图标"""
+        if os.path.isdir(path):  # 如果是目录
+            # 使用系统文件夹图标
+            from win32com.shell import shell, shellcon
+            try:
+                _, icon = shell.SHGetFileInfo(path, 0, shellcon.SHGFI_ICON | shellcon.SHGFI_LARGEICON)
+                icon_path = os.path.join(os.path.dirname(self.db_path), "folder_icon.ico")
+                icon.Save(icon_path)
+                self.icon_path = icon_path
+                self.update_icon_btn()
+                return
+            except:
+                pass
+        elif path.lower().endswith('.exe'):  # 如果是EXE文件
+            icon_path = DynamicIconGenerator.extract_exe_icon(path)
+            if icon_path:
+                self.icon_path = icon_path
+                self.update_icon_btn()
+                return
+        
+        # 在程序所在目录查找图标文件
+        program_dir = os.path.dirname(path) if os.path.isfile(path) else path
+        icon_path = DynamicIconGenerator.find_icon_in_directory(program_dir)
+        if icon_path:
+            self.icon_path = icon_path
+            self.update_icon_btn()
+
+
+
+    
+    def browse_working_dir(self):
+        """浏览工作目录"""
+        dir_path = QFileDialog.getExistingDirectory(self, "选择工作目录")
+        if dir_path:
+            self.dir_edit.setText(dir_path)
+    
+    def change_icon(self):
+        """更改图标"""
+        icon_path, _ = QFileDialog.getOpenFileName(
+            self, "选择图标文件", "", "图标文件 (*.ico *.png *.jpg);;所有文件 (*.*)")
+        if icon_path:
+            self.icon_path = icon_path
+            self.update_icon_btn()
+    
+    def clear_icon(self):
+        """清除图标"""
+        self.icon_path = ""
+        self.update_icon_btn()
+    
+    def save_button(self):
+        """保存按钮信息"""
+        name = self.name_edit.text().strip()
+        path = self.path_edit.text().strip()
+        args = self.args_edit.text().strip()
+        working_dir = self.dir_edit.text().strip()
+        run_as_admin = self.admin_check.isChecked()
+        is_favorite = self.favorite_check.isChecked()
+        launch_options = {
+            'if_running': self.if_running_combo.currentData(),
+            'autostart': self.autostart_check.isChecked(),
+            'autostart_priority': self.autostart_priority_spin.value(),
+            'process_priority': self.process_priority_combo.currentData(),
+            'cpu_affinity': self.cpu_affinity_edit.text().strip(),
+            'memory_limit_mb': self.memory_limit_spin.value(),
+            'cpu_time_limit': self.cpu_time_spin.value(),
+        }
+        
+        if not name:
+            QMessageBox.warning(self, "警告", "按钮名称不能为空!")
+            return
+        
+        if not path:
+            QMessageBox.warning(self, "警告", "程序路径不能为空!")
+            return
+        
+        try:
+            cpus = ResourceLimits.parse_affinity(launch_options['cpu_affinity'])
+        except ValueError:
+            QMessageBox.warning(self, "警告", "CPU 设置格式无效，请使用如 0-3,6 的格式!")
+            return
+        if cpus and cpus[-1] >= (os.cpu_count() or 1):
+            QMessageBox.warning(self, "警告", f"本机只有 {os.cpu_count()} 个 CPU（编号从 0 开始）!")
+            return
+        
+        # 预处理路径（保存规范化后的原始形式，环境变量在启动时展开）
+        path = PathResolver.normalize(path)
+        if working_dir:
+            working_dir = PathResolver.normalize(working_dir)
+        resolved_path = PathResolver.expand(path)
+        
+        # 验证路径（网络共享和驱动器路径不在界面线程检查，避免网络超时卡住界面）
+        if PathResolver.share_root(resolved_path) is None and not os.path.exists(resolved_path):
+            QMessageBox.warning(self, "警告", "指定的路径不存在!")
+            return
+        
+        db = DatabaseManager()
+        
+        # 处理图标路径
+        icon_path = self.icon_path
+        if icon_path:  # 如果有图标，确保它被保存到持久化存储
+            icon_path = db.copy_icon_to_storage(icon_path)
+        
+        # 如果没有选择图标且路径是EXE文件，尝试自动提取图标
+        if not icon_path and resolved_path.lower().endswith('.exe'):
+            extracted_icon = DynamicIconGenerator.extract_exe_icon(resolved_path)
+            if extracted_icon:
+                icon_path = db.copy_icon_to_storage(extracted_icon)
+                try:
+                    os.remove(extracted_icon)  # 删除临时文件
+                except:
+                    pass
+
+        if self.button_id is not None:
+            # 更新现有按钮
+            db.update_button(
+                self.button_id, name, path, args, 
+                working_dir, run_as_admin, icon_path
+            )
+            db.toggle_button_favorite(self.button_id, is_favorite)
+            db.update_launch_options(self.button_id, launch_options)
+        else:
+            # 添加新按钮
+            if self.group_id is None:
+                QMessageBox.warning(self, "错误", "未指定分组!")
+                return
+            button_id = db.add_button(
+                self.group_id, name, path, args, 
+                working_dir, run_as_admin, icon_path, is_favorite
+            )
+            db.update_launch_options(button_id, launch_options)
+        
+        self.parent.refresh_catalog()  # 增量刷新主界面
+        self.close()
+
+
+
+
+
+
+
+class GroupEditor(QDialog):
+    def __init__(self, group_id: Optional[int] = None, name: str = "", 
+                 is_favorite: bool = False, parent=None):
+        super().__init__(parent)
+        self.group_id = group_id
+        self.parent = parent
+        
+        self.setWindowTitle("编辑分组" if group_id else "添加分组")
+        self.setWindowModality(Qt.ApplicationModal)
+        self.resize(300, 150)
+        
+        layout = QVBoxLayout()
+        
+        # 分组名称
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("分组名称:"))
+        self.name_edit = QLineEdit(name)
+        name_layout.addWidget(self.name_edit)
+        layout.addLayout(name_layout)
         
         # 收藏复选框
-        self.favorite_check = QCheckBox("收藏")
+        self.favorite_check = QCheckBox("收藏分组")
         self.favorite_check.setChecked(is_favorite)
-        name_layout.addWidget(self.favorite_check)
+        layout.addWidget(self.favorite_check)
         
-        layout.addLayout(name_layout)
+        # 按钮区域
+        btn_layout = QHBoxLayout()
+        self.save_btn = QPushButton("保存")
+        self.save_btn.clicked.connect(self.save_group)
+        btn_layout.addWidget(self.save_btn)
         
-        # 程序路径
-        path_layout = QHBoxLayout()
-        path_layout.addWidget(QLabel("程序路径:"))
-        self.path_edit = QLineEdit(path)
-        path_layout.addWidget(self.path_edit)
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.close)
+        btn_layout.addWidget(self.cancel_btn)
         
-        self.browse_btn = QPushButton("浏览...")
-        self.browse_btn.clicked.connect(self.browse_path)
-        path_layout.addWidget(self.browse_btn)
-        layout.addLayout(path_layout)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+    
+    def save_group(self):
+        """保存分组信息"""
+        name = self.name_edit.text().strip()
+        is_favorite = self.favorite_check.isChecked()
         
-        # 启动参数
-        args_layout = QHBoxLayout()
-        args_layout.addWidget(QLabel("启动参数:"))
-        self.args_edit = QLineEdit(arguments)
-        args_layout.addWidget(self.args_edit)
-        layout.addLayout(args_layout)
+        print(f"分组名称: {name}, 收藏: {is_favorite}")
+        if not name:
+            QMessageBox.warning(self, "警告", "分组名称不能为空!")
+            return
         
-        # 工作目录
-        dir_layout = QHBoxLayout()
-        dir_layout.addWidget(QLabel("工作目录:"))
-        self.dir_edit = QLineEdit(working_dir)
-        dir_layout.addWidget(self.dir_edit)
+        db = DatabaseManager()
+        print(f"分组ID: {self.group_id}")
+        if self.group_id is not None:
+            # 更新现有分组
+            db.update_group_name(self.group_id, name)
+            db.toggle_group_favorite(self.group_id, is_favorite)
+        else:
+            # 添加新分组
+            db.add_group(name, is_favorite)
         
-        self.browse_dir_btn = QPushButton("浏览...")
-        self.browse_dir_btn.clicked.connect(self.browse_working_dir)
-        dir_layout.addWidget(self.browse_dir_btn)
-        layout.addLayout(dir_layout)
+        self.parent.refresh_catalog()  # 增量刷新主界面
+        self.close()
+
+class SearchResultModel(QAbstractTableModel):
+    """搜索结果模型（按需分批加载行，不为每个单元格创建对象）
+    
+    每条结果为 (类型, 名称, 路径/分组, 附加数据)，附加数据为分组ID或 ButtonRecord。
+    """
+    HEADERS = ["类型", "名称", "路径/分组"]
+    BATCH_SIZE = 200  # 每次滚动到底部时追加的行数
+
+    def __init__(self, results: List[tuple], parent=None):
+        super().__init__(parent)
+        self._results = results
+        self._loaded = min(len(results), self.BATCH_SIZE)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._results[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.BATCH_SIZE, len(self._results) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def total_count(self) -> int:
+        """全部结果数量（包括尚未加载的行）"""
+        return len(self._results)
+
+    def result_at(self, row: int) -> Optional[tuple]:
+        """获取指定行的结果"""
+        if 0 <= row < self._loaded:
+            return self._results[row]
+        return None
+
+
+class SearchResultDialog(QDialog):
+    """搜索结果对话框"""
+    SAMPLE_ROWS = 50  # 计算列宽时采样的行数
+    
+    launch_requested = pyqtSignal(object)  # ButtonRecord
+    group_requested = pyqtSignal(int)  # 分组ID
+    
+    def __init__(self, results: List[tuple], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"搜索结果 ({len(results)})")
+        self.setWindowModality(Qt.NonModal)
+        self.resize(600, 400)
         
-        # 管理员权限和图标设置
-        options_layout = QHBoxLayout()
+        layout = QVBoxLayout()
         
-        # 管理员权限
-        self.admin_check = QCheckBox("以管理员权限运行")
-        self.admin_check.setChecked(run_as_admin)
-        options_layout.addWidget(self.admin_check)
+        # 结果表格（模型/视图，只渲染可见行）
+        self.model = SearchResultModel(results, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.doubleClicked.connect(self.activate_row)
+        self.size_columns_from_sample()
+        layout.addWidget(self.table)
         
-        # 图标设置
-        icon_btn_layout = QHBoxLayout()
-        icon_btn_layout.addWidget(QLabel("图标:"))
+        # 按钮区域
+        btn_layout = QHBoxLayout()
+        launch_btn = QPushButton("启动")
+        launch_btn.clicked.connect(lambda: self.activate_row(self.table.currentIndex()))
+        btn_layout.addWidget(launch_btn)
         
-        self.icon_btn = QPushButton()
-        self.update_icon_btn()
-        self.icon_btn.clicked.connect(self.change_icon)
-        icon_btn_layout.addWidget(self.icon_btn)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+    
+    def size_columns_from_sample(self):
+        """根据前若干行估算列宽，避免 resizeColumnsToContents 遍历全部结果"""
+        metrics = self.table.fontMetrics()
+        sample = min(self.SAMPLE_ROWS, self.model.rowCount())
+        for column in range(self.model.columnCount() - 1):  # 最后一列自动拉伸
+            width = metrics.horizontalAdvance(SearchResultModel.HEADERS[column])
+            for row in range(sample):
+                text = self.model.data(self.model.index(row, column)) or ""
+                width = max(width, metrics.horizontalAdvance(text))
+            self.table.setColumnWidth(column, min(width + 24, 300))
+    
+    def keyPressEvent(self, event):
+        """回车键启动选中的结果"""
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter) and self.table.currentIndex().isValid():
+            self.activate_row(self.table.currentIndex())
+            return
+        super().keyPressEvent(event)
+    
+    def activate_row(self, index):
+        """启动按钮结果，或跳转到分组结果"""
+        if not index.isValid():
+            return
+        result = self.model.result_at(index.row())
+        if result is None:
+            return
+        result_type, _, _, payload = result
+        if result_type == "按钮":
+            self.launch_requested.emit(payload)
+        else:
+            self.group_requested.emit(payload)
+
+class ProfileEditor(QDialog):
+    """启动方案编辑对话框（按钮、启动延迟、依赖项和最大并发数）"""
+    HEADERS = ["按钮", "延迟(秒)", "依赖于"]
+
+    def __init__(self, records: Dict[int, ButtonRecord], group_name, profile_id: Optional[int] = None,
+                 name: str = "", max_concurrent: int = 3, items: Optional[List[ProfileItem]] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.records = records
+        self.group_name = group_name  # group_id -> 分组名称
+        self.profile_id = profile_id
+        
+        self.setWindowTitle("编辑启动方案" if profile_id else "新建启动方案")
+        self.setWindowModality(Qt.ApplicationModal)
+        self.resize(560, 400)
+        
+        layout = QVBoxLayout()
         
-        self.clear_icon_btn = QPushButton("清除")
-        self.clear_icon_btn.clicked.connect(self.clear_icon)
-        icon_btn_layout.addWidget(self.clear_icon_btn)
+        # 方案名称和最大并发数
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("方案名称:"))
+        self.name_edit = QLineEdit(name)
+        name_layout.addWidget(self.name_edit)
+        name_layout.addWidget(QLabel("同时启动:"))
+        self.concurrent_spin = QSpinBox()
+        self.concurrent_spin.setRange(1, 16)
+        self.concurrent_spin.setValue(max_concurrent)
+        self.concurrent_spin.setToolTip("同时处于启动过程中的程序数上限")
+        name_layout.addWidget(self.concurrent_spin)
+        layout.addLayout(name_layout)
         
-        options_layout.addLayout(icon_btn_layout)
-        layout.addLayout(options_layout)
+        # 方案各项
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        
+        # 添加/移除/排序
+        add_layout = QHBoxLayout()
+        self.button_combo = QComboBox()
+        for record in sorted(records.values(), key=lambda r: (self.group_name(r.group_id), r.name)):
+            self.button_combo.addItem(self.record_label(record), record.id)
+        add_layout.addWidget(self.button_combo, 1)
+        for text, slot in (("添加", self.add_selected), ("移除", self.remove_current),
+                           ("上移", lambda: self.move_current(-1)), ("下移", lambda: self.move_current(1))):
+            btn = QPushButton(text)
+            btn.clicked.connect(slot)
+            add_layout.addWidget(btn)
+        layout.addLayout(add_layout)
         
         # 按钮区域
         btn_layout = QHBoxLayout()
         self.save_btn = QPushButton("保存")
-        self.save_btn.clicked.connect(self.save_button)
+        self.save_btn.clicked.connect(self.save_profile)
         btn_layout.addWidget(self.save_btn)
         
         self.cancel_btn = QPushButton("取消")
         self.cancel_btn.clicked.connect(self.close)
         btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+        
+        self.populate([item for item in items or [] if item.button_id in records])
+    
+    def record_label(self, record: ButtonRecord) -> str:
+        return f"{self.group_name(record.group_id)} / {record.name}"
+    
+    def populate(self, items: List[ProfileItem]):
+        """按给定的项重建表格"""
+        self.table.setRowCount(len(items))
+        for row, item in enumerate(items):
+            name_item = QTableWidgetItem(self.record_label(self.records[item.button_id]))
+            name_item.setData(Qt.UserRole, item.button_id)
+            self.table.setItem(row, 0, name_item)
+            
+            delay_spin = QDoubleSpinBox()
+            delay_spin.setRange(0, 600)
+            delay_spin.setDecimals(1)
+            delay_spin.setValue(item.delay_ms / 1000.0)
+            self.table.setCellWidget(row, 1, delay_spin)
+            
+            depends_combo = QComboBox()
+            depends_combo.addItem("无", None)
+            for other in items:
+                if other.button_id != item.button_id:
+                    depends_combo.addItem(self.records[other.button_id].name, other.button_id)
+            depends_combo.setCurrentIndex(max(0, depends_combo.findData(item.depends_on)))
+            self.table.setCellWidget(row, 2, depends_combo)
+    
+    def current_items(self) -> List[ProfileItem]:
+        """读取表格中的各项"""
+        items = []
+        for row in range(self.table.rowCount()):
+            items.append(ProfileItem(
+                self.table.item(row, 0).data(Qt.UserRole),
+                int(round(self.table.cellWidget(row, 1).value() * 1000)),
+                self.table.cellWidget(row, 2).currentData()))
+        return items
+    
+    def add_selected(self):
+        button_id = self.button_combo.currentData()
+        items = self.current_items()
+        if button_id is None or any(item.button_id == button_id for item in items):
+            return
+        self.populate(items + [ProfileItem(button_id)])
+        self.table.selectRow(len(items))
+    
+    def remove_current(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        items = self.current_items()
+        removed = items.pop(row).button_id
+        for item in items:
+            if item.depends_on == removed:
+                item.depends_on = None
+        self.populate(items)
+    
+    def move_current(self, offset: int):
+        row = self.table.currentRow()
+        target = row + offset
+        if row < 0 or not 0 <= target < self.table.rowCount():
+            return
+        items = self.current_items()
+        items[row], items[target] = items[target], items[row]
+        self.populate(items)
+        self.table.selectRow(target)
+    
+    def save_profile(self):
+        """保存启动方案"""
+        name = self.name_edit.text().strip()
+        items = self.current_items()
+        if not name:
+            QMessageBox.warning(self, "警告", "方案名称不能为空!")
+            return
+        if not items:
+            QMessageBox.warning(self, "警告", "请至少添加一个按钮!")
+            return
+        if ProfilePlan(items).find_cycles():
+            QMessageBox.warning(self, "警告", "依赖关系存在循环，请检查\"依赖于\"设置!")
+            return
+        try:
+            self.profile_id = DatabaseManager().save_launch_profile(
+                self.profile_id, name, self.concurrent_spin.value(), items)
+        except sqlite3.IntegrityError:
+            QMessageBox.warning(self, "警告", f"已存在名为 {name} 的启动方案!")
+            return
+        self.accept()
+
+
+class ProfileRunDialog(QDialog):
+    """启动方案执行报告（逐项显示状态，执行期间实时更新）"""
+    STATUS_LABELS = {
+        ProfilePlan.PENDING: "等待",
+        ProfilePlan.STARTING: "启动中",
+        ProfilePlan.SETTLING: "已启动",
+        ProfilePlan.OK: "成功",
+        ProfilePlan.FAILED: "失败",
+        ProfilePlan.SKIPPED: "跳过",
+    }
+
+    def __init__(self, run: 'ProfileRun', records: Dict[int, ButtonRecord], parent=None):
+        super().__init__(parent)
+        self.run = run
+        self.setWindowTitle(f"启动方案: {run.name}")
+        self.setWindowModality(Qt.NonModal)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.resize(520, 320)
+        
+        layout = QVBoxLayout()
+        self.table = QTableWidget(len(run.plan.items), 3)
+        self.table.setHorizontalHeaderLabels(["按钮", "状态", "说明"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.rows = {}  # button_id -> 行号
+        for row, button_id in enumerate(run.plan.items):
+            record = records.get(button_id)
+            self.table.setItem(row, 0, QTableWidgetItem(record.name if record else str(button_id)))
+            self.table.setItem(row, 1, QTableWidgetItem())
+            self.table.setItem(row, 2, QTableWidgetItem())
+            self.rows[button_id] = row
+            self.update_item(button_id)
+        layout.addWidget(self.table)
+        
+        self.summary_label = QLabel("正在启动...")
+        layout.addWidget(self.summary_label)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
         
+        run.item_changed.connect(self.update_item)
+        run.finished.connect(self.show_summary)
+    
+    def update_item(self, button_id: int):
+        row = self.rows.get(button_id)
+        if row is None:
+            return
+        status = self.run.plan.state[button_id]
+        status_item = self.table.item(row, 1)
+        status_item.setText(self.STATUS_LABELS.get(status, status))
+        if status in (ProfilePlan.FAILED, ProfilePlan.SKIPPED):
+            status_item.setBackground(LauncherStyle.BROKEN)
+        elif status == ProfilePlan.OK:
+            status_item.setBackground(MacaronColors.MINT_GREEN)
+        self.table.item(row, 2).setText(self.run.plan.messages.get(button_id, ""))
+    
+    def show_summary(self):
+        ok, failed = self.run.plan.summary()
+        self.summary_label.setText(f"完成: 成功 {ok} 项，失败或跳过 {failed} 项")
+
+
+class LatencyReportDialog(QDialog):
+    """启动耗时报告（各按钮各阶段的次数、p50/p95 和最大值，可导出 CSV）"""
+
+    def __init__(self, stats: LatencyStats, records: List[ButtonRecord], group_names: Dict[int, str],
+                 parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.records = records
+        self.group_names = group_names
+        self.setWindowTitle("启动耗时报告")
+        self.setWindowModality(Qt.NonModal)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.resize(720, 420)
+        
+        layout = QVBoxLayout()
+        rows = stats.report_rows(records, group_names)
+        self.table = QTableWidget(len(rows), len(LatencyStats.REPORT_HEADERS))
+        self.table.setHorizontalHeaderLabels(LatencyStats.REPORT_HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)  # 数值列按数值排序
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        layout.addWidget(self.table)
+        if not rows:
+            layout.addWidget(QLabel("还没有启动记录"))
+        
+        btn_layout = QHBoxLayout()
+        export_btn = QPushButton("导出 CSV...")
+        export_btn.clicked.connect(self.export_csv)
+        export_btn.setEnabled(bool(rows))
+        btn_layout.addWidget(export_btn)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(close_btn)
         layout.addLayout(btn_layout)
         self.setLayout(layout)
     
-    def update_icon_btn(self):
-        """更新图标按钮的显示"""
-        if self.icon_path and os.path.exists(self.icon_path):
-            self.icon_btn.setIcon(QIcon(self.icon_path))
-            self.icon_btn.setText("更改图标")
+    def export_csv(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出启动耗时报告",
+            f"launch_latency_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            "CSV 文件 (*.csv)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", newline="", encoding="utf-8-sig") as f:  # 带 BOM，Excel 可直接打开
+                count = self.stats.write_csv(f, self.records, self.group_names)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"导出失败:\n{str(e)}")
+            return
+        QMessageBox.information(self, "导出完成", f"已导出 {count} 行到:\n{file_path}")
+
+
+class QuickLaunchPalette(QDialog):
+    """快速启动面板（启动时创建后隐藏，呼出时只需 show 和聚焦）"""
+    RESULT_LIMIT = 20
+    
+    launch_requested = pyqtSignal(object)  # ButtonRecord
+    
+    def __init__(self, index: SearchIndex, score=None, group_name=None, parent=None):
+        super().__init__(parent, Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.index = index
+        self.score = score  # button_id -> 频率评分
+        self.group_name = group_name or (lambda group_id: "")  # group_id -> 分组名称
+        self.resize(480, 360)
+        
+        layout = QVBoxLayout(self)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("输入名称、拼音首字母或路径，回车启动")
+        self.search_edit.textChanged.connect(self.update_results)
+        self.search_edit.installEventFilter(self)
+        layout.addWidget(self.search_edit)
+        
+        self.result_list = QListWidget()
+        self.result_list.setUniformItemSizes(True)
+        self.result_list.itemActivated.connect(self.activate_item)
+        layout.addWidget(self.result_list)
+    
+    def popup(self):
+        """清空关键词并在父窗口（或屏幕）中央显示"""
+        self.search_edit.clear()
+        self.update_results()
+        anchor = self.parentWidget()
+        if anchor is not None and anchor.isVisible() and not anchor.isMinimized():
+            center = anchor.frameGeometry().center()
         else:
-            self.icon_btn.setIcon(QIcon())
-            self.icon_btn.setText("设置图标")
+            center = QApplication.desktop().availableGeometry(self).center()
+        self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.search_edit.setFocus()
     
-    def browse_path(self):
-        """浏览文件系统选择程序或目录"""
-        # 先检查剪贴板是否有文件或目录
-        clipboard = QApplication.clipboard()
-        if clipboard.mimeData().hasUrls():
-            urls = clipboard.mimeData().urls()
-            if urls and urls[0].isLocalFile():
-                path = urls[0].toLocalFile()
-                if os.path.exists(path):  # 检查路径是否存在
-                    reply = QMessageBox.question(
-                        self, "使用剪贴板路径", 
-                        f"检测到剪贴板中有路径:\n{path}\n\n是否使用此路径?",
-                        QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
-                    if reply == QMessageBox.Yes:
-                        self.path_edit.setText(path)
-                        # 如果没有选择图标，尝试获取图标
-                        if not self.icon_path:
-                            self.set_icon_from_path(path)
-                        return
+    def update_results(self):
+        """按当前关键词刷新结果（只显示前 RESULT_LIMIT 条）"""
+        self.result_list.clear()
+        for record in self.index.search(self.search_edit.text(), self.score, self.RESULT_LIMIT):
+            item = QListWidgetItem(f"{record.name}    [{self.group_name(record.group_id)}]")
+            item.setToolTip(record.path)
+            item.setData(Qt.UserRole, record)
+            self.result_list.addItem(item)
+        if self.result_list.count():
+            self.result_list.setCurrentRow(0)
+    
+    def activate_item(self, item: QListWidgetItem):
+        """启动选中的结果并隐藏面板"""
+        if item is None:
+            return
+        self.hide()
+        self.launch_requested.emit(item.data(Qt.UserRole))
+    
+    def eventFilter(self, obj, event):
+        """搜索框中的上下键移动选中项，回车启动"""
+        if obj is self.search_edit and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Up, Qt.Key_Down):
+                row = self.result_list.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= row < self.result_list.count():
+                    self.result_list.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.activate_item(self.result_list.currentItem())
+                return True
+        return super().eventFilter(obj, event)
+    
+    def event(self, event):
+        """失去焦点时自动隐藏"""
+        if event.type() == QEvent.WindowDeactivate and self.isVisible():
+            self.hide()
+        return super().event(event)
+
+
+class ButtonGridModel(QAbstractListModel):
+    """分组按钮网格模型（只保存按钮记录，图标在首次绘制时才加载）"""
+    RecordRole = Qt.UserRole + 1
+    SelectedRole = Qt.UserRole + 2
+    BrokenRole = Qt.UserRole + 3
+    RunningRole = Qt.UserRole + 4
+
+    def __init__(self, records: List[ButtonRecord], selection: set, parent=None,
+                 icon_file=None, tooltip=None, health=None, running=None):
+        super().__init__(parent)
+        self._records = list(records)
+        self._selection = selection  # 与主窗口共享的批量选择集合
+        self._icons = {}  # icon_path -> QIcon/None
+        self._icon_file = icon_file  # icon_path -> 实际加载的文件（可返回预缩放图标）
+        self._tooltip = tooltip  # ButtonRecord -> 提示文本
+        self._health = health  # button_id -> 路径失效说明（正常时为 None）
+        self._running = running  # button_id -> 是否有已启动的进程在运行
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def _icon(self, icon_path: str):
+        """按需加载并缓存图标"""
+        if icon_path not in self._icons:
+            if self._icon_file is not None:
+                icon_file = self._icon_file(icon_path)
+            else:
+                icon_file = icon_path if icon_path and os.path.exists(icon_path) else None
+            self._icons[icon_path] = QIcon(icon_file) if icon_file else None
+        return self._icons[icon_path]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._records):
+            return None
+        record = self._records[index.row()]
+        if role == Qt.DisplayRole:
+            return record.name
+        if role == Qt.DecorationRole:
+            return self._icon(record.icon_path)
+        if role == Qt.ToolTipRole:
+            if self._tooltip is not None:
+                return self._tooltip(record)
+            return f"路径: {record.path}\n参数: {record.arguments}\n工作目录: {record.working_dir}"
+        if role == self.RecordRole:
+            return record
+        if role == self.SelectedRole:
+            return record.id in self._selection
+        if role == self.BrokenRole:
+            return self._health is not None and self._health(record.id) is not None
+        if role == self.RunningRole:
+            return self._running is not None and self._running(record.id)
+        return None
+
+    def refresh_row(self, row: int):
+        """通知视图重绘指定行"""
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_records(self, records: List[ButtonRecord]):
+        """替换全部记录（增量刷新时使用）"""
+        self.beginResetModel()
+        self._records = list(records)
+        self._icons.clear()
+        self.endResetModel()
+
+    def refresh_all(self):
+        """通知视图重绘所有行"""
+        if self._records:
+            self.dataChanged.emit(self.index(0), self.index(len(self._records) - 1))
+
+    def invalidate_icons(self, icon_paths: set):
+        """丢弃指定图标的缓存并重绘"""
+        for icon_path in icon_paths:
+            self._icons.pop(icon_path, None)
+        self.refresh_all()
+
+
+class ButtonGridDelegate(QStyledItemDelegate):
+    """按钮网格绘制代理（模拟 QToolButton 的外观，只绘制可见单元格）"""
+    CELL_SIZE = QSize(120, 60)
+    ICON_SIZE = 32
+
+    def sizeHint(self, option, index):
+        return self.CELL_SIZE
+
+    def paint(self, painter, option, index):
+        record = index.data(ButtonGridModel.RecordRole)
+        if record is None:
+            return
+        rect = option.rect.adjusted(2, 2, -2, -2)
         
-        # 显示文件/目录选择对话框
-        dialog = QFileDialog(self)
-        dialog.setFileMode(QFileDialog.ExistingFile)
-        dialog.setOption(QFileDialog.DontUseNativeDialog, True)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        # 添加"选择文件夹"按钮
-        dir_btn = QPushButton("选择文件夹")
-        dir_btn.clicked.connect(lambda: dialog.setFileMode(QFileDialog.Directory))
-        dialog.layout().addWidget(dir_btn)
+        # 背景: 批量选中 > 悬停 > 路径失效 > 普通
+        if index.data(ButtonGridModel.SelectedRole):
+            background = LauncherStyle.SELECTED
+        elif option.state & QStyle.State_MouseOver:
+            background = LauncherStyle.HOVER
+        elif index.data(ButtonGridModel.BrokenRole):
+            background = LauncherStyle.BROKEN
+        else:
+            background = option.palette.button().color()
+        painter.setBrush(background)
+        # 管理员权限运行的按钮使用红色边框
+        painter.setPen(QPen(LauncherStyle.ADMIN_BORDER if record.run_as_admin else option.palette.mid().color()))
+        painter.drawRoundedRect(rect, 4, 4)
         
-        # 添加"选择文件"按钮
-        file_btn = QPushButton("选择文件")
-        file_btn.clicked.connect(lambda: dialog.setFileMode(QFileDialog.ExistingFile))
-        dialog.layout().addWidget(file_btn)
+        # 运行中标记（右上角圆点）
+        if index.data(ButtonGridModel.RunningRole):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(LauncherStyle.RUNNING)
+            painter.drawEllipse(QRect(rect.right() - 9, rect.top() + 3, 6, 6))
         
-        if dialog.exec_():
-            paths = dialog.selectedFiles()
-            if paths:
-                path = paths[0]
-                self.path_edit.setText(path)
-                # 如果没有选择图标，尝试获取图标
-                if not self.icon_path:
-                    self.set_icon_from_path(path)
+        # 图标
+        icon = index.data(Qt.DecorationRole)
+        text_rect = rect.adjusted(3, 0, -3, 0)
+        if icon is not None:
+            icon_rect = QRect(rect.center().x() - self.ICON_SIZE // 2, rect.top() + 3,
+                              self.ICON_SIZE, self.ICON_SIZE)
+            icon.paint(painter, icon_rect)
+            text_rect.setTop(icon_rect.bottom() + 1)
+        
+        # 文本（收藏按钮加粗并显示为橙色）
+        font = QFont(option.font)
+        if record.is_favorite:
+            font.setBold(True)
+            painter.setPen(LauncherStyle.FAVORITE_TEXT)
+        else:
+            painter.setPen(option.palette.buttonText().color())
+        painter.setFont(font)
+        text = QFontMetrics(font).elidedText(record.name, Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignCenter, text)
+        painter.restore()
 
 
-    def set_icon_from_path(self, path):
-        """根据路径自动设置图标"""
-        if os.path.isdir(path):  # 如果是目录
-            # 使用系统文件夹图标
-            from win32com.shell import shell, shellcon
+class ButtonGridView(QListView):
+    """虚拟化的按钮网格视图（替代每个按钮一个 QToolButton 的流式布局）"""
+    def __init__(self, model: ButtonGridModel, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setGridSize(QSize(ButtonGridDelegate.CELL_SIZE.width() + 10,
+                               ButtonGridDelegate.CELL_SIZE.height() + 10))
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.setItemDelegate(ButtonGridDelegate(self))
+        self.setModel(model)
+
+
+class WidgetRegistry:
+    """按钮ID/分组ID到界面控件及其元数据的注册表（由标签页构建代码维护）
+    
+    同一个按钮可能同时显示在所属分组和"常用"分组中，因此按钮控件按
+    (容器键, 按钮ID) 登记，容器键为分组ID或 FREQUENT。
+    """
+    FREQUENT = "frequent"
+
+    def __init__(self):
+        self._tabs = {}  # group_id -> 标签页
+        self._flows = {}  # 容器键 -> FlowLayout
+        self._views = {}  # 容器键 -> ButtonGridView
+        self._containers = {}  # 容器键 -> {button_id: 控件}（按显示顺序）
+        self._buttons = {}  # button_id -> {容器键: 控件}
+        self._metadata = {}  # button_id -> ButtonRecord
+
+    def clear(self):
+        """清空所有登记（整体重建界面时使用）"""
+        self._tabs.clear()
+        self._flows.clear()
+        self._views.clear()
+        self._containers.clear()
+        self._buttons.clear()
+        self._metadata.clear()
+
+    # 标签页
+    def register_tab(self, group_id: int, tab: QWidget):
+        self._tabs[group_id] = tab
+
+    def unregister_tab(self, group_id: int) -> Optional[QWidget]:
+        return self._tabs.pop(group_id, None)
+
+    def tab(self, group_id: int) -> Optional[QWidget]:
+        return self._tabs.get(group_id)
+
+    # 按钮区域
+    def register_flow(self, key, flow: 'FlowLayout'):
+        self._flows[key] = flow
+
+    def flow(self, key) -> Optional['FlowLayout']:
+        return self._flows.get(key)
+
+    def register_view(self, key, view: 'ButtonGridView'):
+        self._views[key] = view
+
+    def view(self, key) -> Optional['ButtonGridView']:
+        return self._views.get(key)
+
+    def views(self) -> List['ButtonGridView']:
+        return list(self._views.values())
+
+    # 按钮
+    def register_button(self, key, widget: QWidget, record: ButtonRecord):
+        self._containers.setdefault(key, {})[record.id] = widget
+        self._buttons.setdefault(record.id, {})[key] = widget
+        self._metadata[record.id] = record
+
+    def unregister_button(self, key, button_id: int) -> Optional[QWidget]:
+        widget = self._containers.get(key, {}).pop(button_id, None)
+        owners = self._buttons.get(button_id)
+        if owners is not None:
+            owners.pop(key, None)
+            if not owners:
+                del self._buttons[button_id]
+                self._metadata.pop(button_id, None)
+        return widget
+
+    def update_metadata(self, record: ButtonRecord):
+        if record.id in self._buttons:
+            self._metadata[record.id] = record
+
+    def metadata(self, button_id: int) -> Optional[ButtonRecord]:
+        return self._metadata.get(button_id)
+
+    def container(self, key) -> Dict[int, QWidget]:
+        """获取容器内的按钮控件（按显示顺序）"""
+        return self._containers.get(key, {})
+
+    def set_container_order(self, key, button_ids: List[int]):
+        """记录容器内按钮的新显示顺序"""
+        widgets = self._containers.get(key, {})
+        self._containers[key] = {bid: widgets[bid] for bid in button_ids if bid in widgets}
+
+    def widgets(self, button_id: int) -> List[QWidget]:
+        """获取按钮当前的所有控件"""
+        return list(self._buttons.get(button_id, {}).values())
+
+    def all_widgets(self):
+        """遍历所有 (button_id, 控件)"""
+        for button_id, owners in self._buttons.items():
+            for widget in owners.values():
+                yield button_id, widget
+
+    def clear_container(self, key):
+        """移除一个容器（分组页或"常用"页）的所有登记"""
+        self._flows.pop(key, None)
+        self._views.pop(key, None)
+        for button_id in list(self._containers.get(key, {})):
+            self.unregister_button(key, button_id)
+        self._containers.pop(key, None)
+
+
+class LaunchDispatcher(QObject):
+    """异步启动队列：路径检查和进程创建在后台线程执行，结果通过信号回到界面线程
+    
+    不可达的网络路径可能让文件系统调用阻塞数十秒，路径解析和检查超过 timeout 仍无结果时直接报告失败，
+    之后检查完成也不再启动；进程创建（如等待 UAC 确认）不受超时限制。同一按钮在上一次启动完成前的重复点击会被合并。
+    启动成功后（Windows 上再等待窗口就绪，最多 READY_TIMEOUT_MS）通过 traced 报告分阶段耗时。
+    """
+    DEFAULT_TIMEOUT = 5.0  # 秒
+    READY_TIMEOUT_MS = 15000
+    
+    started = pyqtSignal(object)  # LaunchRequest
+    launched = pyqtSignal(object)  # LaunchRequest
+    failed = pyqtSignal(object, str, bool)  # LaunchRequest, 错误信息, 是否为路径不可用
+    traced = pyqtSignal(object)  # LaunchRequest（request.trace 已完成）
+    _finished = pyqtSignal(int, object, str, bool)  # 后台线程 -> 界面线程
+    _traced = pyqtSignal(int, object)
+    
+    def __init__(self, timeout: Optional[float] = None, resolver: Optional[PathResolver] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.resolver = resolver or PathResolver()
+        self._pending = {}  # request.key -> token
+        self._launched = set()  # 已成功启动、等待耗时报告的 token
+        self._lock = threading.Lock()
+        self._spawning = set()  # 已通过路径检查、正在创建进程的 token（不再受超时限制）
+        self._expired = set()  # 路径检查超时的 token（检查结束后不再启动）
+        self._tokens = itertools.count(1)
+        self._finished.connect(self._on_finished)
+        self._traced.connect(self._on_traced)
+    
+    def is_pending(self, request: LaunchRequest) -> bool:
+        return request.key in self._pending
+    
+    def submit(self, request: LaunchRequest) -> bool:
+        """提交启动请求，已有相同请求在处理时合并并返回 False"""
+        if request.key in self._pending:
+            print(f"[DEBUG] 启动请求已在处理中，忽略重复请求: {request.path}")
+            return False
+        token = next(self._tokens)
+        self._pending[request.key] = token
+        threading.Thread(target=self._run, args=(token, request), daemon=True).start()
+        QTimer.singleShot(int(self.timeout * 1000), lambda: self._on_timeout(token, request))
+        self.started.emit(request)
+        return True
+    
+    def _run(self, token: int, request: LaunchRequest):
+        """后台线程: 检查路径并启动（不访问任何界面对象）"""
+        if sys.platform == "win32":
             try:
-                _, icon = shell.SHGetFileInfo(path, 0, shellcon.SHGFI_ICON | shellcon.SHGFI_LARGEICON)
-                icon_path = os.path.join(os.path.dirname(self.db_path), "folder_icon.ico")
-                icon.Save(icon_path)
-                self.icon_path = icon_path
-                self.update_icon_btn()
-                return
-            except:
+                import pythoncom
+                pythoncom.CoInitialize()  # ShellExecuteEx 需要在当前线程初始化 COM
+            except ImportError:
                 pass
-        elif path.lower().endswith('.exe'):  # 如果是EXE文件
-            icon_path = DynamicIconGenerator.extract_exe_icon(path)
-            if icon_path:
-                self.icon_path = icon_path
-                self.update_icon_btn()
-                return
-        
-        # 在程序所在目录查找图标文件
-        program_dir = os.path.dirname(path) if os.path.isfile(path) else path
-        icon_path = DynamicIconGenerator.find_icon_in_directory(program_dir)
-        if icon_path:
-            self.icon_path = icon_path
-            self.update_icon_btn()
+        trace = request.trace
+        trace.mark("queue")
+        try:
+            path, working_dir = prepare_launch(request.path, request.working_dir, self.resolver, trace)
+            with self._lock:
+                if token in self._expired:
+                    self._expired.discard(token)
+                    return  # 已按超时报告失败
+                self._spawning.add(token)
+            request.process = start_program(path, request.arguments, working_dir, request.run_as_admin,
+                                            request.limits)
+            trace.mark("spawn")
+            trace.mark_total()
+        except LaunchError as e:
+            self._finished.emit(token, request, str(e), True)
+        except Exception as e:
+            self._finished.emit(token, request, str(e), False)
+        else:
+            self._finished.emit(token, request, "", False)
+            if wait_process_ready(request.process, self.READY_TIMEOUT_MS):
+                trace.mark("ready")
+            self._traced.emit(token, request)
+    
+    def _on_finished(self, token: int, request: LaunchRequest, error: str, unavailable: bool):
+        with self._lock:
+            self._spawning.discard(token)
+            self._expired.discard(token)
+        if self._pending.get(request.key) != token:
+            return  # 已按超时处理
+        del self._pending[request.key]
+        if error:
+            self.failed.emit(request, error, unavailable)
+        else:
+            self._launched.add(token)
+            self.launched.emit(request)
+    
+    def _on_traced(self, token: int, request: LaunchRequest):
+        if token in self._launched:  # 超时后才完成的启动不计入耗时统计
+            self._launched.discard(token)
+            self.traced.emit(request)
+    
+    def _on_timeout(self, token: int, request: LaunchRequest):
+        if self._pending.get(request.key) != token:
+            return
+        with self._lock:
+            if token in self._spawning:
+                return  # 路径检查已完成，正在创建进程
+            self._expired.add(token)
+        del self._pending[request.key]
+        self.resolver.mark_path_down(request.path)  # 网络共享上之后的请求直接失败，不再等待超时
+        self.failed.emit(request, f"路径 {request.path} 在 {self.timeout:g} 秒内没有响应，"
+                                  f"请检查网络连接或驱动器映射", True)
+
+
+class ProfileRun(QObject):
+    """执行一次启动方案：按 ProfilePlan 提交启动请求，跟踪每项结果
+    
+    submit(button_id) 负责实际提交，返回 (状态, LaunchRequest 或 None, 说明)：已提交或并入正在处理的
+    同一按钮请求时为 (STARTING, 请求, "")，已在运行时为 (OK, None, 说明)，无法启动时为 (SKIPPED, None, 原因)。
+    结果通过 LaunchDispatcher 的信号按请求 key 匹配。程序启动后保持 SETTLE_MS
+    的"稳定中"状态再释放名额，避免多个大型程序的初始化磁盘读取叠加在一起。
+    """
+    SETTLE_MS = 2000
+    
+    item_changed = pyqtSignal(int)  # button_id
+    finished = pyqtSignal()
+    
+    def __init__(self, name: str, plan: ProfilePlan, submit, dispatcher: LaunchDispatcher, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.plan = plan
+        self._submit = submit
+        self._dispatcher = dispatcher
+        self._requests = {}  # request.key -> button_id
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.pump)
+        dispatcher.launched.connect(self._on_launched)
+        dispatcher.failed.connect(self._on_failed)
+    
+    def start(self):
+        print(f"[DEBUG] 开始执行启动方案: {self.name} ({len(self.plan.items)} 项)")
+        self.pump()
+    
+    def pump(self):
+        """启动所有已就绪的项，并安排下一次检查"""
+        now = time.monotonic()
+        while True:
+            batch, wake = self.plan.next_batch(now)
+            if not batch:
+                break
+            for button_id in batch:
+                status, request, message = self._submit(button_id)
+                if request is None:
+                    self.plan.finish(button_id, status, message)
+                else:
+                    self._requests[request.key] = button_id
+        for button_id in self.plan.take_changed():
+            self.item_changed.emit(button_id)
+        if wake is not None:
+            self._timer.start(max(0, int((wake - now) * 1000)))
+        if self.plan.done():
+            self._timer.stop()
+            self._dispatcher.launched.disconnect(self._on_launched)
+            self._dispatcher.failed.disconnect(self._on_failed)
+            ok, failed = self.plan.summary()
+            print(f"[DEBUG] 启动方案 {self.name} 完成: 成功 {ok}，失败/跳过 {failed}")
+            self.finished.emit()
+    
+    def _on_launched(self, request: LaunchRequest):
+        button_id = self._requests.pop(request.key, None)
+        if button_id is None:
+            return
+        self.plan.state[button_id] = ProfilePlan.SETTLING
+        self.item_changed.emit(button_id)
+        QTimer.singleShot(self.SETTLE_MS, lambda: self._on_settled(button_id))
+    
+    def _on_settled(self, button_id: int):
+        self.plan.finish(button_id, ProfilePlan.OK)
+        self.pump()
+    
+    def _on_failed(self, request: LaunchRequest, message: str, unavailable: bool):
+        button_id = self._requests.pop(request.key, None)
+        if button_id is None:
+            return
+        self.plan.finish(button_id, ProfilePlan.FAILED, message)
+        self.pump()
+
+
+class AutostartScheduler(QObject):
+    """随启动器自动启动的调度器
+    
+    启动器显示后等待 INITIAL_DELAY_MS 再开始，按优先级逐个启动，每两个程序之间至少间隔
+    STAGGER_MS；系统忙碌（CPU 或 I/O 等待偏高）时每 CHECK_MS 复查一次，最多等待
+    MAX_WAIT_MS 后照常启动，避免一直忙碌时永远不启动。
+    """
+    INITIAL_DELAY_MS = 5000
+    STAGGER_MS = 3000
+    CHECK_MS = 1000
+    MAX_WAIT_MS = 30000
+    
+    finished = pyqtSignal()
+    
+    def __init__(self, submit, load: Optional[SystemLoad] = None, parent=None):
+        super().__init__(parent)
+        self._submit = submit  # ButtonRecord -> 是否已提交
+        self.load = load or SystemLoad()
+        self.queue = []  # 待启动的按钮记录（按优先级排序）
+        self._waiting_since = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+    
+    @staticmethod
+    def order(records) -> List[ButtonRecord]:
+        """需要自动启动的按钮，优先级高的在前（同优先级保持原顺序）"""
+        return sorted((r for r in records if r.autostart), key=lambda r: -r.autostart_priority)
+    
+    def start(self, records) -> int:
+        """开始调度，返回需要自动启动的按钮数"""
+        self.queue = self.order(records)
+        if self.queue:
+            print(f"[DEBUG] 自动启动: {len(self.queue)} 个按钮，{self.INITIAL_DELAY_MS} ms 后开始")
+            self.load.sample()  # 建立采样基线
+            self._timer.start(self.INITIAL_DELAY_MS)
+        return len(self.queue)
+    
+    def cancel(self):
+        self.queue = []
+        self._timer.stop()
+    
+    def _tick(self):
+        if not self.queue:
+            self.finished.emit()
+            return
+        now = time.monotonic()
+        if self._waiting_since is None:
+            self._waiting_since = now
+        waited_ms = (now - self._waiting_since) * 1000
+        if self.load.is_idle() is False and waited_ms < self.MAX_WAIT_MS:
+            self._timer.start(self.CHECK_MS)
+            return
+        record = self.queue.pop(0)
+        self._waiting_since = None
+        print(f"[DEBUG] 自动启动: {record.name}（等待系统空闲 {waited_ms:.0f} ms）")
+        self._submit(record)
+        if self.queue:
+            self._timer.start(self.STAGGER_MS)
+        else:
+            self.finished.emit()
+
 
+class IdlePrefetcher(QObject):
+    """空闲时定期预读可能即将启动的程序
+    
+    candidates(limit) 在界面线程中给出按优先顺序排列的程序路径，预读在单个后台线程中进行。
+    本轮因系统忙碌中止时，下一轮的间隔加倍（最长 MAX_BACKOFF_MS），正常完成后恢复。
+    """
+    INITIAL_DELAY_MS = 60000
+    INTERVAL_MS = 10 * 60 * 1000
+    MAX_BACKOFF_MS = 60 * 60 * 1000
+    
+    finished = pyqtSignal(dict)  # 本轮统计
+    _done = pyqtSignal(dict)  # 后台线程 -> 界面线程
+    
+    def __init__(self, candidates, top_n: int = 8, budget_mb: int = 256, parent=None):
+        super().__init__(parent)
+        self._candidates = candidates
+        self.top_n = top_n
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.prefetcher = Prefetcher()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._running = False
+        self._interval = self.INTERVAL_MS
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.run_cycle)
+        self._done.connect(self._on_done)
+    
+    def start(self):
+        self._timer.start(self.INITIAL_DELAY_MS)
+    
+    def run_cycle(self):
+        """开始一轮预读（上一轮未结束时跳过）"""
+        if self._running:
+            return
+        paths = self._candidates(self.top_n)
+        if not paths:
+            self._timer.start(self._interval)
+            return
+        self._running = True
+        self._executor.submit(self._work, paths)
+    
+    def _work(self, paths: List[str]):
+        """后台线程: 执行预读（不访问任何界面对象）"""
+        try:
+            result = self.prefetcher.run(paths, self.budget_bytes)
+        except Exception as e:
+            result = {"error": str(e), "busy": False}
+        self._done.emit(result)
+    
+    def _on_done(self, result: dict):
+        self._running = False
+        if result.get("busy"):
+            self._interval = min(self._interval * 2, self.MAX_BACKOFF_MS)
+        else:
+            self._interval = self.INTERVAL_MS
+        print(f"[DEBUG] 预读: {result}，{self._interval // 1000} 秒后再次检查")
+        self._timer.start(self._interval)
+        self.finished.emit(result)
+    
+    def shutdown(self):
+        """停止预读（正在读取的文件读完当前块后结束）"""
+        self._timer.stop()
+        self.prefetcher.stop_event.set()
+        self._executor.shutdown(wait=False)
 
 
+class HealthScanner(QObject):
+    """后台路径健康检查
     
-    def browse_working_dir(self):
-        """浏览工作目录"""
-        dir_path = QFileDialog.getExistingDirectory(self, "选择工作目录")
-        if dir_path:
-            self.dir_edit.setText(dir_path)
+    有界线程池执行；同一网络共享/驱动器的按钮归为一组，在一个工作线程中依次检查，
+    并先在 HOST_TIMEOUT 秒内探测共享根，不可达时整组直接标记，避免同时向一台服务器发起大量请求。
+    每个按钮的检查同样限时，网络共享上的检查超时后该共享标记为不可达，组内其余按钮不再访问。
+    本地路径按 LOCAL_CHUNK 分块并行检查。结果按组通过 results_ready 信号回到界面线程。
+    """
+    MAX_WORKERS = 8
+    HOST_TIMEOUT = 5.0  # 秒
+    LOCAL_CHUNK = 200
     
-    def change_icon(self):
-        """更改图标"""
-        icon_path, _ = QFileDialog.getOpenFileName(
-            self, "选择图标文件", "", "图标文件 (*.ico *.png *.jpg);;所有文件 (*.*)")
-        if icon_path:
-            self.icon_path = icon_path
-            self.update_icon_btn()
+    results_ready = pyqtSignal(list)  # [(button_id, status, message, checked_at)]
+    _done = pyqtSignal(list)  # 检查结束（包括异常退出）的按钮ID -> 界面线程
     
-    def clear_icon(self):
-        """清除图标"""
-        self.icon_path = ""
-        self.update_icon_btn()
+    def __init__(self, resolver: PathResolver, parent=None):
+        super().__init__(parent)
+        self.resolver = resolver
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS,
+                                            thread_name_prefix="path-health")
+        self._queued = set()  # 正在检查的按钮ID（只在界面线程访问）
+        self._done.connect(self._on_done)
     
-    def save_button(self):
-        """保存按钮信息"""
-        name = self.name_edit.text().strip()
-        path = self.path_edit.text().strip()
-        args = self.args_edit.text().strip()
-        working_dir = self.dir_edit.text().strip()
-        run_as_admin = self.admin_check.isChecked()
-        is_favorite = self.favorite_check.isChecked()
-        
-        if not name:
-            QMessageBox.warning(self, "警告", "按钮名称不能为空!")
-            return
+    def scan(self, records: List[ButtonRecord]) -> int:
+        """提交检查（已在检查中的按钮跳过），返回提交的按钮数"""
+        records = [r for r in records if r.id not in self._queued]
+        if not records:
+            return 0
+        self._queued.update(r.id for r in records)
         
-        if not path:
-            QMessageBox.warning(self, "警告", "程序路径不能为空!")
+        hosts = {}  # 小写根路径 -> (根路径, 按钮列表)
+        local = []
+        for record in records:
+            root = PathHealth.host_root(record, self.resolver)
+            if root is None:
+                local.append(record)
+            else:
+                hosts.setdefault(root.lower(), (root, []))[1].append(record)
+        for root, host_records in hosts.values():
+            self._submit(self._check_host, host_records, root)
+        for start in range(0, len(local), self.LOCAL_CHUNK):
+            self._submit(self._check_records, local[start:start + self.LOCAL_CHUNK])
+        return len(records)
+    
+    def shutdown(self):
+        """停止接受新任务（正在运行的检查不等待）"""
+        self._executor.shutdown(wait=False)
+    
+    def _submit(self, check, records: List[ButtonRecord], *args):
+        try:
+            self._executor.submit(self._run, check, records, *args)
+        except RuntimeError:  # 已停止
+            self._queued.difference_update(r.id for r in records)
+    
+    def _run(self, check, records: List[ButtonRecord], *args):
+        """工作线程: 执行一组检查，无论是否出错都通知界面线程这些按钮已不在检查中"""
+        try:
+            check(records, *args)
+        except Exception as e:
+            print(f"[ERROR] 路径检查失败: {str(e)}")
+        finally:
+            self._done.emit([r.id for r in records])
+    
+    def _bounded(self, check, *args):
+        """在 HOST_TIMEOUT 秒内执行一次文件系统检查，超时返回 None（放弃等待卡住的检查线程）"""
+        result = []
+        worker = threading.Thread(target=lambda: result.append(check(*args)), daemon=True)
+        worker.start()
+        worker.join(self.HOST_TIMEOUT)
+        return result[0] if result else None
+    
+    def _probe(self, root: str) -> bool:
+        """在超时时间内探测共享根是否可达"""
+        if self.resolver.is_down(root):
+            return False
+        if self.resolver.is_up(root):
+            return True
+        reachable = bool(self._bounded(os.path.exists, root))
+        self.resolver.mark(root, reachable)
+        return reachable
+    
+    def _check_host(self, records: List[ButtonRecord], root: str):
+        """工作线程: 检查同一共享/驱动器上的按钮"""
+        if not self._probe(root):
+            now = time.time()
+            message = f"{root} 在 {self.HOST_TIMEOUT:g} 秒内无法访问，请检查网络连接或驱动器映射"
+            self.results_ready.emit([(r.id, PathHealth.UNREACHABLE, message, now) for r in records])
             return
-        
-        # 预处理路径
-        path = path.replace('/', '\\').strip('"\'')
-        if working_dir:
-            working_dir = working_dir.replace('/', '\\').strip('"\'')
-        
-        # 验证路径
-        if not os.path.exists(path):
-            if not (path.startswith('\\\\') or ':/' in path or ':\\' in path):
-                QMessageBox.warning(self, "警告", "指定的路径不存在!")
-                return
-        
-        db = DatabaseManager()
-        
-        # 处理图标路径
-        icon_path = self.icon_path
-        if icon_path:  # 如果有图标，确保它被保存到持久化存储
-            icon_path = db.copy_icon_to_storage(icon_path)
-        
-        # 如果没有选择图标且路径是EXE文件，尝试自动提取图标
-        if not icon_path and path.lower().endswith('.exe'):
-            extracted_icon = DynamicIconGenerator.extract_exe_icon(path)
-            if extracted_icon:
-                icon_path = db.copy_icon_to_storage(extracted_icon)
-                try:
-                    os.remove(extracted_icon)  # 删除临时文件
-                except:
-                    pass
+        self._check_records(records, root)
+    
+    def _check_one(self, record: ButtonRecord) -> Tuple[str, str]:
+        try:
+            return PathHealth.check(record, self.resolver)
+        except Exception as e:
+            return PathHealth.MISSING, str(e)
+    
+    def _check_records(self, records: List[ButtonRecord], root: Optional[str] = None):
+        """工作线程: 依次检查按钮（每个按钮限时 HOST_TIMEOUT 秒）"""
+        rows = []
+        for index, record in enumerate(records):
+            result = self._bounded(self._check_one, record)
+            if result is None and PathResolver.is_network_root(root):
+                # 共享在探测后失去响应：标记为不可达，组内其余按钮不再访问
+                self.resolver.mark(root, False)
+                now = time.time()
+                message = f"{root} 在 {self.HOST_TIMEOUT:g} 秒内没有响应，请检查网络连接或驱动器映射"
+                rows.extend((r.id, PathHealth.UNREACHABLE, message, now) for r in records[index:])
+                break
+            if result is None:
+                result = (PathHealth.UNREACHABLE, f"路径 {record.path} 在 {self.HOST_TIMEOUT:g} 秒内没有响应")
+            rows.append((record.id, *result, time.time()))
+        self.results_ready.emit(rows)
+    
+    def _on_done(self, button_ids: list):
+        self._queued.difference_update(button_ids)
 
-        if self.button_id is not None:
-            # 更新现有按钮
-            db.update_button(
-                self.button_id, name, path, args, 
-                working_dir, run_as_admin, icon_path
-            )
-            db.toggle_button_favorite(self.button_id, is_favorite)
-        else:
-            # 添加新按钮
-            if self.group_id is None:
-                QMessageBox.warning(self, "错误", "未指定分组!")
-                return
-            db.add_button(
-                self.group_id, name, path, args, 
-                working_dir, run_as_admin, icon_path, is_favorite
-            )
-        
-        self.parent.load_data()  # 刷新主界面
-        self.close()
 
+class CatalogWatcher(QObject):
+    """监视按钮程序所在目录、工作目录和图标文件，合并短时间内的多次变化后统一通知"""
+    COALESCE_MS = 500
+    MAX_WATCHED = 4000  # 监视数量上限（inotify 等系统资源有限）
+    
+    paths_changed = pyqtSignal(set)  # 发生变化的目录/文件（绝对路径）
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_changed)
+        self.watcher.fileChanged.connect(self._on_changed)
+        self._changed = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.COALESCE_MS)
+        self._timer.timeout.connect(self._flush)
+    
+    def set_paths(self, paths: set):
+        """更新监视集合（只增删有变化的部分）"""
+        paths = set(sorted(paths)[:self.MAX_WATCHED])
+        current = set(self.watcher.directories()) | set(self.watcher.files())
+        removed = list(current - paths)
+        added = [p for p in paths - current if os.path.exists(p)]
+        if removed:
+            self.watcher.removePaths(removed)
+        if added:
+            self.watcher.addPaths(added)
+    
+    def _on_changed(self, path: str):
+        self._changed.add(path)
+        # 文件被替换（删除后重建）时监视会失效，重新加入
+        if not os.path.isdir(path) and path not in self.watcher.files() and os.path.exists(path):
+            self.watcher.addPath(path)
+        self._timer.start()
+    
+    def _flush(self):
+        changed, self._changed = self._changed, set()
+        if changed:
+            self.paths_changed.emit(changed)
 
 
+class InstanceServer(QObject):
+    """单实例服务（本地套接字），后续启动的进程把请求转交给已运行的实例后立即退出
+    
+    消息为每行一个 JSON 对象，例如 {"action": "show"}、{"action": "add", "path": ...}、
+    {"action": "launch", "target": ...}。
+    """
+    message_received = pyqtSignal(dict)
 
+    def __init__(self, name: str, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}  # socket -> 未读完的数据
 
+    @staticmethod
+    def server_name(db_path: str = "launcher.db") -> str:
+        """按数据库位置生成服务名（不同数据目录的实例互不干扰）"""
+        return instance_server_name(db_path)
 
+    @staticmethod
+    def lock_file(db_path: str = "launcher.db") -> QLockFile:
+        """实例锁（持有者为主实例；进程异常退出后由 QLockFile 识别为过期锁）"""
+        lock = QLockFile(os.path.abspath(db_path) + ".lock")
+        lock.setStaleLockTime(0)
+        return lock
 
-class GroupEditor(QDialog):
-    def __init__(self, group_id: Optional[int] = None, name: str = "", 
-                 is_favorite: bool = False, parent=None):
-        super().__init__(parent)
-        self.group_id = group_id
-        self.parent = parent
-        
-        self.setWindowTitle("编辑分组" if group_id else "添加分组")
-        self.setWindowModality(Qt.ApplicationModal)
-        self.resize(300, 150)
-        
-        layout = QVBoxLayout()
-        
-        # 分组名称
-        name_layout = QHBoxLayout()
-        name_layout.addWidget(QLabel("分组名称:"))
-        self.name_edit = QLineEdit(name)
-        name_layout.addWidget(self.name_edit)
-        layout.addLayout(name_layout)
-        
-        # 收藏复选框
-        self.favorite_check = QCheckBox("收藏分组")
-        self.favorite_check.setChecked(is_favorite)
-        layout.addWidget(self.favorite_check)
-        
-        # 按钮区域
-        btn_layout = QHBoxLayout()
-        self.save_btn = QPushButton("保存")
-        self.save_btn.clicked.connect(self.save_group)
-        btn_layout.addWidget(self.save_btn)
-        
-        self.cancel_btn = QPushButton("取消")
-        self.cancel_btn.clicked.connect(self.close)
-        btn_layout.addWidget(self.cancel_btn)
-        
-        layout.addLayout(btn_layout)
-        self.setLayout(layout)
-    
-    def save_group(self):
-        """保存分组信息"""
-        name = self.name_edit.text().strip()
-        is_favorite = self.favorite_check.isChecked()
-        
-        print(f"分组名称: {name}, 收藏: {is_favorite}")
-        if not name:
-            QMessageBox.warning(self, "警告", "分组名称不能为空!")
-            return
-        
-        db = DatabaseManager()
-        print(f"分组ID: {self.group_id}")
-        if self.group_id is not None:
-            # 更新现有分组
-            db.update_group_name(self.group_id, name)
-            db.toggle_group_favorite(self.group_id, is_favorite)
-        else:
-            # 添加新分组
-            db.add_group(name, is_favorite)
-        
-        self.parent.load_data()  # 刷新主界面
-        self.close()
+    @staticmethod
+    def send(name: str, message: dict, timeout_ms: int = 1000) -> bool:
+        """把请求发送给已运行的实例，成功返回 True"""
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        if not socket.waitForConnected(timeout_ms):
+            return False
+        socket.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        ok = socket.waitForBytesWritten(timeout_ms)
+        socket.disconnectFromServer()
+        return ok
+
+    def listen(self) -> bool:
+        """开始监听（调用方已持有实例锁，残留的套接字文件可以安全删除）"""
+        QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            print(f"[ERROR] 单实例服务监听失败: {self.server.errorString()}")
+            return False
+        return True
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+            if socket.bytesAvailable():
+                self._on_ready_read(socket)
+
+    def _on_ready_read(self, socket: QLocalSocket):
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        *lines, self._buffers[socket] = data.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line.decode("utf-8"))
+            except ValueError as e:
+                print(f"[ERROR] 无法解析实例消息: {str(e)}")
+                continue
+            if isinstance(message, dict):
+                self.message_received.emit(message)
+
+    def _on_disconnected(self, socket: QLocalSocket):
+        if socket.bytesAvailable():
+            self._on_ready_read(socket)
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
 
-class SearchResultDialog(QDialog):
-    """搜索结果对话框"""
-    def __init__(self, results: List[Tuple[str, str, str]], parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("搜索结果")
-        self.setWindowModality(Qt.NonModal)
-        self.resize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        # 结果表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["类型", "名称", "路径/分组"])
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        
-        # 填充数据
-        self.table.setRowCount(len(results))
-        for row, (result_type, name, path) in enumerate(results):
-            self.table.setItem(row, 0, QTableWidgetItem(result_type))
-            self.table.setItem(row, 1, QTableWidgetItem(name))
-            self.table.setItem(row, 2, QTableWidgetItem(path))
-        
-        self.table.resizeColumnsToContents()
-        layout.addWidget(self.table)
-        
-        # 关闭按钮
-        close_btn = QPushButton("关闭")
-        close_btn.clicked.connect(self.close)
-        layout.addWidget(close_btn)
-        
-        self.setLayout(layout)
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    _snapshot_checked = pyqtSignal(dict)  # 后台快照校验结果 -> 界面线程
+    
+    def __init__(self, startup_timer: Optional[StartupTimer] = None):
         super().__init__()
+        self.startup_timer = startup_timer
         
         # 设置窗口标题和图标
         self.setWindowTitle(f"{ProjectInfo.NAME} {ProjectInfo.VERSION} (Build: {ProjectInfo.BUILD_DATE})")
         self.set_application_icon()
         
+        # 全局样式表（按钮状态通过动态属性匹配）
+        QApplication.instance().setStyleSheet(LauncherStyle.stylesheet())
+        
         # 主窗口设置
         self.resize(800, 600)
         self.central_widget = QWidget()
@@ -1143,8 +4446,27 @@ class MainWindow(QMainWindow):
         self.tab_widget.setMovable(True)
         self.tab_widget.tabBar().setUsesScrollButtons(True)
         self.tab_widget.tabBar().setElideMode(Qt.ElideRight)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         self.main_layout.addWidget(self.tab_widget)
         
+        # 标签页延迟构建
+        self.loading_tabs = False
+        self.group_buttons = {}  # group_id -> ButtonRecord 列表（按显示顺序）
+        self.groups = []  # 当前显示的分组快照 (id, name, position, is_favorite)
+        self.registry = WidgetRegistry()  # 按钮/分组ID -> 界面控件
+        self.prebuild_timer = QTimer(self)
+        self.prebuild_timer.setInterval(50)  # 空闲预构建间隔，避免阻塞界面
+        self.prebuild_timer.timeout.connect(self.prebuild_next_tab)
+        
+        # 标签页内容回收（LRU）：超过数量上限或长时间未访问的分组只保留占位页
+        settings = QSettings("ProgramLauncher", "MainWindow")
+        self.max_materialized_tabs = max(1, settings.value("maxMaterializedTabs", 20, type=int))
+        self.tab_idle_seconds = settings.value("tabIdleEvictSeconds", 600, type=int)  # 0 表示不按时间回收
+        self.tab_visits = OrderedDict()  # group_id -> 最近访问时间（最久未访问的在前）
+        self.evict_timer = QTimer(self)
+        self.evict_timer.timeout.connect(self.evict_idle_tabs)
+        self.evict_timer.start(60000)  # 每分钟检查一次
+        
         # 添加控制按钮
         self.create_control_buttons()
 
@@ -1157,11 +4479,94 @@ class MainWindow(QMainWindow):
         self.batch_mode = False
         self.selected_buttons = set()
         
-        # 加载数据
-        self.load_data()
+        # 启动历史（写缓冲，定时批量落盘）
+        self.launch_history = LaunchHistory()
+        self.button_index = {}  # button_id -> ButtonRecord
+        self.path_health = {}  # button_id -> (status, message, checked_at)
+        self.frequent_ids = []  # "常用"分组当前显示的按钮ID
+        self.history_flush_timer = QTimer(self)
+        self.history_flush_timer.timeout.connect(self.flush_launch_history)
+        self.history_flush_timer.start(30000)  # 每30秒批量写入一次
+        
+        # 网格视图模式（虚拟化绘制，适合按钮很多的分组）
+        self.use_icon_grid = QSettings("ProgramLauncher", "MainWindow").value("iconGrid", False, type=bool)
+        self.grid_btn.setChecked(self.use_icon_grid)
+        
+        # 后台启动队列（路径检查带超时，不阻塞界面）
+        launch_timeout = QSettings("ProgramLauncher", "MainWindow").value(
+            "launchTimeoutSeconds", LaunchDispatcher.DEFAULT_TIMEOUT, type=float)
+        self.path_resolver = PathResolver()
+        self.launch_dispatcher = LaunchDispatcher(launch_timeout, self.path_resolver, self)
+        self.launch_dispatcher.started.connect(self.on_launch_started)
+        self.launch_dispatcher.launched.connect(self.on_launch_succeeded)
+        self.launch_dispatcher.failed.connect(self.on_launch_failed)
+        self.launch_dispatcher.traced.connect(self.on_launch_traced)
+        
+        # 空闲时预读常用程序（按频率评分和当前时段的启动习惯）
+        settings = QSettings("ProgramLauncher", "MainWindow")
+        self.prefetcher = IdlePrefetcher(self.prefetch_candidates,
+                                         settings.value("prefetchTopN", 8, type=int),
+                                         settings.value("prefetchBudgetMB", 256, type=int), self)
+        if settings.value("prefetchEnabled", True, type=bool):
+            self.prefetcher.start()
+        
+        # 分阶段启动耗时统计（首次绘制后从数据库加载，随启动历史一起落盘）
+        self.latency_stats = LatencyStats()
+        
+        # 随启动器自动启动的按钮（数据加载完成后开始调度）
+        self.autostart_scheduler = AutostartScheduler(self.submit_autostart, parent=self)
+        
+        # 已启动进程登记表（按钮显示运行中标记，可设置为切换到已有窗口或不重复启动）
+        self.process_registry = ProcessRegistry()
+        self.process_timer = QTimer(self)
+        self.process_timer.timeout.connect(self.reap_processes)
+        self.process_timer.setInterval(2000)  # 有登记的进程时每2秒回收一次已退出的进程
         
-        # 加载窗口设置
+        # 后台路径健康扫描（首次绘制后加载已保存的结果，并定时复查到期的按钮）
+        self.health_scanner = HealthScanner(self.path_resolver, self)
+        self.health_scanner.results_ready.connect(self.on_health_results)
+        self.health_batch_size = 500  # 每次定时复查最多提交的按钮数
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self.schedule_health_checks)
+        self.health_timer.start(600000)  # 每10分钟检查一次到期的按钮
+        QTimer.singleShot(3000, self.start_health_checks)
+        
+        # 文件系统监视（程序目录、工作目录和图标），变化时只刷新受影响的按钮
+        self.catalog_watcher = CatalogWatcher(self)
+        self.catalog_watcher.paths_changed.connect(self.on_watched_paths_changed)
+        self.watch_index = {}  # 规范化路径 -> 相关按钮ID
+        self.icon_stamps = {}  # icon_path -> (mtime_ns, 文件大小)，用于判断图标是否真的变化
+        self.watch_sync_timer = QTimer(self)
+        self.watch_sync_timer.setSingleShot(True)
+        self.watch_sync_timer.setInterval(1000)
+        self.watch_sync_timer.timeout.connect(self.sync_watched_paths)
+        
+        # 快速启动面板的搜索索引（随目录增量更新）
+        self.search_index = SearchIndex()
+        
+        # 启动快照：存在时直接绘制，数据库校验推迟到首次绘制之后并在后台线程进行
+        self.scaled_icons = {}  # icon_path -> [预缩放图标路径, mtime_ns, 文件大小]
+        self.snapshot_version = None
         self.load_window_settings()
+        snapshot = CatalogSnapshot.read()
+        if snapshot is not None:
+            self.snapshot_version = snapshot.catalog_version
+            self.scaled_icons = snapshot.icons
+            self.launch_history.seed(snapshot.stats)
+            self.mark_startup_phase("读取快照")
+            self.load_data(snapshot.groups, snapshot.records)
+            self.mark_startup_phase("加载分组")
+            self._snapshot_checked.connect(self.on_snapshot_checked)
+            QTimer.singleShot(0, self.validate_catalog_snapshot)
+        else:
+            # 打开数据库（建表/迁移只在进程内首次实例化时执行）
+            db = DatabaseManager()
+            self.launch_history.load()
+            self.mark_startup_phase("打开数据库")
+            
+            # 先应用保存的标签页顺序，再只构建一次界面
+            self.load_data(self.apply_saved_tab_order(db))
+            self.mark_startup_phase("加载分组")
 
         # 添加剪贴板监控
         self.clipboard = QApplication.clipboard()
@@ -1173,6 +4578,19 @@ class MainWindow(QMainWindow):
         self.paste_action.setShortcut(QKeySequence("Ctrl+V"))
         self.paste_action.triggered.connect(self.handle_paste_shortcut)
         self.addAction(self.paste_action)
+        
+        # 快速启动面板（预先创建并隐藏，Ctrl+P 或实例请求呼出）
+        self.quick_palette = QuickLaunchPalette(self.search_index, self.launch_history.score,
+                                                self.group_name, self)
+        self.quick_palette.launch_requested.connect(self.launch_record)
+        self.palette_action = QAction(self)
+        self.palette_action.setShortcut(QKeySequence("Ctrl+P"))
+        self.palette_action.triggered.connect(self.show_quick_palette)
+        self.addAction(self.palette_action)
+        QTimer.singleShot(2000, self.search_index.warm)  # 空闲时预先计算拼音首字母
+        if snapshot is None:
+            QTimer.singleShot(0, self.start_autostart)  # 使用快照时在校验完成后开始，使用最新的按钮设置
+        QTimer.singleShot(0, self.load_latency_stats)
 
     def check_clipboard_for_executable(self):
         """检查剪贴板中是否有可执行文件或目录"""
@@ -1194,21 +4612,13 @@ class MainWindow(QMainWindow):
 
     def show_add_button_dialog_from_clipboard(self, path):
         """从剪贴板路径显示添加按钮对话框"""
-        current_index = self.tab_widget.currentIndex()
-        print(f"当前选中的分组索引: {current_index}")
-        if current_index == -1:
-            QMessageBox.warning(self, "警告", "请先选择一个分组!")
-            return
-        
         # 获取当前分组ID
-        db = DatabaseManager()
-        groups = db.get_groups()
-        print(f"当前分组列表: {groups}")
-        if not groups:
-            QMessageBox.warning(self, "错误", "没有可用的分组!")
+        group_id = self.current_group_id()
+        print(f"当前选中的分组: {group_id}")
+        if group_id is None:
+            QMessageBox.warning(self, "警告", "请先选择一个分组!")
             return
         
-        group_id = groups[current_index][0]
         name = os.path.splitext(os.path.basename(path))[0]
         print(f"从剪贴板添加按钮: {name}, 路径: {path}")
 
@@ -1263,7 +4673,7 @@ class MainWindow(QMainWindow):
         """搜索文本变化时的处理"""
         if not text.strip():
             # 如果搜索框为空，恢复原始视图
-            self.load_data()
+            self.refresh_catalog()
     
     def perform_search(self):
         """执行搜索"""
@@ -1271,6 +4681,7 @@ class MainWindow(QMainWindow):
         if not search_text:
             return
         
+        import pinyin  # 延迟导入，首次搜索时才加载
         db = DatabaseManager()
         results = []
         
@@ -1280,27 +4691,183 @@ class MainWindow(QMainWindow):
             # 匹配分组名称或拼音首字母
             if (search_text.lower() in group_name.lower() or 
                 search_text.lower() in pinyin.get_initial(group_name).lower()):
-                results.append(("分组", group_name, ""))
+                results.append(("分组", group_name, "", group_id))
         
-        # 搜索按钮
-        buttons = db.get_all_buttons()
-        for button_id, group_id, name, path, _, _, _, _, _, _ in buttons:
-            # 获取分组名称
-            group_name = next((g[1] for g in groups if g[0] == group_id), "未知分组")
-            
-            # 匹配按钮名称、路径或拼音首字母
-            if (search_text.lower() in name.lower() or 
-                search_text.lower() in path.lower() or 
-                search_text.lower() in pinyin.get_initial(name).lower()):
-                results.append(("按钮", name, f"{group_name} | {path}"))
+        # 搜索按钮（匹配按钮名称、路径或拼音首字母）
+        buttons = db.get_button_records()
+        for record in buttons:
+            if button_matches(record, search_text):
+                # 获取分组名称
+                group_name = next((g[1] for g in groups if g[0] == record.group_id), "未知分组")
+                results.append(("按钮", record.name, f"{group_name} | {record.path}", record))
+        
+        # 按钮结果按启动频率评分排序（常用的排在前面）
+        now = time.time()
+        group_results = [r for r in results if r[0] == "分组"]
+        button_results = sorted(
+            (r for r in results if r[0] == "按钮"),
+            key=lambda r: self.launch_history.score(r[3].id, now), reverse=True)
+        results = group_results + button_results
         
         if results:
             # 显示搜索结果对话框
             dialog = SearchResultDialog(results, self)
+            dialog.launch_requested.connect(self.launch_record)
+            dialog.group_requested.connect(self.select_group_tab)
             dialog.show()
         else:
             QMessageBox.information(self, "搜索结果", "没有找到匹配的项目")
     
+    def launch_record(self, record: ButtonRecord, silent: bool = False) -> Optional[LaunchRequest]:
+        """启动按钮记录对应的程序（带按钮的进程资源设置）"""
+        return self.launch_program(record.path, record.arguments, record.working_dir,
+                                   record.run_as_admin, record.id, silent,
+                                   ResourceLimits.from_record(record))
+    
+    def populate_profile_menu(self):
+        """展开"启动方案"菜单时重建菜单项"""
+        self.profile_menu.clear()
+        profiles = DatabaseManager().get_launch_profiles()
+        for profile_id, name, _ in profiles:
+            action = self.profile_menu.addAction(name)
+            action.triggered.connect(lambda checked, pid=profile_id: self.run_launch_profile(pid))
+        if profiles:
+            self.profile_menu.addSeparator()
+        self.profile_menu.addAction("新建启动方案...").triggered.connect(lambda: self.show_profile_editor())
+        if profiles:
+            edit_menu = self.profile_menu.addMenu("编辑")
+            delete_menu = self.profile_menu.addMenu("删除")
+            for profile_id, name, max_concurrent in profiles:
+                edit_menu.addAction(name).triggered.connect(
+                    lambda checked, p=(profile_id, name, max_concurrent): self.show_profile_editor(*p))
+                delete_menu.addAction(name).triggered.connect(
+                    lambda checked, pid=profile_id, n=name: self.delete_launch_profile(pid, n))
+    
+    def show_profile_editor(self, profile_id: Optional[int] = None, name: str = "", max_concurrent: int = 3):
+        """新建或编辑启动方案（批量模式下新建时预先加入已选中的按钮）"""
+        if profile_id is not None:
+            items = DatabaseManager().get_launch_profile_items(profile_id)
+        else:
+            items = [ProfileItem(button_id) for button_id in sorted(self.selected_buttons)]
+        dialog = ProfileEditor(self.button_index, self.group_name, profile_id, name, max_concurrent,
+                               items, parent=self)
+        dialog.exec_()
+    
+    def delete_launch_profile(self, profile_id: int, name: str):
+        reply = QMessageBox.question(
+            self, "确认删除", f"确定要删除启动方案 {name} 吗?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            DatabaseManager().delete_launch_profile(profile_id)
+    
+    def run_launch_profile(self, profile_id: int) -> Optional[ProfileRun]:
+        """按启动方案启动一组程序，并显示执行报告"""
+        profile = next((p for p in DatabaseManager().get_launch_profiles() if p[0] == profile_id), None)
+        if profile is None:
+            return None
+        _, name, max_concurrent = profile
+        items = [item for item in DatabaseManager().get_launch_profile_items(profile_id)
+                 if item.button_id in self.button_index]
+        if not items:
+            self.statusBar().showMessage(f"启动方案 {name} 中没有可启动的按钮", 5000)
+            return None
+        run = ProfileRun(name, ProfilePlan(items, max_concurrent), self.submit_profile_item,
+                         self.launch_dispatcher, self)
+        run.finished.connect(run.deleteLater)
+        dialog = ProfileRunDialog(run, self.button_index, self)
+        dialog.show()
+        run.start()
+        return run
+    
+    def start_autostart(self):
+        """开始调度随启动器自动启动的按钮（可通过设置 autostartEnabled=false 关闭，所属分组已删除的跳过）"""
+        if not QSettings("ProgramLauncher", "MainWindow").value("autostartEnabled", True, type=bool):
+            return
+        group_ids = {g[0] for g in self.groups}
+        self.autostart_scheduler.start(r for r in self.button_index.values() if r.group_id in group_ids)
+    
+    def submit_autostart(self, record: ButtonRecord) -> bool:
+        """自动启动一个按钮（使用最新的按钮记录，期间被删除或取消自动启动的跳过）"""
+        record = self.button_index.get(record.id)
+        if record is None or not record.autostart or record.group_id not in {g[0] for g in self.groups}:
+            return False
+        self.statusBar().showMessage(f"自动启动: {record.name}", 3000)
+        return self.launch_record(record, silent=True) is not None
+    
+    def submit_profile_item(self, button_id: int) -> Tuple[str, Optional[LaunchRequest], str]:
+        """提交启动方案中的一项，失败由执行报告汇总而不弹出对话框
+        
+        已在运行的项视为成功（依赖它的项照常启动）；已有同一按钮的启动在处理时跟随其结果。
+        """
+        record = self.button_index.get(button_id)
+        if record is None:
+            return ProfilePlan.SKIPPED, None, "按钮已删除"
+        request = self.launch_record(record, silent=True)
+        if request is not None:
+            return ProfilePlan.STARTING, request, ""
+        if self.process_registry.is_running(button_id):
+            return ProfilePlan.OK, None, "已在运行"
+        pending = LaunchRequest(record.path, button_id=record.id)
+        if self.launch_dispatcher.is_pending(pending):
+            return ProfilePlan.STARTING, pending, ""  # 结果按 key 匹配到正在处理的请求
+        return ProfilePlan.SKIPPED, None, "未能提交启动"
+    
+    def group_name(self, group_id: int) -> str:
+        """获取分组名称"""
+        return next((g[1] for g in self.groups if g[0] == group_id), "未知分组")
+    
+    def show_quick_palette(self):
+        """呼出快速启动面板"""
+        self.quick_palette.popup()
+    
+    def bring_to_front(self):
+        """显示并激活主窗口"""
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+    
+    def handle_instance_message(self, message: dict):
+        """处理其他进程转交的请求（延迟到事件循环中执行，避免在套接字回调里弹出对话框）"""
+        QTimer.singleShot(0, lambda: self.dispatch_instance_message(message))
+    
+    def dispatch_instance_message(self, message: dict):
+        """执行转交的请求: show / palette / add / launch / profile"""
+        action = message.get("action", "show")
+        print(f"[DEBUG] 收到实例请求: {message}")
+        if action == "show":
+            self.bring_to_front()
+        elif action == "palette":
+            self.show_quick_palette()
+        elif action == "add" and message.get("path"):
+            self.bring_to_front()
+            self.show_add_button_dialog_from_clipboard(message["path"])
+        elif action == "launch" and message.get("target") is not None:
+            record = find_button(self.button_index.values(), message["target"])
+            if record is None:
+                print(f"[ERROR] 未找到要启动的按钮: {message['target']}")
+                return
+            self.launch_record(record)
+        elif action == "profile" and message.get("name"):
+            profile = next((p for p in DatabaseManager().get_launch_profiles()
+                            if p[1] == message["name"]), None)
+            if profile is None:
+                print(f"[ERROR] 未找到启动方案: {message['name']}")
+                return
+            self.run_launch_profile(profile[0])
+        else:
+            print(f"[ERROR] 未知的实例请求: {message}")
+    
+    def select_group_tab(self, group_id: int):
+        """切换到指定分组的标签页"""
+        tab = self.registry.tab(group_id)
+        if tab is not None:
+            self.tab_widget.setCurrentWidget(tab)
+            self.raise_()
+            self.activateWindow()
+    
     def perform_backup(self):
         """执行数据库备份（带日志记录）"""
         db = DatabaseManager()
@@ -1344,56 +4911,101 @@ class MainWindow(QMainWindow):
         self.batch_btn.clicked.connect(self.toggle_batch_mode)
         control_layout.addWidget(self.batch_btn)
         
+        # 网格视图按钮
+        self.grid_btn = QPushButton("网格视图")
+        self.grid_btn.setCheckable(True)
+        self.grid_btn.setToolTip("使用虚拟化网格显示按钮，适合按钮很多的分组")
+        self.grid_btn.clicked.connect(self.toggle_icon_grid)
+        control_layout.addWidget(self.grid_btn)
+        
+        # 启动方案按钮（菜单在展开时从数据库读取）
+        self.profile_btn = QPushButton("启动方案")
+        self.profile_menu = QMenu(self.profile_btn)
+        self.profile_menu.aboutToShow.connect(self.populate_profile_menu)
+        self.profile_btn.setMenu(self.profile_menu)
+        control_layout.addWidget(self.profile_btn)
+        
+        # 启动耗时报告按钮
+        self.latency_btn = QPushButton("耗时报告")
+        self.latency_btn.setToolTip("查看各按钮启动各阶段耗时的 p50/p95，并可导出 CSV")
+        self.latency_btn.clicked.connect(self.show_latency_report)
+        control_layout.addWidget(self.latency_btn)
+        
         # 添加弹簧
         control_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         
         # 刷新按钮
         self.refresh_btn = QPushButton("刷新")
-        self.refresh_btn.clicked.connect(self.load_data)
+        self.refresh_btn.clicked.connect(self.refresh_catalog)
         control_layout.addWidget(self.refresh_btn)
         
         self.main_layout.addLayout(control_layout)
     
-    def toggle_batch_mode(self, checked):
-        """切换批量操作模式"""
-        self.batch_mode = checked
-        self.batch_btn.setStyleSheet("background-color: #FF9999" if checked else "")
-        self.selected_buttons.clear()
+    def toggle_batch_mode(self, checked):
+        """切换批量操作模式"""
+        self.batch_mode = checked
+        LauncherStyle.set_state(self.batch_btn, "batchActive", checked)
+        self.selected_buttons.clear()
+        
+        # 更新所有按钮的样式（通过注册表直接定位控件）
+        for button_id, btn in self.registry.all_widgets():
+            record = self.registry.metadata(button_id)
+            if record:
+                self.apply_button_style(btn, record)
+        
+        # 网格视图重绘选中状态
+        for view in self.registry.views():
+            view.model().refresh_all()
+    
+    def toggle_icon_grid(self, checked):
+        """切换网格视图模式"""
+        self.use_icon_grid = checked
+        QSettings("ProgramLauncher", "MainWindow").setValue("iconGrid", checked)
+        self.load_data()
+    
+    def mark_startup_phase(self, phase: str):
+        """记录启动阶段耗时（未启用启动计时时忽略）"""
+        if self.startup_timer is not None:
+            self.startup_timer.mark(phase)
+    
+    def load_data(self, groups: Optional[list] = None, records: Optional[List[ButtonRecord]] = None):
+        """加载分组和按钮数据（增强稳定性版本）
         
-        # 更新所有按钮的样式
-        for i in range(self.tab_widget.count()):
-            tab = self.tab_widget.widget(i)
-            scroll = tab.findChild(QScrollArea)
-            if scroll:
-                scroll_content = scroll.widget()
-                buttons_group = scroll_content.findChild(QGroupBox)
-                if buttons_group:
-                    for btn in buttons_group.findChildren(QPushButton):
-                        btn.setStyleSheet("")
-    
-    def load_data(self):
-        """加载分组和按钮数据（增强稳定性版本）"""
+        groups/records 为调用方已查询好（或从启动快照读取）的数据，传入时不再查询数据库。
+        """
         try:
             print("[DEBUG] 开始加载数据...")
             
-            # 清除现有标签页前先备份当前选中索引
+            # 清除现有标签页前先备份当前选中的分组
+            current_widget = self.tab_widget.currentWidget()
+            current_group = current_widget.property("group_id") if current_widget else None
             current_index = self.tab_widget.currentIndex()
             
-            # 清除现有标签页
+            # 清除现有标签页（期间切换标签不触发构建）
+            self.loading_tabs = True
+            self.prebuild_timer.stop()
             while self.tab_widget.count() > 0:
                 widget = self.tab_widget.widget(0)
                 self.tab_widget.removeTab(0)
                 if widget:
                     widget.deleteLater()
+            self.button_index.clear()
+            self.group_buttons.clear()
+            self.registry.clear()
+            self.tab_visits.clear()
+            self.frequent_ids = []
             
-            db = DatabaseManager()
-            groups = db.get_groups()
+            db = None
+            if groups is None:
+                db = DatabaseManager()
+                groups = db.get_groups()
             print(f"[DEBUG] 从数据库获取的分组: {groups}")
             
             if not groups:
                 print("[DEBUG] 没有分组，创建默认分组")
                 # 如果没有分组，添加一个默认分组
                 try:
+                    db = db or DatabaseManager()
                     default_group_id = db.add_group("默认分组")
                     # 再次尝试获取分组
                     groups = db.get_groups()
@@ -1404,21 +5016,42 @@ class MainWindow(QMainWindow):
                     # 创建内存中的临时分组
                     groups = [(1, "默认分组", 0, 0)]
             
-            # 按顺序添加分组标签页
-            for group_id, group_name, _, is_favorite in groups:
-                try:
-                    self.add_group_tab(group_id, group_name, is_favorite)
-                    print(f"[DEBUG] 成功添加分组标签页: {group_name}")
-                except Exception as e:
-                    print(f"[ERROR] 添加分组标签页失败: {group_name}, 错误: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+            # 一次性读取所有按钮并按分组归类（与 get_buttons 的行格式一致）
+            self.groups = list(groups)
+            if records is None:
+                records = (db or DatabaseManager()).get_button_records()
+            self.group_buttons, self.button_index = self.index_buttons(records)
+            group_ids = {g[0] for g in groups}
+            self.search_index.rebuild(r for r in records if r.group_id in group_ids)  # 不索引分组已删除的按钮
+            
+            # 按顺序添加分组标签页（只创建占位页，内容在首次显示时构建）
+            try:
+                for group_id, group_name, _, is_favorite in groups:
+                    try:
+                        self.add_group_tab(group_id, group_name, is_favorite)
+                    except Exception as e:
+                        print(f"[ERROR] 添加分组标签页失败: {group_name}, 错误: {str(e)}")
+                        import traceback
+                        traceback.print_exc()
+                
+                # 添加"常用"虚拟分组
+                self.refresh_frequent_tab()
+                
+                # 恢复之前选中的标签页（优先按分组ID定位）
+                restored = False
+                if current_group is not None and self.registry.tab(current_group) is not None:
+                    self.tab_widget.setCurrentWidget(self.registry.tab(current_group))
+                    restored = True
+                if not restored and current_index >= 0 and current_index < self.tab_widget.count():
+                    self.tab_widget.setCurrentIndex(current_index)
+            finally:
+                self.loading_tabs = False
             
-            # 恢复之前选中的标签页
-            if current_index >= 0 and current_index < self.tab_widget.count():
-                self.tab_widget.setCurrentIndex(current_index)
+            # 只构建当前可见的标签页，其余在空闲时预构建
+            self.materialize_tab(self.tab_widget.currentWidget())
+            self.schedule_tab_prebuild()
                 
-            print("[DEBUG] 数据加载完成")
+            print(f"[DEBUG] 数据加载完成，共 {len(groups)} 个分组")
             
         except Exception as e:
             print(f"[CRITICAL] 加载数据时发生严重错误: {str(e)}")
@@ -1426,6 +5059,7 @@ class MainWindow(QMainWindow):
             traceback.print_exc()
             
             # 尝试恢复基本功能
+            self.loading_tabs = False
             QMessageBox.warning(self, "错误", "加载数据时发生错误，正在尝试恢复...")
             self.tab_widget.clear()
             self.add_group_tab(1, "默认分组", False)
@@ -1433,152 +5067,560 @@ class MainWindow(QMainWindow):
 
     
     def add_group_tab(self, group_id: int, group_name: str, is_favorite: bool):
-        """添加分组标签页（增强稳定性版本）"""
+        """添加分组标签页占位页（内容在首次显示时由 materialize_tab 构建）"""
         try:
-            print(f"[DEBUG] 开始添加分组标签页: {group_name}")
-            
             tab = QWidget()
-            tab_layout = QVBoxLayout(tab)
-            
-            # 创建滚动区域
-            scroll = QScrollArea()
-            scroll.setWidgetResizable(True)
-            scroll_content = QWidget()
-            scroll_layout = QVBoxLayout(scroll_content)
+            tab.setProperty("group_id", group_id)
+            tab.setProperty("group_name", group_name)
+            tab.setProperty("is_favorite", bool(is_favorite))
+            tab.setProperty("materialized", False)
+            QVBoxLayout(tab)
             
-            # 添加分组标题和编辑按钮
-            try:
-                header_layout = QHBoxLayout()
+            # 添加标签页
+            self.tab_widget.addTab(tab, group_name)
+            self.registry.register_tab(group_id, tab)
+            if is_favorite:
+                self.tab_widget.tabBar().setTabTextColor(self.tab_widget.count()-1, QColor(255, 102, 0))
                 
-                # 收藏星标
-                favorite_icon = QLabel()
-                if is_favorite:
-                    try:
-                        favorite_icon.setPixmap(QIcon(":star.png").pixmap(16, 16))
-                    except:
-                        favorite_icon.setText("★")
-                header_layout.addWidget(favorite_icon)
-                
-                group_label = QLabel(f"<h2>{group_name}</h2>")
-                header_layout.addWidget(group_label)
-                
-                # 编辑分组按钮
-                edit_group_btn = QPushButton("编辑")
-                edit_group_btn.clicked.connect(lambda _, gid=group_id, name=group_name, fav=is_favorite: 
-                                            self.show_edit_group_dialog(gid, name, fav))
-                header_layout.addWidget(edit_group_btn)
-                
-                # 删除分组按钮
-                delete_group_btn = QPushButton("删除")
-                delete_group_btn.clicked.connect(lambda _, gid=group_id: self.delete_group(gid))
-                header_layout.addWidget(delete_group_btn)
-                
-                header_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
-                scroll_layout.addLayout(header_layout)
-            except Exception as e:
-                print(f"[ERROR] 创建分组标题失败: {str(e)}")
-                scroll_layout.addWidget(QLabel(f"<h2>{group_name}</h2>"))
+        except Exception as e:
+            print(f"[CRITICAL] 添加分组标签页时发生严重错误: {str(e)}")
+            import traceback
+            traceback.print_exc()
+    
+    def on_tab_changed(self, index: int):
+        """切换标签页时构建尚未构建的分组内容"""
+        if not self.loading_tabs:
+            tab = self.tab_widget.widget(index)
+            self.materialize_tab(tab)
+            self.touch_tab(tab)
+    
+    def touch_tab(self, tab: Optional[QWidget]):
+        """记录标签页的访问时间"""
+        if tab is None or not tab.property("materialized"):
+            return
+        group_id = tab.property("group_id")
+        if group_id is not None:
+            self.tab_visits[group_id] = time.time()
+            self.tab_visits.move_to_end(group_id)
+    
+    def evict_tab(self, group_id: int) -> bool:
+        """回收一个分组标签页的内容（当前页不回收）"""
+        self.tab_visits.pop(group_id, None)
+        tab = self.registry.tab(group_id)
+        if tab is None or not tab.property("materialized") or tab is self.tab_widget.currentWidget():
+            return False
+        self.clear_tab_contents(tab)
+        print(f"[DEBUG] 回收分组标签页: {tab.property('group_name')}")
+        return True
+    
+    def enforce_tab_budget(self):
+        """已构建的标签页超过上限时，按最久未访问的顺序回收"""
+        current = self.tab_widget.currentWidget()
+        current_group = current.property("group_id") if current is not None else None
+        for group_id in list(self.tab_visits):
+            if len(self.tab_visits) <= self.max_materialized_tabs:
+                break
+            if group_id != current_group:
+                self.evict_tab(group_id)
+    
+    def evict_idle_tabs(self):
+        """回收长时间未访问的标签页，并检查数量上限"""
+        if self.tab_idle_seconds > 0:
+            deadline = time.time() - self.tab_idle_seconds
+            current = self.tab_widget.currentWidget()
+            current_group = current.property("group_id") if current is not None else None
+            for group_id, visited in list(self.tab_visits.items()):
+                if visited >= deadline:
+                    break  # 按访问时间排序，后面的都更新
+                if group_id != current_group:
+                    self.evict_tab(group_id)
+        self.enforce_tab_budget()
+    
+    def schedule_tab_prebuild(self):
+        """在空闲时逐个预构建其余标签页"""
+        if QSettings("ProgramLauncher", "MainWindow").value("prebuildTabs", True, type=bool):
+            self.prebuild_timer.start()
+    
+    def prebuild_next_tab(self):
+        """空闲时构建下一个尚未构建的标签页，全部完成或达到数量上限后停止定时器"""
+        if len(self.tab_visits) >= self.max_materialized_tabs:
+            self.prebuild_timer.stop()
+            return
+        for i in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(i)
+            if tab.property("group_id") is not None and not tab.property("materialized"):
+                self.materialize_tab(tab)
+                return
+        self.prebuild_timer.stop()
+    
+    def materialize_tab(self, tab: Optional[QWidget]):
+        """构建分组标签页的内容（滚动区域、标题、按钮）"""
+        if tab is None or tab.property("materialized") or tab.property("group_id") is None:
+            return
+        tab.setProperty("materialized", True)
+        self.tab_visits[tab.property("group_id")] = time.time()
+        self.tab_visits.move_to_end(tab.property("group_id"))
+        self.enforce_tab_budget()
+        group_id = tab.property("group_id")
+        group_name = tab.property("group_name")
+        is_favorite = tab.property("is_favorite")
+        # 所有内容放在一个容器中，便于整体重建
+        content = QWidget()
+        tab_layout = QVBoxLayout(content)
+        tab_layout.setContentsMargins(0, 0, 0, 0)
+        tab.layout().addWidget(content)
+        try:
+            print(f"[DEBUG] 开始构建分组标签页: {group_name}")
             
             # 添加按钮区域
             try:
-                buttons_group = QGroupBox()
-                buttons_layout = FlowLayout()
-                buttons_group.setLayout(buttons_layout)
-                
-                db = DatabaseManager()
-                buttons = db.get_buttons(group_id)
+                buttons = self.group_buttons.get(group_id, [])
                 print(f"[DEBUG] 分组 {group_name} 的按钮数量: {len(buttons)}")
                 
-                if not buttons:
-                    # 如果没有按钮，显示提示信息
-                    no_buttons_label = QLabel('此分组没有按钮，点击右上角的"添加按钮"来添加。')
-                    no_buttons_label.setAlignment(Qt.AlignCenter)
-                    buttons_layout.addWidget(no_buttons_label)
+                if self.use_icon_grid and buttons:
+                    # 网格视图: 自带滚动，只绘制可见单元格
+                    tab_layout.addLayout(self.create_group_header(group_id, group_name, is_favorite))
+                    tab_layout.addWidget(self.create_button_grid(buttons, group_id))
                 else:
-                    # 添加所有按钮
-                    for button_data in buttons:
-                        try:
-                            (button_id, name, path, args, working_dir, 
-                            run_as_admin, icon_path, _, is_favorite) = button_data
-                            
-                            btn = QToolButton()
-                            btn.setText(name)
-                            btn.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
-                            btn.setToolTip(f"路径: {path}\n参数: {args}\n工作目录: {working_dir}")
-                            
-                            # 设置按钮固定大小
-                            btn.setFixedSize(120, 60)
-                            
-                            # 设置按钮图标
-                            if icon_path and os.path.exists(icon_path):
-                                try:
-                                    btn.setIcon(QIcon(icon_path))
-                                    btn.setIconSize(QSize(32, 32))
-                                except:
-                                    print(f"[WARNING] 无法加载图标: {icon_path}")
-                            
-                            # 如果是收藏的按钮，添加星标
-                            if is_favorite:
-                                btn.setStyleSheet("font-weight: bold; color: #FF6600;")
-                            
-                            # 如果是管理员权限运行，添加特殊样式
-                            if run_as_admin:
-                                btn.setStyleSheet(btn.styleSheet() + "border: 1px solid red;")
-                            
-                            # 按钮点击事件
-                            if not self.batch_mode:
-                                btn.clicked.connect(lambda _, p=path, a=args, wd=working_dir, ra=run_as_admin: 
-                                                self.launch_program(p, a, wd, ra))
-                            else:
-                                btn.clicked.connect(lambda _, bid=button_id, b=btn: 
-                                                self.toggle_button_selection(bid, b))
-                            
-                            # 按钮上下文菜单
-                            btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                            btn.customContextMenuRequested.connect(
-                                lambda pos, bid=button_id, gid=group_id, n=name, p=path, 
-                                    a=args, wd=working_dir, ra=run_as_admin, ip=icon_path, fav=is_favorite: 
-                                self.show_button_context_menu(pos, bid, gid, n, p, a, wd, ra, ip, fav))
-                            
-                            buttons_layout.addWidget(btn)
-                        except Exception as e:
-                            print(f"[ERROR] 创建按钮失败: {name}, 错误: {str(e)}")
-                            continue
+                    # 创建滚动区域
+                    scroll = QScrollArea()
+                    scroll.setWidgetResizable(True)
+                    scroll_content = QWidget()
+                    scroll_layout = QVBoxLayout(scroll_content)
+                    scroll_layout.addLayout(self.create_group_header(group_id, group_name, is_favorite))
                     
-                scroll_layout.addWidget(buttons_group)
-                scroll_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
-                
-                scroll.setWidget(scroll_content)
-                tab_layout.addWidget(scroll)
-                
-                # 添加标签页
-                self.tab_widget.addTab(tab, group_name)
-                if is_favorite:
-                    self.tab_widget.tabBar().setTabTextColor(self.tab_widget.count()-1, QColor(255, 102, 0))
+                    buttons_group = QGroupBox()
+                    buttons_layout = FlowLayout()
+                    buttons_group.setLayout(buttons_layout)
                     
-                print(f"[DEBUG] 成功添加分组标签页: {group_name}")
+                    if not buttons:
+                        # 如果没有按钮，显示提示信息
+                        no_buttons_label = QLabel('此分组没有按钮，点击右上角的"添加按钮"来添加。')
+                        no_buttons_label.setAlignment(Qt.AlignCenter)
+                        buttons_layout.addWidget(no_buttons_label)
+                    else:
+                        # 添加所有按钮（记录控件以便增量更新）
+                        self.registry.register_flow(group_id, buttons_layout)
+                        for record in buttons:
+                            try:
+                                btn = self.create_program_button(record)
+                                self.registry.register_button(group_id, btn, record)
+                                buttons_layout.addWidget(btn)
+                            except Exception as e:
+                                print(f"[ERROR] 创建按钮失败: {record.name}, 错误: {str(e)}")
+                                continue
+                        
+                    scroll_layout.addWidget(buttons_group)
+                    scroll_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+                    
+                    scroll.setWidget(scroll_content)
+                    tab_layout.addWidget(scroll)
+                    
+                print(f"[DEBUG] 成功构建分组标签页: {group_name}")
                 
             except Exception as e:
                 print(f"[ERROR] 创建按钮区域失败: {str(e)}")
                 error_label = QLabel(f"无法加载按钮: {str(e)}")
                 error_label.setAlignment(Qt.AlignCenter)
                 tab_layout.addWidget(error_label)
-                self.tab_widget.addTab(tab, group_name)
                 
         except Exception as e:
-            print(f"[CRITICAL] 添加分组标签页时发生严重错误: {str(e)}")
+            print(f"[CRITICAL] 构建分组标签页时发生严重错误: {str(e)}")
             import traceback
             traceback.print_exc()
-
     
-    def toggle_button_selection(self, button_id: int, button: QPushButton):
-        """切换按钮的选择状态"""
+    def create_group_header(self, group_id: int, group_name: str, is_favorite: bool) -> QHBoxLayout:
+        """创建分组标题和编辑按钮"""
+        header_layout = QHBoxLayout()
+        try:
+            # 收藏星标
+            favorite_icon = QLabel()
+            if is_favorite:
+                try:
+                    favorite_icon.setPixmap(QIcon(":star.png").pixmap(16, 16))
+                except:
+                    favorite_icon.setText("★")
+            header_layout.addWidget(favorite_icon)
+            
+            group_label = QLabel(f"<h2>{group_name}</h2>")
+            header_layout.addWidget(group_label)
+            
+            # 编辑分组按钮
+            edit_group_btn = QPushButton("编辑")
+            edit_group_btn.clicked.connect(lambda _, gid=group_id, name=group_name, fav=is_favorite: 
+                                        self.show_edit_group_dialog(gid, name, fav))
+            header_layout.addWidget(edit_group_btn)
+            
+            # 删除分组按钮
+            delete_group_btn = QPushButton("删除")
+            delete_group_btn.clicked.connect(lambda _, gid=group_id: self.delete_group(gid))
+            header_layout.addWidget(delete_group_btn)
+            
+            header_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+        except Exception as e:
+            print(f"[ERROR] 创建分组标题失败: {str(e)}")
+            header_layout.addWidget(QLabel(f"<h2>{group_name}</h2>"))
+        return header_layout
+    
+    def create_button_grid(self, records: List[ButtonRecord], key) -> ButtonGridView:
+        """创建虚拟化按钮网格，key 为注册表容器键"""
+        view = ButtonGridView(ButtonGridModel(records, self.selected_buttons, icon_file=self.icon_file,
+                                              tooltip=self.button_tooltip, health=self.health_message,
+                                              running=self.process_registry.is_running))
+        view.clicked.connect(self.on_grid_clicked)
+        view.customContextMenuRequested.connect(self.on_grid_context_menu)
+        self.registry.register_view(key, view)
+        return view
+    
+    def on_grid_clicked(self, index):
+        """网格视图点击"""
+        record = index.data(ButtonGridModel.RecordRole)
+        if record is not None:
+            self.activate_record(record)
+    
+    def on_grid_context_menu(self, pos):
+        """网格视图上下文菜单"""
+        index = self.sender().indexAt(pos)
+        if index.isValid():
+            self.show_button_context_menu(pos, index.data(ButtonGridModel.RecordRole))
+    
+    def create_program_button(self, record: ButtonRecord) -> QToolButton:
+        """根据按钮记录创建程序按钮（控件只保存按钮ID，事件统一分发）"""
+        btn = QToolButton()
+        btn.setProperty("launcherButton", True)
+        btn.setProperty("button_id", record.id)
+        btn.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
+        
+        # 设置按钮固定大小
+        btn.setFixedSize(120, 60)
+        
+        # 按钮点击事件和上下文菜单
+        btn.clicked.connect(self.on_program_button_clicked)
+        btn.setContextMenuPolicy(Qt.CustomContextMenu)
+        btn.customContextMenuRequested.connect(self.on_program_button_context_menu)
+        
+        self.bind_program_button(btn, record)
+        return btn
+    
+    def bind_program_button(self, btn: QToolButton, record: ButtonRecord):
+        """将按钮记录应用到已有的程序按钮（创建和增量更新共用）"""
+        btn.setText(record.name)
+        btn.setToolTip(self.button_tooltip(record))
+        
+        # 设置按钮图标（优先使用快照中的预缩放图标）
+        icon_file = self.icon_file(record.icon_path)
+        if icon_file:
+            try:
+                btn.setIcon(QIcon(icon_file))
+                btn.setIconSize(QSize(32, 32))
+            except:
+                print(f"[WARNING] 无法加载图标: {record.icon_path}")
+        else:
+            btn.setIcon(QIcon())
+        
+        self.apply_button_style(btn, record)
+    
+    def on_program_button_clicked(self):
+        """所有程序按钮共用的点击分发"""
+        record = self.button_index.get(self.sender().property("button_id"))
+        if record is not None:
+            self.activate_record(record)
+    
+    def on_program_button_context_menu(self, pos):
+        """所有程序按钮共用的上下文菜单分发"""
+        record = self.button_index.get(self.sender().property("button_id"))
+        if record is not None:
+            self.show_button_context_menu(pos, record)
+    
+    def activate_record(self, record: ButtonRecord):
+        """点击按钮: 批量模式下切换选择，否则启动程序"""
+        if self.batch_mode:
+            self.toggle_button_selection(record.id)
+        else:
+            self.launch_record(record)
+    
+    def apply_button_style(self, btn: QToolButton, record: ButtonRecord):
+        """根据收藏、管理员权限、路径状态、运行状态和批量选择状态设置按钮的样式属性（由全局样式表匹配）"""
+        LauncherStyle.set_state(btn, "favorite", record.is_favorite)
+        LauncherStyle.set_state(btn, "admin", record.run_as_admin)
+        LauncherStyle.set_state(btn, "broken", self.health_message(record.id) is not None)
+        LauncherStyle.set_state(btn, "running", self.process_registry.is_running(record.id))
+        LauncherStyle.set_state(btn, "selected", record.id in self.selected_buttons)
+    
+    @staticmethod
+    def index_buttons(records: List[ButtonRecord]) -> Tuple[Dict[int, List[ButtonRecord]], Dict[int, ButtonRecord]]:
+        """将按钮记录按分组归类，并建立按钮ID索引"""
+        group_buttons = {}
+        button_index = {}
+        for record in records:
+            group_buttons.setdefault(record.group_id, []).append(record)
+            button_index[record.id] = record
+        return group_buttons, button_index
+    
+    def refresh_catalog(self, catalog: Optional[Tuple[list, List[ButtonRecord]]] = None):
+        """重新读取数据库（或使用已在后台读取的 (分组, 按钮记录)），与当前快照比较后只更新有变化的部分"""
+        try:
+            if catalog is None:
+                db = DatabaseManager()
+                catalog = (db.get_groups(), db.get_button_records())
+            groups, records = catalog
+            if not groups or not self.groups:
+                self.load_data()
+                return
+            old_buttons = self.group_buttons
+            old_index = self.button_index
+            self.group_buttons, self.button_index = self.index_buttons(records)
+            
+            changed_groups = [gid for gid in set(old_buttons) | set(self.group_buttons)
+                              if old_buttons.get(gid, []) != self.group_buttons.get(gid, [])]
+            changed_buttons = {bid for bid in set(old_index) | set(self.button_index)
+                               if old_index.get(bid) != self.button_index.get(bid)}
+            group_ids = {g[0] for g in groups}
+            for button_id in changed_buttons:
+                record = self.button_index.get(button_id)
+                if record is not None and record.group_id in group_ids:
+                    self.search_index.update(record)
+                else:
+                    self.search_index.remove(button_id)
+                if record is None:
+                    self.path_health.pop(button_id, None)
+            for group_id in {g[0] for g in self.groups} - group_ids:  # 已删除分组中未变化的按钮
+                for record in self.group_buttons.get(group_id, []):
+                    self.search_index.remove(record.id)
+            # 新增或修改过的按钮立即重新检查路径
+            self.health_scanner.scan([self.button_index[bid] for bid in changed_buttons
+                                      if bid in self.button_index])
+            if changed_buttons:
+                self.watch_sync_timer.start()
+            
+            current_tab = self.tab_widget.currentWidget()
+            self.loading_tabs = True
+            try:
+                self.reconcile_groups(groups)
+                self.reconcile_group_buttons(changed_groups, old_buttons)
+                # 被删除的标签页是当前页时，尽量保持原来的位置
+                if current_tab is not None and self.tab_widget.indexOf(current_tab) >= 0:
+                    self.tab_widget.setCurrentWidget(current_tab)
+            finally:
+                self.loading_tabs = False
+            
+            self.materialize_tab(self.tab_widget.currentWidget())
+            self.refresh_frequent_tab(force=bool(changed_buttons & set(self.frequent_ids)))
+            print(f"[DEBUG] 增量刷新完成: {len(changed_groups)} 个分组、{len(changed_buttons)} 个按钮有变化")
+        except Exception as e:
+            print(f"[ERROR] 增量刷新失败，改为完整重建: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            self.load_data()
+    
+    def reconcile_groups(self, groups: List[Tuple[int, str, int, int]]):
+        """同步分组标签页: 删除、新增、改名/收藏变化和排序"""
+        old_groups = {g[0]: g for g in self.groups}
+        new_ids = [g[0] for g in groups]
+        self.groups = list(groups)
+        
+        # 删除已不存在的分组
+        for group_id in set(old_groups) - set(new_ids):
+            tab = self.registry.unregister_tab(group_id)
+            if tab is not None:
+                self.tab_widget.removeTab(self.tab_widget.indexOf(tab))
+                tab.deleteLater()
+            self.registry.clear_container(group_id)
+            self.tab_visits.pop(group_id, None)
+        
+        for group_id, group_name, _, is_favorite in groups:
+            old = old_groups.get(group_id)
+            if old is None:
+                self.add_group_tab(group_id, group_name, is_favorite)
+            elif (old[1], bool(old[3])) != (group_name, bool(is_favorite)):
+                # 名称或收藏状态变化: 更新标签和标题
+                tab = self.registry.tab(group_id)
+                index = self.tab_widget.indexOf(tab)
+                tab.setProperty("group_name", group_name)
+                tab.setProperty("is_favorite", bool(is_favorite))
+                self.tab_widget.setTabText(index, group_name)
+                self.tab_widget.tabBar().setTabTextColor(
+                    index, QColor(255, 102, 0) if is_favorite else QColor())
+                if tab.property("materialized"):
+                    self.rebuild_tab(tab)
+        
+        # 按数据库顺序排列标签页（"常用"虚拟分组保持在最前）
+        offset = 1 if self.tab_widget.count() and self.tab_widget.widget(0).property("virtual_group") else 0
+        for position, group_id in enumerate(new_ids, offset):
+            index = self.tab_widget.indexOf(self.registry.tab(group_id))
+            if index != position:
+                self.tab_widget.tabBar().moveTab(index, position)
+    
+    def reconcile_group_buttons(self, changed_groups: List[int], old_buttons: Dict[int, List[ButtonRecord]]):
+        """只更新按钮有变化的已构建分组: 更新单个按钮、在分组间移动按钮或重新排序"""
+        pool = {}  # 离开原分组、可被其他分组复用的按钮控件
+        pending = []
+        for group_id in changed_groups:
+            tab = self.registry.tab(group_id)
+            if tab is None or not tab.property("materialized"):
+                continue
+            old_list = old_buttons.get(group_id, [])
+            new_list = self.group_buttons.get(group_id, [])
+            
+            if self.use_icon_grid and old_list and new_list:
+                # 网格视图只需替换模型数据
+                view = self.registry.view(group_id)
+                if view is not None:
+                    view.model().set_records(new_list)
+                    continue
+            
+            flow = self.registry.flow(group_id)
+            if flow is None or not new_list:
+                # 空分组与非空分组之间切换，结构不同，直接重建该页
+                self.rebuild_tab(tab)
+                continue
+            
+            new_ids = {record.id for record in new_list}
+            for button_id in list(self.registry.container(group_id)):
+                if button_id not in new_ids:
+                    btn = self.registry.unregister_button(group_id, button_id)
+                    flow.removeWidget(btn)
+                    pool[button_id] = btn
+            pending.append((group_id, flow, {record.id: record for record in old_list}, new_list))
+        
+        for group_id, flow, old_by_id, new_list in pending:
+            new_order = [record.id for record in new_list]
+            widgets = self.registry.container(group_id)
+            layout_changed = list(widgets) != new_order
+            for record in new_list:
+                btn = widgets.get(record.id)
+                if btn is None:
+                    btn = pool.pop(record.id, None)
+                    if btn is None:
+                        btn = self.create_program_button(record)
+                    else:
+                        self.bind_program_button(btn, record)
+                    self.registry.register_button(group_id, btn, record)
+                elif old_by_id.get(record.id) != record:
+                    self.bind_program_button(btn, record)
+                    self.registry.update_metadata(record)
+            
+            if layout_changed:
+                # 重新排列该分组的流式布局（复用现有控件）
+                widgets = self.registry.container(group_id)
+                for button_id in new_order:
+                    flow.removeWidget(widgets[button_id])
+                for button_id in new_order:
+                    flow.addWidget(widgets[button_id])
+                    widgets[button_id].show()
+                self.registry.set_container_order(group_id, new_order)
+        
+        for btn in pool.values():
+            btn.deleteLater()
+    
+    def clear_tab_contents(self, tab: QWidget):
+        """删除已构建标签页的内容，恢复为占位页"""
+        group_id = tab.property("group_id")
+        layout = tab.layout()
+        while layout.count():
+            item = layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self.registry.clear_container(group_id)
+        self.tab_visits.pop(group_id, None)
+        tab.setProperty("materialized", False)
+    
+    def rebuild_tab(self, tab: QWidget):
+        """重建单个标签页并保持滚动位置"""
+        scroll = tab.findChild(QAbstractScrollArea)
+        position = scroll.verticalScrollBar().value() if scroll else 0
+        self.clear_tab_contents(tab)
+        self.materialize_tab(tab)
+        scroll = tab.findChild(QAbstractScrollArea)
+        if scroll:
+            QTimer.singleShot(0, lambda s=scroll, v=position: s.verticalScrollBar().setValue(v))
+    
+    def current_group_id(self) -> Optional[int]:
+        """获取当前标签页对应的分组ID（虚拟分组返回None）"""
+        widget = self.tab_widget.currentWidget()
+        if widget is None:
+            return None
+        return widget.property("group_id")
+    
+    def refresh_frequent_tab(self, force: bool = False):
+        """根据内存中的频率评分更新"常用"虚拟分组（不重新查询历史）"""
+        frequent_ids = [bid for bid in self.launch_history.top(LaunchHistory.FREQUENT_LIMIT * 2)
+                        if bid in self.button_index and self.launch_history.score(bid) > 0.01]
+        frequent_ids = frequent_ids[:LaunchHistory.FREQUENT_LIMIT]
+        if frequent_ids == self.frequent_ids and not force:
+            return
+        self.frequent_ids = frequent_ids
+        
+        # 移除旧的"常用"标签页
+        was_current = False
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if widget.property("virtual_group"):
+                was_current = self.tab_widget.currentIndex() == i
+                self.tab_widget.removeTab(i)
+                widget.deleteLater()
+                break
+        self.registry.clear_container(WidgetRegistry.FREQUENT)
+        
+        if not frequent_ids:
+            return
+        
+        tab = QWidget()
+        tab.setProperty("virtual_group", True)
+        tab_layout = QVBoxLayout(tab)
+        if self.use_icon_grid:
+            tab_layout.addWidget(QLabel("<h2>常用</h2>"))
+            tab_layout.addWidget(self.create_button_grid(
+                [self.button_index[button_id] for button_id in frequent_ids], WidgetRegistry.FREQUENT))
+        else:
+            scroll = QScrollArea()
+            scroll.setWidgetResizable(True)
+            scroll_content = QWidget()
+            scroll_layout = QVBoxLayout(scroll_content)
+            scroll_layout.addWidget(QLabel("<h2>常用</h2>"))
+            
+            buttons_group = QGroupBox()
+            buttons_layout = FlowLayout()
+            buttons_group.setLayout(buttons_layout)
+            self.registry.register_flow(WidgetRegistry.FREQUENT, buttons_layout)
+            for button_id in frequent_ids:
+                record = self.button_index[button_id]
+                try:
+                    btn = self.create_program_button(record)
+                    self.registry.register_button(WidgetRegistry.FREQUENT, btn, record)
+                    buttons_layout.addWidget(btn)
+                except Exception as e:
+                    print(f"[ERROR] 创建常用按钮失败: {record.name}, 错误: {str(e)}")
+            
+            scroll_layout.addWidget(buttons_group)
+            scroll_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+            scroll.setWidget(scroll_content)
+            tab_layout.addWidget(scroll)
+        
+        self.tab_widget.insertTab(0, tab, "常用")
+        self.tab_widget.tabBar().setTabTextColor(0, QColor(255, 102, 0))
+        if was_current:
+            self.tab_widget.setCurrentIndex(0)
+    
+    def flush_launch_history(self):
+        """将缓冲的启动历史批量写入数据库"""
+        written = self.launch_history.flush()
+        if written:
+            print(f"[DEBUG] 已写入 {written} 条启动历史")
+        self.latency_stats.flush()
+    
+    def toggle_button_selection(self, button_id: int):
+        """切换按钮的选择状态（同步更新该按钮在所有标签页中的控件）"""
         if button_id in self.selected_buttons:
             self.selected_buttons.remove(button_id)
-            button.setStyleSheet("")
         else:
             self.selected_buttons.add(button_id)
-            button.setStyleSheet("background-color: #99CCFF")
+        record = self.registry.metadata(button_id)
+        if record:
+            for btn in self.registry.widgets(button_id):
+                self.apply_button_style(btn, record)
+        for view in self.registry.views():
+            view.model().refresh_all()
     
     def show_add_group_dialog(self):
         """显示添加分组对话框"""
@@ -1601,41 +5643,38 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             db = DatabaseManager()
-            db.delete_group(group_id)
-            self.load_data()
+            for button_id in db.delete_group(group_id):
+                self.launch_history.forget(button_id)
+                self.latency_stats.forget(button_id)
+                self.process_registry.forget_button(button_id)
+            self.refresh_catalog()
     
     def show_add_button_dialog(self):
         """显示添加按钮对话框"""
-        current_index = self.tab_widget.currentIndex()
-        if current_index == -1:
-            QMessageBox.warning(self, "警告", "请先选择一个分组!")
-            return
-        
         # 获取当前分组ID
-        db = DatabaseManager()
-        groups = db.get_groups()
-        if not groups:
-            QMessageBox.warning(self, "错误", "没有可用的分组!")
+        group_id = self.current_group_id()
+        if group_id is None:
+            QMessageBox.warning(self, "警告", "请先选择一个分组!")
             return
         
-        group_id = groups[current_index][0]
         dialog = ButtonEditor(group_id=group_id, parent=self)
         dialog.setWindowFlags(dialog.windowFlags() | Qt.WindowStaysOnTopHint)
         if dialog.exec_() == QDialog.Accepted:
             # 添加短暂延迟确保数据库写入完成
-            QTimer.singleShot(100, self.load_data)
+            QTimer.singleShot(100, self.refresh_catalog)
 
         
     
     def show_edit_button_dialog(self, button_id: int, name: str, path: str, 
                               arguments: str, working_dir: str, 
-                              run_as_admin: bool, icon_path: str, is_favorite: bool):
+                              run_as_admin: bool, icon_path: str, is_favorite: bool,
+                              launch_options: Optional[Dict[str, object]] = None):
         """显示编辑按钮对话框"""
         dialog = ButtonEditor(
             button_id=button_id, name=name, path=path, 
             arguments=arguments, working_dir=working_dir, 
             run_as_admin=run_as_admin, icon_path=icon_path, 
-            is_favorite=is_favorite, parent=self
+            is_favorite=is_favorite, parent=self, launch_options=launch_options
         )
         dialog.setWindowFlags(dialog.windowFlags() | Qt.WindowStaysOnTopHint)
         dialog.exec_()
@@ -1650,13 +5689,14 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             db = DatabaseManager()
             db.delete_button(button_id)
-            self.load_data()
+            self.launch_history.forget(button_id)
+            self.latency_stats.forget(button_id)
+            self.process_registry.forget_button(button_id)
+            self.refresh_catalog()
     
-    def show_button_context_menu(self, pos, button_id: int, group_id: int, 
-                               name: str, path: str, arguments: str, 
-                               working_dir: str, run_as_admin: bool, 
-                               icon_path: str, is_favorite: bool):
+    def show_button_context_menu(self, pos, record: ButtonRecord):
         """显示按钮的上下文菜单"""
+        button_id, group_id, is_favorite = record.id, record.group_id, record.is_favorite
         # 创建菜单
         menu = QMenu(self)
         
@@ -1664,8 +5704,9 @@ class MainWindow(QMainWindow):
         edit_action = menu.addAction("编辑")
         edit_action.triggered.connect(
             lambda: self.show_edit_button_dialog(
-                button_id, name, path, arguments, 
-                working_dir, run_as_admin, icon_path, is_favorite))
+                button_id, record.name, record.path, record.arguments, 
+                record.working_dir, record.run_as_admin, record.icon_path, is_favorite,
+                record.launch_options()))
         
         # 收藏/取消收藏动作
         favorite_text = "取消收藏" if is_favorite else "收藏"
@@ -1705,20 +5746,23 @@ class MainWindow(QMainWindow):
         delete_action.triggered.connect(
             lambda: self.delete_button(button_id))
         
-        # 显示菜单
-        menu.exec_(self.sender().mapToGlobal(pos))
+        # 显示菜单（滚动视图的坐标相对于视口）
+        sender = self.sender()
+        if isinstance(sender, QAbstractScrollArea):
+            sender = sender.viewport()
+        menu.exec_(sender.mapToGlobal(pos))
     
     def toggle_button_favorite(self, button_id: int, is_favorite: bool):
         """切换按钮收藏状态"""
         db = DatabaseManager()
         db.toggle_button_favorite(button_id, is_favorite)
-        self.load_data()
+        self.refresh_catalog()
     
     def move_button_to_group(self, button_id: int, target_group_id: int):
         """移动按钮到另一个分组"""
         db = DatabaseManager()
         db.move_buttons_to_group([button_id], target_group_id)
-        self.load_data()
+        self.refresh_catalog()
     
     def batch_move_buttons(self, target_group_id: int):
         """批量移动按钮到另一个分组"""
@@ -1735,7 +5779,7 @@ class MainWindow(QMainWindow):
             db = DatabaseManager()
             db.move_buttons_to_group(list(self.selected_buttons), target_group_id)
             self.toggle_batch_mode(False)  # 退出批量模式
-            self.load_data()
+            self.refresh_catalog()
     
     def batch_delete_buttons(self):
         """批量删除按钮"""
@@ -1752,95 +5796,413 @@ class MainWindow(QMainWindow):
             db = DatabaseManager()
             for button_id in self.selected_buttons:
                 db.delete_button(button_id)
+                self.launch_history.forget(button_id)
+                self.latency_stats.forget(button_id)
+                self.process_registry.forget_button(button_id)
             self.toggle_batch_mode(False)  # 退出批量模式
-            self.load_data()
+            self.refresh_catalog()
     
-    def launch_program(self, path: str, arguments: str = "", working_dir: str = "", run_as_admin: bool = False):
-        """启动指定程序或打开目录"""
-        try:
-            # 预处理路径 - 替换正斜杠为反斜杠，并去除多余的引号
-            path = path.replace('/', '\\').strip('"\'')
-            
-            # 预处理工作目录
-            if working_dir:
-                working_dir = working_dir.replace('/', '\\').strip('"\'')
-            
-            # 检查路径是否存在
-            if not os.path.exists(path):
-                # 尝试重新映射网络驱动器
-                if path.startswith('\\\\'):
-                    # 网络路径，尝试直接访问
-                    pass
-                elif ':/' in path or ':\\' in path:
-                    # 映射驱动器路径，尝试重新连接
-                    QMessageBox.warning(self, "警告", f"路径 {path} 不可访问，请检查网络连接或驱动器映射")
-                    return
-                else:
-                    QMessageBox.warning(self, "警告", f"路径 {path} 不存在")
-                    return
-
-            if os.path.isdir(path):  # 如果是目录
-                os.startfile(path)  # 使用系统默认方式打开目录
-                return
-
-            if sys.platform == "win32":
-                if run_as_admin:
-                    # 以管理员权限运行
-                    from win32com.shell import shell
-                    from win32com.shell.shell import ShellExecuteEx
-                    from win32com.shell import shellcon
-                    
-                    params = arguments if arguments else ""
-                    working_dir = working_dir if working_dir else os.path.dirname(path)
-                    
-                    # 确保工作目录存在
-                    if working_dir and not os.path.exists(working_dir):
-                        working_dir = None
-                    
-                    ShellExecuteEx(
-                        nShow=win32con.SW_SHOWNORMAL,
-                        fMask=shellcon.SEE_MASK_NOCLOSEPROCESS,
-                        lpVerb='runas',
-                        lpFile=path,
-                        lpParameters=params,
-                        lpDirectory=working_dir
-                    )
-                else:
-                    # 普通方式运行
-                    params = arguments if arguments else ""
-                    working_dir = working_dir if working_dir else os.path.dirname(path)
-                    
-                    # 确保工作目录存在
-                    if working_dir and not os.path.exists(working_dir):
-                        working_dir = None
-                    
-                    # 使用subprocess更可靠地启动程序
-                    import subprocess
-                    try:
-                        subprocess.Popen([path] + params.split(), cwd=working_dir)
-                    except Exception as e:
-                        # 回退到os.startfile
-                        os.startfile(path)
-                        
+    def launch_program(self, path: str, arguments: str = "", working_dir: str = "", 
+                       run_as_admin: bool = False, button_id: Optional[int] = None,
+                       silent: bool = False, limits: Optional[ResourceLimits] = None) -> Optional[LaunchRequest]:
+        """启动指定程序或打开目录（提交到后台启动队列，界面线程不访问文件系统）
+        
+        返回已提交的请求；按钮已在运行且设置为不重复启动，或已有相同请求在处理时返回 None。
+        """
+        if button_id is not None and not self.handle_running_instance(button_id):
+            return None
+        request = LaunchRequest(path, arguments, working_dir, run_as_admin, button_id, silent, limits)
+        return request if self.launch_dispatcher.submit(request) else None
+    
+    def handle_running_instance(self, button_id: int) -> bool:
+        """按钮已有进程在运行时按其设置处理，返回是否继续启动新实例"""
+        record = self.button_index.get(button_id)
+        if record is None or record.if_running not in (ProcessRegistry.FOCUS, ProcessRegistry.REFUSE):
+            return True
+        self.reap_processes()
+        if not self.process_registry.is_running(button_id):
+            return True
+        if record.if_running == ProcessRegistry.FOCUS:
+            if any(focus_process_window(pid) for pid in self.process_registry.pids(button_id)):
+                self.statusBar().showMessage(f"已切换到正在运行的 {record.name}", 3000)
             else:
-                # 非Windows系统
-                cmd = f'xdg-open "{path}"'
-                if arguments:
-                    cmd += f' {arguments}'
-                os.system(cmd)
-        except Exception as e:
-            print(f"无法启动程序: {e}")
-            QMessageBox.critical(self, "错误", f"无法启动程序:\n{str(e)}")
+                self.statusBar().showMessage(f"{record.name} 已在运行，但找不到它的窗口", 5000)
+        else:
+            self.statusBar().showMessage(f"{record.name} 已在运行，未重复启动", 5000)
+        return False
+    
+    def reap_processes(self):
+        """回收已退出的进程并更新运行中标记"""
+        changed = self.process_registry.reap()
+        if not self.process_registry:
+            self.process_timer.stop()
+        self.update_button_states(changed)
+    
+    def on_launch_started(self, request: LaunchRequest):
+        """启动请求已提交"""
+        self.statusBar().showMessage(f"正在启动: {request.path}")
+    
+    def on_launch_succeeded(self, request: LaunchRequest):
+        """启动成功: 记录启动历史（仅写内存缓冲，由定时器批量落盘）"""
+        self.statusBar().showMessage(f"已启动: {request.path}", 3000)
+        if request.button_id is not None and self.process_registry.add(request.button_id, request.process):
+            if not self.process_timer.isActive():
+                self.process_timer.start()
+            self.update_button_states({request.button_id})
+        if request.button_id is not None and self.health_message(request.button_id) is not None:
+            self.on_health_results([(request.button_id, PathHealth.OK, "", time.time())])
+        if request.button_id is not None:
+            if self.launch_history.record(request.button_id):
+                QTimer.singleShot(0, self.flush_launch_history)
+            self.refresh_frequent_tab()
+    
+    def on_launch_traced(self, request: LaunchRequest):
+        """记录一次成功启动的分阶段耗时"""
+        phases = request.trace.phases
+        print("[TIMING] 启动 " + request.path + ": " +
+              ", ".join(f"{LatencyStats.PHASES.get(p, p)} {ms:.1f} ms" for p, ms in phases.items()))
+        if request.button_id is None:
+            return
+        self.latency_stats.record(request.button_id, phases)
+        self.update_button_states({request.button_id})
+    
+    def prefetch_candidates(self, limit: int) -> List[str]:
+        """预读候选程序路径：常用评分加上最近30天在当前时段的启动习惯，跳过不可达的网络共享"""
+        days = 30
+        try:
+            hourly = DatabaseManager().get_hourly_launch_days(datetime.datetime.now().hour, days)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 读取启动时段统计失败: {str(e)}")
+            hourly = {}
+        now = time.time()
+        frecency = {bid: self.launch_history.score(bid, now) for bid in self.button_index}
+        paths = []
+        for record in Prefetcher.rank(self.button_index.values(), frecency, hourly, days, limit):
+            path = self.path_resolver.resolve(record.path)
+            root = PathResolver.share_root(path)
+            if root is not None and self.path_resolver.is_down(root):
+                continue
+            paths.append(path)
+        return paths
+    
+    def load_latency_stats(self):
+        """加载已保存的启动耗时统计并刷新按钮提示"""
+        self.latency_stats.load()
+        self.update_button_states(self.latency_stats.button_ids())
+    
+    def show_latency_report(self):
+        """显示启动耗时报告"""
+        self.latency_stats.load()
+        group_names = {g[0]: g[1] for g in self.groups}
+        dialog = LatencyReportDialog(self.latency_stats, list(self.button_index.values()), group_names, self)
+        dialog.show()
+    
+    def on_launch_failed(self, request: LaunchRequest, message: str, unavailable: bool):
+        """启动失败: 路径不可用时提示警告，其他错误提示错误"""
+        self.statusBar().clearMessage()
+        if unavailable and request.button_id is not None:
+            # 启动时发现的失效路径同样标记出来，不必等待下一次扫描
+            status = (PathHealth.UNREACHABLE if PathResolver.share_root(self.path_resolver.resolve(request.path))
+                      else PathHealth.MISSING)
+            self.on_health_results([(request.button_id, status, message, time.time())])
+        if request.silent:
+            print(f"[ERROR] 启动失败: {request.path}: {message}")
+        elif unavailable:
+            QMessageBox.warning(self, "警告", message)
+        else:
+            print(f"无法启动程序: {message}")
+            QMessageBox.critical(self, "错误", f"无法启动程序:\n{message}")
 
 
     
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 退出时执行备份
+        # 退出时写入缓冲的启动历史并执行备份
+        self.flush_launch_history()
         self.perform_backup()
         self.save_window_settings()
+        self.save_catalog_snapshot()
+        self.health_scanner.shutdown()
+        self.prefetcher.shutdown()
         event.accept()
     
+    def button_tooltip(self, record: ButtonRecord) -> str:
+        """按钮提示文本（附带启动耗时、运行中的进程和路径失效原因）"""
+        tooltip = f"路径: {record.path}\n参数: {record.arguments}\n工作目录: {record.working_dir}"
+        latency = self.latency_stats.summary(record.id)
+        if latency:
+            tooltip += f"\n{latency}"
+        pids = self.process_registry.pids(record.id)
+        if pids:
+            tooltip += f"\n运行中 (PID: {', '.join(map(str, pids))})"
+        message = self.health_message(record.id)
+        if message:
+            tooltip += f"\n⚠ {message}"
+        return tooltip
+    
+    def health_message(self, button_id: int) -> Optional[str]:
+        """按钮路径失效的说明，正常或未检查时返回 None"""
+        health = self.path_health.get(button_id)
+        if health is None or health[0] == PathHealth.OK:
+            return None
+        return health[1] or health[0]
+    
+    def start_health_checks(self):
+        """加载已保存的检查结果并标记失效按钮，然后开始复查到期的按钮"""
+        try:
+            rows = DatabaseManager().get_path_health()
+        except sqlite3.Error as e:
+            print(f"[ERROR] 加载路径健康状态失败: {str(e)}")
+            rows = []
+        for button_id, status, message, checked_at in rows:
+            if button_id in self.button_index:
+                self.path_health[button_id] = (status, message, checked_at)
+        self.update_button_states({bid for bid in self.path_health if self.health_message(bid)})
+        self.watch_sync_timer.start()
+        self.schedule_health_checks()
+    
+    def schedule_health_checks(self):
+        """提交到期（从未检查或超过复查间隔）的按钮，最久未检查的优先"""
+        now = time.time()
+        due = []
+        for button_id, record in self.button_index.items():
+            status, _, checked_at = self.path_health.get(button_id, (None, "", 0.0))
+            if PathHealth.is_due(status, checked_at, now):
+                due.append((checked_at, record))
+        due.sort(key=lambda item: item[0])
+        submitted = self.health_scanner.scan([record for _, record in due[:self.health_batch_size]])
+        if submitted:
+            print(f"[DEBUG] 路径健康检查: 提交 {submitted} 个按钮（共 {len(due)} 个到期）")
+    
+    def on_health_results(self, rows: list):
+        """保存检查结果，并只更新状态有变化的按钮"""
+        rows = [row for row in rows if row[0] in self.button_index]
+        if not rows:
+            return
+        try:
+            DatabaseManager().save_path_health(rows)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 保存路径健康状态失败: {str(e)}")
+        changed = set()
+        for button_id, status, message, checked_at in rows:
+            old = self.path_health.get(button_id)
+            if old is None or old[:2] != (status, message):
+                changed.add(button_id)
+            self.path_health[button_id] = (status, message, checked_at)
+        self.update_button_states(changed)
+        if changed:
+            self.watch_sync_timer.start()  # 可达性变化后更新监视集合
+    
+    def sync_watched_paths(self):
+        """按当前目录重建监视集合
+        
+        只监视已确认可访问的本地路径，网络共享（包括映射的网络驱动器）和不可达的路径不监视，避免在界面线程访问网络。
+        """
+        index = {}
+        paths = {}
+        network = {}  # 根路径 -> 是否为网络位置或已知不可达
+        
+        def is_remote(path):
+            root = PathResolver.share_root(path)
+            if root is None:
+                return False
+            if root not in network:
+                network[root] = PathResolver.is_network_root(root) or self.path_resolver.is_down(root)
+            return network[root]
+        
+        def watch(path, button_id):
+            if is_remote(path):
+                return
+            path = os.path.abspath(path)
+            key = os.path.normcase(path)
+            paths[key] = path
+            index.setdefault(key, set()).add(button_id)
+        
+        for button_id, record in self.button_index.items():
+            health = self.path_health.get(button_id)
+            if health is None or health[0] == PathHealth.UNREACHABLE:
+                continue
+            path = self.path_resolver.resolve(record.path)
+            watch(os.path.dirname(path), button_id)  # 程序被卸载、移动或重命名
+            if record.working_dir:
+                watch(self.path_resolver.resolve(record.working_dir), button_id)
+            if record.icon_path and not is_remote(record.icon_path):
+                watch(record.icon_path, button_id)  # 图标文件被修改
+                watch(os.path.dirname(record.icon_path), button_id)  # 图标文件被替换
+                if record.icon_path not in self.icon_stamps:
+                    self.icon_stamps[record.icon_path] = self.file_stamp(record.icon_path)
+        self.watch_index = index
+        self.catalog_watcher.set_paths(set(paths.values()))
+    
+    def on_watched_paths_changed(self, paths: set):
+        """监视的目录或文件变化: 只使相关按钮的路径、健康状态和图标缓存失效"""
+        changed = {os.path.normcase(os.path.abspath(p)) for p in paths}
+        button_ids = set()
+        for key in changed:
+            button_ids |= self.watch_index.get(key, set())
+        records = [self.button_index[bid] for bid in button_ids if bid in self.button_index]
+        if not records:
+            return
+        print(f"[DEBUG] 文件系统变化: {len(paths)} 个路径，影响 {len(records)} 个按钮")
+        
+        for record in records:
+            self.path_resolver.invalidate(record.path)
+            if record.working_dir:
+                self.path_resolver.invalidate(record.working_dir)
+        self.health_scanner.scan(records)
+        
+        # 图标文件确实被修改或替换的，丢弃预缩放图标和已加载的图标后重新绑定
+        icon_paths = set()
+        for icon_path in {r.icon_path for r in records if r.icon_path}:
+            stamp = self.file_stamp(icon_path)
+            if stamp != self.icon_stamps.get(icon_path):
+                self.icon_stamps[icon_path] = stamp
+                self.scaled_icons.pop(icon_path, None)
+                icon_paths.add(icon_path)
+        if icon_paths:
+            self.refresh_icons(icon_paths)
+    
+    @staticmethod
+    def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+        """文件的 (mtime_ns, 大小)，文件不存在时返回 None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def update_button_states(self, button_ids: set):
+        """刷新指定按钮的状态标记（失效、运行中）和提示"""
+        if not button_ids:
+            return
+        for button_id in button_ids:
+            record = self.button_index.get(button_id)
+            if record is None:
+                continue
+            for widget in self.registry.widgets(button_id):
+                if isinstance(widget, QToolButton):
+                    widget.setToolTip(self.button_tooltip(record))
+                    self.apply_button_style(widget, record)
+        for view in self.registry.views():
+            view.model().refresh_all()
+    
+    def icon_file(self, icon_path: str) -> Optional[str]:
+        """获取按钮图标实际加载的文件（优先预缩放图标），图标不存在时返回 None"""
+        scaled = self.scaled_icons.get(icon_path)
+        if scaled and os.path.exists(scaled[0]):
+            return scaled[0]
+        if icon_path and os.path.exists(icon_path):
+            return icon_path
+        return None
+    
+    def prescale_icons(self, records: List[ButtonRecord], size: int = 32) -> Dict[str, list]:
+        """将按钮图标缩放后缓存为PNG（已缓存且源文件未变化的直接复用）"""
+        cache_dir = "icon_cache"
+        os.makedirs(cache_dir, exist_ok=True)
+        icons = {}
+        for icon_path in {r.icon_path for r in records if r.icon_path}:
+            try:
+                st = os.stat(icon_path)
+            except OSError:
+                continue
+            key = hashlib.sha1(f"{icon_path}|{st.st_mtime_ns}|{st.st_size}|{size}".encode("utf-8")).hexdigest()
+            scaled_path = os.path.join(cache_dir, f"{key}.png")
+            if not os.path.exists(scaled_path):
+                pixmap = QIcon(icon_path).pixmap(size, size)
+                if pixmap.isNull() or not pixmap.save(scaled_path, "PNG"):
+                    continue
+            icons[icon_path] = [scaled_path, st.st_mtime_ns, st.st_size]
+        
+        # 清理不再引用的缓存文件
+        keep = {os.path.normcase(os.path.abspath(v[0])) for v in icons.values()}
+        for cached in glob.glob(os.path.join(cache_dir, "*.png")):
+            if os.path.normcase(os.path.abspath(cached)) not in keep:
+                try:
+                    os.remove(cached)
+                except OSError:
+                    pass
+        return icons
+    
+    def save_catalog_snapshot(self):
+        """退出时写入启动快照（分组按当前标签页顺序，并同步到数据库）"""
+        try:
+            db = DatabaseManager()
+            groups = self.apply_saved_tab_order(db)
+            records = db.get_button_records()
+            snapshot = CatalogSnapshot(db.get_catalog_version(), groups, records,
+                                       self.launch_history.snapshot(), self.prescale_icons(records))
+            snapshot.write()
+            print(f"[DEBUG] 已写入启动快照: {len(groups)} 个分组、{len(records)} 个按钮")
+        except Exception as e:
+            print(f"[ERROR] 写入启动快照失败: {str(e)}")
+            CatalogSnapshot.discard()
+    
+    def validate_catalog_snapshot(self):
+        """首次绘制后在后台线程校验启动快照（读取数据库和图标状态都不占用界面线程）"""
+        threading.Thread(target=self._check_snapshot, args=(self.snapshot_version, dict(self.scaled_icons)),
+                         daemon=True, name="snapshot-check").start()
+    
+    def _check_snapshot(self, snapshot_version: int, scaled_icons: Dict[str, list]):
+        """后台线程: 同步标签页顺序，读取数据版本、最新启动统计和已变化的图标（不访问界面对象）"""
+        result = {}
+        try:
+            db = DatabaseManager()
+            groups = self.apply_saved_tab_order(db)
+            version = db.get_catalog_version()
+            if version != snapshot_version:
+                result["catalog"] = (groups, db.get_button_records())
+            result["version"] = version
+            result["stats"] = db.get_button_stats()
+            
+            # 源图标已修改或删除的，改回按需加载原图标
+            stale = set()
+            for icon_path, (_, mtime_ns, size) in scaled_icons.items():
+                try:
+                    st = os.stat(icon_path)
+                    if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                        continue
+                except OSError:
+                    pass
+                stale.add(icon_path)
+            result["stale_icons"] = stale
+        except Exception as e:
+            result["error"] = str(e)
+        self._snapshot_checked.emit(result)
+    
+    def on_snapshot_checked(self, result: dict):
+        """应用快照校验结果: 数据版本有变化时增量同步，启动统计换成数据库中的最新值"""
+        try:
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            if "catalog" in result:
+                print(f"[DEBUG] 启动快照已过期 ({self.snapshot_version} -> {result['version']})，增量同步")
+                self.refresh_catalog(result["catalog"])
+            # 快照中的启动统计可能落后于其他进程写入的数据库
+            self.launch_history.replace(result["stats"])
+            self.refresh_frequent_tab()
+            stale = result["stale_icons"]
+            for icon_path in stale:
+                self.scaled_icons.pop(icon_path, None)
+            if stale:
+                self.refresh_icons(stale)
+        except Exception as e:
+            print(f"[ERROR] 校验启动快照失败: {str(e)}")
+            self.launch_history.load()
+            self.load_data()
+        finally:
+            self.snapshot_version = None
+            self.start_autostart()
+    
+    def refresh_icons(self, icon_paths: set):
+        """重新绑定使用指定图标的按钮"""
+        for record in self.button_index.values():
+            if record.icon_path in icon_paths:
+                for widget in self.registry.widgets(record.id):
+                    if isinstance(widget, QToolButton):
+                        self.bind_program_button(widget, record)
+        for view in self.registry.views():
+            view.model().invalidate_icons(icon_paths)
+    
     def save_window_settings(self):
         """保存窗口设置"""
         settings = QSettings("ProgramLauncher", "MainWindow")
@@ -1850,6 +6212,8 @@ class MainWindow(QMainWindow):
         # 保存标签页顺序
         tab_order = []
         for i in range(self.tab_widget.count()):
+            if self.tab_widget.widget(i).property("virtual_group"):
+                continue  # "常用"虚拟分组不参与排序
             tab_text = self.tab_widget.tabText(i)
             tab_order.append(tab_text)
         settings.setValue("tabOrder", tab_order)
@@ -1864,28 +6228,27 @@ class MainWindow(QMainWindow):
         window_state = settings.value("windowState")
         if window_state:
             self.restoreState(window_state)
+    
+    def apply_saved_tab_order(self, db: DatabaseManager) -> list:
+        """按保存的标签页顺序整理分组，返回排好序的分组列表（只查询一次数据库）"""
+        groups = db.get_groups()
+        tab_order = QSettings("ProgramLauncher", "MainWindow").value("tabOrder")
+        if not tab_order or not isinstance(tab_order, list):
+            return groups
         
-        # 加载标签页顺序
-        tab_order = settings.value("tabOrder")
-        if tab_order and isinstance(tab_order, list):
-            # 我们需要重新排序标签页
-            db = DatabaseManager()
-            groups = {name: (gid, pos) for gid, name, pos, _ in db.get_groups()}
-            
-            # 创建一个从组名到位置的映射
-            name_to_pos = {name: pos for pos, name in enumerate(tab_order)}
-            
-            # 获取所有分组并按保存的顺序排序
-            all_groups = db.get_groups()
-            sorted_groups = sorted(
-                all_groups, 
-                key=lambda x: name_to_pos.get(x[1], len(tab_order)))
-            
-            # 更新数据库中的顺序
-            db.reorder_groups([g[0] for g in sorted_groups])
-            
-            # 重新加载数据
-            self.load_data()
+        # 创建一个从组名到位置的映射，按保存的顺序排序
+        name_to_pos = {name: pos for pos, name in enumerate(tab_order)}
+        sorted_groups = sorted(groups, key=lambda x: name_to_pos.get(x[1], len(tab_order)))
+        sorted_ids = [g[0] for g in sorted_groups]
+        
+        # 顺序未变化时不写数据库
+        if sorted_ids == [g[0] for g in sorted(groups, key=lambda g: g[2])]:
+            return groups
+        db.reorder_groups(sorted_ids)
+        
+        # 与 get_groups 的排序一致：收藏分组在前，其余按新位置
+        reordered = [(gid, name, pos, fav) for pos, (gid, name, _, fav) in enumerate(sorted_groups, 1)]
+        return sorted(reordered, key=lambda g: (-g[3], g[2]))
 
 def fix_pyinstaller_permission_issue():
     """解决PyInstaller权限问题"""
@@ -1934,11 +6297,42 @@ def fix_pyinstaller_permission_issue():
         except Exception as e:
             print(f"无法修复权限问题: {e}")
 
-# 在程序启动时调用
-fix_pyinstaller_permission_issue()
+
+def parse_command_line(argv: List[str]) -> dict:
+    """解析命令行，返回交给（已运行或新启动的）实例执行的请求"""
+    parser = argparse.ArgumentParser(prog="Program_Launcher", description=ProjectInfo.DESCRIPTION)
+    parser.add_argument("path", nargs="?", help="添加程序或目录到当前分组")
+    parser.add_argument("--show", action="store_true", help="显示已运行的启动器窗口")
+    parser.add_argument("--add", metavar="PATH", help="添加程序或目录到当前分组")
+    parser.add_argument("--palette", action="store_true", help="呼出快速启动面板")
+    parser.add_argument("--profile", metavar="NAME", help="按启动方案启动一组程序")
+    args, _ = parser.parse_known_args(argv)  # 忽略 Qt 自身的参数
+    if args.palette:
+        return {"action": "palette"}
+    if args.profile:
+        return {"action": "profile", "name": args.profile}
+    path = args.add or args.path
+    if path:
+        return {"action": "add", "path": os.path.abspath(path)}
+    return {"action": "show"}
 
 
 if __name__ == "__main__":
+    startup_timer = StartupTimer(_STARTUP_BEGIN)
+    startup_timer.mark("导入模块")
+    
+    # 单实例: 已有实例运行时转交请求后立即退出
+    request = parse_command_line(sys.argv[1:])
+    instance_name = InstanceServer.server_name()
+    instance_lock = InstanceServer.lock_file()
+    if not instance_lock.tryLock(0):
+        for attempt in range(20):  # 主实例可能仍在启动，稍等后重试
+            if InstanceServer.send(instance_name, request):
+                sys.exit(0)
+            time.sleep(0.1)
+        print("[ERROR] 已有实例在运行，但无法连接")
+        sys.exit(1)
+    
     fix_pyinstaller_permission_issue()
     app = QApplication(sys.argv)
     
@@ -1952,7 +6346,19 @@ if __name__ == "__main__":
     app.setOrganizationDomain(ProjectInfo.URL)
     
     # 创建并显示主窗口
-    window = MainWindow()
+    window = MainWindow(startup_timer)
     window.show()
     
+    instance_server = InstanceServer(instance_name)
+    instance_server.message_received.connect(window.handle_instance_message)
+    instance_server.listen()
+    if request["action"] != "show":
+        window.handle_instance_message(request)
+    
+    # 首次绘制在事件循环处理完显示事件后完成
+    def report_first_paint():
+        startup_timer.mark("首次绘制")
+        startup_timer.report()
+    QTimer.singleShot(0, report_first_paint)
+    
     sys.exit(app.exec_())
\ No newline at end of file